@@ -3,25 +3,28 @@ Risk analysis module for memecoin data.
 Handles all risk calculations and analysis logic.
 """
 
-from calculations import process_bitquery_data
+import logging
+from typing import Dict
+
+from token_universe import TokenUniverse
 from bitquery_data import fetch_token_oldest_latest_prices
 
-def analyze_memecoin_risk(data):
+logger = logging.getLogger(__name__)
+
+PERIODS = ["2w", "1m", "6m", "1y"]
+
+def build_token_universe(data):
     """
-    Main function to analyze risk metrics for both volume and volatility indices.
+    Build the shared token universe of the volume and volatility indices.
     
     Args:
         data: Dictionary containing both volume and volatility ordered data
         
     Returns:
-        Dictionary containing both risk profiles
+        TokenUniverse with both indices added, or None if the data is malformed
     """
-    print("Data fetched successfully!")
-    
     # Process volume-ordered data (Memecoin 50 Volume Index)
-    print("\n" + "="*80)
-    print("PROCESSING VOLUME-ORDERED DATA (Memecoin 50 Volume Index)")
-    print("="*80)
+    logger.info("Processing volume-ordered data (Memecoin 50 Volume Index)")
     
     volume_data = data['volume_ordered']
     market_cap_data = data.get('market_cap_data', {})
@@ -31,28 +34,26 @@ def analyze_memecoin_risk(data):
     if volume_data and 'data' in volume_data and volume_data['data'] is not None:
         if 'Solana' in volume_data['data']:
             volume_tokens = volume_data['data']['Solana']['DEXTradeByTokens']
-            print(f"Found {len(volume_tokens)} tokens in volume-ordered data")
+            logger.info("Found %d tokens in volume-ordered data", len(volume_tokens))
             for token in volume_tokens:
                 token_addresses.add(token['Trade']['Currency']['MintAddress'])
         else:
-            print("No 'Solana' key found in volume data")
+            logger.error("No 'Solana' key found in volume data")
             return None
     else:
-        print("Unexpected volume data structure or data is None")
+        logger.error("Unexpected volume data structure or data is None")
         return None
     
     # Use ROI price data that's already included in the data structure
-    print("Using provided ROI price data...")
     price_data = data['roi_price_data']
-    print(f"Retrieved price data for {len(price_data)} tokens")
+    logger.info("Using provided ROI price data for %d tokens", len(price_data))
     
-    # Process volume data with accurate price data
-    volume_profile = process_bitquery_data(volume_data['data'], "Memecoin 50 Volume", market_cap_data, price_data)
+    # Both indices share one deduplicated token table
+    universe = TokenUniverse(market_cap_data, price_data)
+    universe.add_index("Memecoin 50 Volume", volume_tokens)
     
     # Process volatility-ordered data (Memecoin 50 Volatility Index)
-    print("\n" + "="*80)
-    print("PROCESSING VOLATILITY-ORDERED DATA (Memecoin 50 Volatility Index)")
-    print("="*80)
+    logger.info("Processing volatility-ordered data (Memecoin 50 Volatility Index)")
     
     volatility_data = data['volatility_ordered']
     
@@ -60,26 +61,86 @@ def analyze_memecoin_risk(data):
     if volatility_data and 'data' in volatility_data and volatility_data['data'] is not None:
         if 'Solana' in volatility_data['data']:
             volatility_tokens = volatility_data['data']['Solana']['DEXTradeByTokens']
-            print(f"Found {len(volatility_tokens)} tokens in volatility-ordered data")
+            logger.info("Found %d tokens in volatility-ordered data", len(volatility_tokens))
             for token in volatility_tokens:
                 token_addresses.add(token['Trade']['Currency']['MintAddress'])
         else:
-            print("No 'Solana' key found in volatility data")
+            logger.error("No 'Solana' key found in volatility data")
             return None
     else:
-        print("Unexpected volatility data structure or data is None")
+        logger.error("Unexpected volatility data structure or data is None")
         return None
     
-    # Use the same ROI price data for volatility analysis
-    print("Using existing ROI price data for volatility analysis...")
+    universe.add_index("Memecoin 50 Volatility", volatility_tokens)
+    return universe
+
+def analyze_memecoin_risk(data, executor="serial", max_workers=None, previous_constituents=None, universe=None):
+    """
+    Main function to analyze risk metrics for both volume and volatility indices.
     
-    # Process volatility data with accurate price data
-    volatility_profile = process_bitquery_data(volatility_data['data'], "Memecoin 50 Volatility", market_cap_data, price_data)
+    Args:
+        data: Dictionary containing both volume and volatility ordered data
+        executor: How the independent index profiles are evaluated: "serial"
+            (default; two small profiles do not repay a pool), "thread",
+            "process" or an existing Executor (see executors.map_ordered)
+        max_workers: Maximum number of workers when an executor is created
+        previous_constituents: Optional dictionary of index name ->
+            (mint addresses, weights) of the previous period; constituent
+            stability is then measured as turnover against it
+        universe: TokenUniverse already built from data by build_token_universe,
+            so the caller can reuse it (e.g. for analytics_db); built here
+            when omitted
+        
+    Returns:
+        Dictionary containing both risk profiles
+    """
+    logger.info("Data fetched successfully!")
+    
+    if universe is None:
+        universe = build_token_universe(data)
+    if universe is None:
+        return None
+    for index_name, (mint_addresses, weights) in (previous_constituents or {}).items():
+        if index_name in universe.indices:
+            universe.set_previous_constituents(index_name, mint_addresses, weights)
     
+    # Profile both indices concurrently with accurate price data
+    profiles = universe.profiles(executor, max_workers)
     return {
-        'volume_index': volume_profile,
-        'volatility_index': volatility_profile
+        'volume_index': profiles["Memecoin 50 Volume"],
+        'volatility_index': profiles["Memecoin 50 Volatility"]
+    }
+
+def profile_row(start_date: str, end_date: str, profile: Dict) -> Dict:
+    """
+    Flatten one index profile into a result table row.
+    
+    Args:
+        start_date: Window start date
+        end_date: Window end date
+        profile: Risk and return profile of one index
+    
+    Returns:
+        Dictionary of column name -> value
+    """
+    row = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "index": profile["index"],
+        "constituent_stability": profile["constituent_stability"],
+        "weight_concentration": profile["weight_concentration"]
     }
+    for period in PERIODS:
+        row[f"volatility_{period}"] = profile["volatilities"][period]
+    for period in PERIODS:
+        row[f"return_risk_{period}"] = profile["return_risk_ratios"][period]
+    row["max_drawdown"] = profile["max_drawdown"]["percentage"]
+    roi_stats = profile["roi_statistics"]
+    row["average_roi"] = roi_stats["average_roi"]
+    row["median_roi"] = roi_stats["median_roi"]
+    row["volume_weighted_roi"] = roi_stats["volume_weighted_roi"]
+    row["positive_roi_percentage"] = roi_stats["positive_roi_percentage"]
+    return row
 
 def calculate_performance_comparison(volume_profile, volatility_profile):
     """
@@ -0,0 +1,604 @@
+"""
+Embedded SQLite store of token snapshots, per-token metrics and index profiles.
+Each analyzed window is bulk-loaded as one run, so cross-run questions are
+answered with indexed SQL instead of re-running the analysis per window.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis import PERIODS, profile_row
+from calculations import MemeCoinRiskAnalyzer
+from token_universe import TokenUniverse
+from turnover import TurnoverEngine, turnover_stability
+import snapshot_lake
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = ".memecoin_analytics.db"
+
+PROFILE_METRICS = (
+    ["constituent_stability", "weight_concentration"]
+    + [f"volatility_{period}" for period in PERIODS]
+    + [f"return_risk_{period}" for period in PERIODS]
+    + ["max_drawdown", "average_roi", "median_roi", "volume_weighted_roi", "positive_roi_percentage"]
+)
+
+SNAPSHOT_COLUMNS = ["mint_address", "side_mint", "symbol", "name", "volume", "volatility", "market_cap",
+                    "high", "low", "open", "close", "count"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    loaded_at TEXT NOT NULL,
+    UNIQUE (start_date, end_date)
+);
+CREATE TABLE IF NOT EXISTS token_snapshots (
+    run_id INTEGER NOT NULL,
+    index_name TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    mint_address TEXT NOT NULL,
+    side_mint TEXT,
+    symbol TEXT,
+    name TEXT,
+    volume REAL,
+    volatility REAL,
+    market_cap REAL,
+    high REAL,
+    low REAL,
+    open REAL,
+    close REAL,
+    trade_count INTEGER,
+    weight REAL,
+    PRIMARY KEY (run_id, index_name, rank)
+);
+CREATE INDEX IF NOT EXISTS token_snapshots_mint ON token_snapshots (mint_address, run_id);
+CREATE INDEX IF NOT EXISTS token_snapshots_index ON token_snapshots (index_name, rank, run_id);
+CREATE TABLE IF NOT EXISTS token_metrics (
+    run_id INTEGER NOT NULL,
+    mint_address TEXT NOT NULL,
+    side_mint TEXT NOT NULL,
+    roi_percentage REAL,
+    price_roi_percentage REAL,
+    price_range REAL,
+    drawdown REAL,
+    PRIMARY KEY (run_id, mint_address, side_mint)
+);
+CREATE INDEX IF NOT EXISTS token_metrics_mint ON token_metrics (mint_address, run_id);
+CREATE TABLE IF NOT EXISTS profiles (
+    run_id INTEGER NOT NULL,
+    index_name TEXT NOT NULL,
+    {", ".join(f"{metric} REAL" for metric in PROFILE_METRICS)},
+    PRIMARY KEY (run_id, index_name)
+);
+CREATE TABLE IF NOT EXISTS stability_sources (
+    run_id INTEGER NOT NULL,
+    index_name TEXT NOT NULL,
+    previous_run_id INTEGER,
+    PRIMARY KEY (run_id, index_name)
+);
+"""
+
+
+def window_months(start_date: str, end_date: str) -> int:
+    """
+    Count the calendar months a window spans (2025-03-01 to 2025-09-30 is 7).
+
+    Runs are only compared with runs of the same window length.
+    """
+    start_year, start_month = int(start_date[:4]), int(start_date[5:7])
+    end_year, end_month = int(end_date[:4]), int(end_date[5:7])
+    return (end_year - start_year) * 12 + end_month - start_month + 1
+
+
+def _nullable(values: np.ndarray) -> list:
+    """Convert a float array to a list with NaN as None (SQL NULL)."""
+    return [None if value != value else value for value in values.tolist()]
+
+
+def token_metrics_frame(table: pd.DataFrame, price_data: Dict = None) -> pd.DataFrame:
+    """
+    Compute the stored per-token metrics of a token table.
+
+    Args:
+        table: Token table with the columns produced by load_bitquery_columns
+        price_data: Dictionary of oldest/latest prices (price ROI is NULL without it)
+
+    Returns:
+        DataFrame with mint_address, side_mint, roi_percentage (open/close),
+        price_roi_percentage, price_range and drawdown (high/low range, in percent)
+    """
+    analyzer = MemeCoinRiskAnalyzer()
+    analyzer.load_dataframe(table.reset_index(drop=True))
+    metrics = pd.DataFrame({
+        'mint_address': table['mint_address'].to_numpy(dtype=object),
+        'side_mint': table['side_mint'].to_numpy(dtype=object),
+        'roi_percentage': analyzer.calculate_roi_per_token()['roi_percentage'].to_numpy()
+    })
+
+    if price_data:
+        price_roi = analyzer.calculate_roi_from_price_data(price_data)
+        valid = (price_roi['oldest_price'] > 0) & (price_roi['latest_price'] > 0)
+        metrics['price_roi_percentage'] = price_roi['roi_percentage'].where(valid).to_numpy()
+    else:
+        metrics['price_roi_percentage'] = np.nan
+
+    high = table['high'].to_numpy(dtype=np.float64)
+    low = table['low'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics['price_range'] = np.where(low > 0, (high - low) / low * 100, np.nan)
+        metrics['drawdown'] = np.where(high > 0, (low - high) / high * 100, np.nan)
+    return metrics
+
+
+class AnalyticsStore:
+    """
+    SQLite database of analyzed runs.
+
+    A run is one (start_date, end_date) window; loading a window again
+    replaces its previous rows.
+
+    Usage:
+        store = AnalyticsStore()
+        universe = build_token_universe(data)
+        results = analyze_memecoin_risk(data, universe=universe)
+        store.ingest_fetch("2025-03-01", "2025-09-30", universe, results)
+        store.frequent_constituents("Memecoin 50 Volatility", min_runs=5, last_runs=12, top_n=100)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        """
+        Args:
+            path: Database file (":memory:" for a private in-memory database)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # Concurrent sweep workers wait for each other's write transactions
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.create_function("window_months", 2, window_months, deterministic=True)
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def ingest(self, start_date: str, end_date: str, tables: Dict[str, pd.DataFrame],
+               price_data: Dict = None, profiles: Optional[Iterable[Dict]] = None) -> int:
+        """
+        Bulk-load one analyzed window in a single transaction.
+
+        Args:
+            start_date: Window start date (YYYY-MM-DD)
+            end_date: Window end date (YYYY-MM-DD)
+            tables: Dictionary of index name -> token table in index order
+                (columns produced by load_bitquery_columns)
+            price_data: Dictionary of oldest/latest prices used for price ROI
+            profiles: Risk and return profiles of the indices
+
+        Returns:
+            run_id of the window
+        """
+        tables = {name: table for name, table in tables.items() if len(table) > 0}
+        snapshot_rows = []
+        for index_name, table in tables.items():
+            volume = table['volume'].to_numpy(dtype=np.float64)
+            total_volume = volume.sum()
+            weight = volume / total_volume if total_volume > 0 else np.full(len(volume), np.nan)
+            columns = [table[column].to_numpy(dtype=object) if table[column].dtype.kind not in "fi"
+                       else _nullable(table[column].to_numpy(dtype=np.float64))
+                       for column in SNAPSHOT_COLUMNS]
+            columns[SNAPSHOT_COLUMNS.index("count")] = table['count'].astype(int).tolist()
+            snapshot_rows.extend(
+                (index_name, rank, *values, row_weight)
+                for rank, (values, row_weight) in enumerate(zip(zip(*columns), _nullable(weight)), start=1)
+            )
+
+        metric_rows = []
+        if tables:
+            # Per-token metrics do not depend on the index; each token is stored once per run
+            universe = pd.concat(list(tables.values()), ignore_index=True)
+            universe = universe.drop_duplicates(['mint_address', 'side_mint']).reset_index(drop=True)
+            metrics = token_metrics_frame(universe, price_data)
+            metric_rows = list(zip(metrics['mint_address'].tolist(), metrics['side_mint'].tolist(),
+                                   *(_nullable(metrics[column].to_numpy(dtype=np.float64))
+                                     for column in ('roi_percentage', 'price_roi_percentage', 'price_range', 'drawdown'))))
+
+        profile_rows = []
+        for profile in profiles or []:
+            row = profile_row(start_date, end_date, profile)
+            profile_rows.append((row["index"], *(row[metric] for metric in PROFILE_METRICS)))
+
+        loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            run_id = self._replace_run(start_date, end_date, loaded_at)
+            self._conn.executemany(
+                f"INSERT INTO token_snapshots VALUES ({run_id}, {', '.join('?' * (len(SNAPSHOT_COLUMNS) + 3))})", snapshot_rows)
+            self._conn.executemany(
+                f"INSERT INTO token_metrics VALUES ({run_id}, ?, ?, ?, ?, ?, ?)", metric_rows)
+            self._conn.executemany(
+                f"INSERT INTO profiles VALUES ({run_id}, ?, {', '.join('?' * len(PROFILE_METRICS))})", profile_rows)
+
+        logger.info("Loaded run %s to %s: %d snapshot rows, %d tokens, %d profiles",
+                    start_date, end_date, len(snapshot_rows), len(metric_rows), len(profile_rows))
+        return run_id
+
+    def _replace_run(self, start_date: str, end_date: str, loaded_at: str) -> int:
+        """Create the run row of a window, deleting any earlier load of it."""
+        existing = self._conn.execute("SELECT run_id FROM runs WHERE start_date = ? AND end_date = ?",
+                                      (start_date, end_date)).fetchone()
+        if existing is not None:
+            for table in ("token_snapshots", "token_metrics", "profiles", "stability_sources", "runs"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_id = ?", existing)
+        return self._conn.execute("INSERT INTO runs (start_date, end_date, loaded_at) VALUES (?, ?, ?)",
+                                  (start_date, end_date, loaded_at)).lastrowid
+
+    def ingest_fetch(self, start_date: str, end_date: str, universe: Optional[TokenUniverse],
+                     profiles: Dict = None) -> Optional[int]:
+        """
+        Bulk-load an analyzed fetch.
+
+        The token tables are taken from the universe the analysis already
+        built, so the fetch is not parsed a second time.
+
+        Args:
+            start_date: Window start date (YYYY-MM-DD)
+            end_date: Window end date (YYYY-MM-DD)
+            universe: TokenUniverse built by analysis.build_token_universe
+                (None when the fetch was malformed)
+            profiles: Dictionary returned by analyze_memecoin_risk
+
+        Returns:
+            run_id of the window, or None if the data is malformed
+        """
+        if universe is None:
+            return None
+        return self.ingest(start_date, end_date, universe.index_tables(), universe.price_data,
+                           profiles.values() if profiles else None)
+
+    def ingest_snapshot(self, snapshot_path: str, profiles: Dict = None) -> int:
+        """
+        Bulk-load a snapshot_lake snapshot, e.g. to backfill earlier runs.
+
+        Args:
+            snapshot_path: Snapshot directory
+            profiles: Profiles of the snapshot (rebuilt from it when omitted)
+
+        Returns:
+            run_id of the window
+        """
+        meta = snapshot_lake.load_meta(snapshot_path)
+        market_cap_data = snapshot_lake.load_market_cap_data(snapshot_path)
+        tables = {index_name: snapshot_lake.load_analyzer(snapshot_path, table_name, market_cap_data).data
+                  for table_name, index_name in snapshot_lake.RANKING_TABLES.items()}
+        if profiles is None:
+            profiles = snapshot_lake.load_profiles(snapshot_path)
+        return self.ingest(meta["start_date"], meta["end_date"], tables,
+                           snapshot_lake.load_price_data(snapshot_path), profiles.values())
+
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        """
+        Run a read-only SQL query.
+
+        Args:
+            sql: SQL statement over runs, token_snapshots, token_metrics and profiles
+            params: Query parameters
+
+        Returns:
+            DataFrame of the result rows
+        """
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def runs(self) -> pd.DataFrame:
+        """
+        Get the loaded runs, oldest window first.
+
+        Returns:
+            DataFrame with run_id, start_date, end_date and loaded_at
+        """
+        return self.query("SELECT * FROM runs ORDER BY end_date, start_date")
+
+    def frequent_constituents(self, index_name: str, min_runs: int, last_runs: int = None,
+                              top_n: int = None, months: Optional[int] = 1) -> pd.DataFrame:
+        """
+        Find tokens that were index constituents in at least min_runs runs.
+
+        Counts are in runs, not months: only runs whose window spans the given
+        number of calendar months are considered, so with the default
+        one-month windows of a monthly sweep, last_runs=12 is the last 12 months.
+
+        Example: mints in the volatility top-100 in at least 5 of the last 12 months
+            frequent_constituents("Memecoin 50 Volatility", min_runs=5, last_runs=12, top_n=100)
+
+        Args:
+            index_name: Name of the index
+            min_runs: Minimum number of runs the token appeared in
+            last_runs: Only consider the most recent runs (by end date); all runs when omitted
+            top_n: Only count appearances ranked within the top n; any rank when omitted
+            months: Window length in calendar months of the runs considered
+                (see window_months); None mixes all window lengths
+
+        Returns:
+            DataFrame with mint_address, symbol, appearances and best_rank,
+            most frequent first
+        """
+        return self.query(
+            """
+            WITH recent AS (SELECT run_id FROM runs
+                            WHERE ? IS NULL OR window_months(start_date, end_date) = ?
+                            ORDER BY end_date DESC LIMIT ?)
+            SELECT mint_address, MAX(symbol) AS symbol, COUNT(DISTINCT run_id) AS appearances,
+                   MIN(rank) AS best_rank
+            FROM token_snapshots
+            WHERE index_name = ? AND rank <= ? AND run_id IN recent
+            GROUP BY mint_address
+            HAVING appearances >= ?
+            ORDER BY appearances DESC, best_rank
+            """,
+            (months, months, last_runs if last_runs is not None else -1, index_name,
+             top_n if top_n is not None else 2 ** 62, min_runs)
+        )
+
+    def drawdown_history(self, mint_address: str = None) -> pd.DataFrame:
+        """
+        Get the worst drawdown of each token in each run.
+
+        Args:
+            mint_address: Only return this token's history
+
+        Returns:
+            DataFrame with mint_address, start_date, end_date and drawdown
+            (percent), ordered by token and window
+        """
+        where = "WHERE m.mint_address = ?" if mint_address is not None else ""
+        return self.query(
+            f"""
+            SELECT m.mint_address, r.start_date, r.end_date, MIN(m.drawdown) AS drawdown
+            FROM token_metrics m JOIN runs r ON r.run_id = m.run_id
+            {where}
+            GROUP BY m.mint_address, m.run_id
+            ORDER BY m.mint_address, r.end_date
+            """,
+            (mint_address,) if mint_address is not None else ()
+        )
+
+    def worst_drawdowns(self, top_n: int = 10) -> pd.DataFrame:
+        """
+        Get the tokens with the deepest drawdown over all runs.
+
+        Args:
+            top_n: Number of tokens to return
+
+        Returns:
+            DataFrame with mint_address, drawdown, end_date of the run it
+            occurred in and the number of runs the token appears in
+        """
+        return self.query(
+            """
+            SELECT m.mint_address, MIN(m.drawdown) AS drawdown, r.end_date, COUNT(DISTINCT m.run_id) AS runs
+            FROM token_metrics m JOIN runs r ON r.run_id = m.run_id
+            WHERE m.drawdown IS NOT NULL
+            GROUP BY m.mint_address
+            ORDER BY drawdown
+            LIMIT ?
+            """,
+            (top_n,)
+        )
+
+    def previous_constituents(self, index_name: str, end_date: str, start_date: str = None) -> Optional[tuple]:
+        """
+        Get the constituents of an index in the latest run ending before a date.
+
+        Args:
+            index_name: Name of the index
+            end_date: End date of the current window (YYYY-MM-DD)
+            start_date: Start date of the current window; when given, only runs
+                of the same window length (see window_months) are considered
+
+        Returns:
+            Tuple of (mint addresses, weights) in rank order, or None when no
+            earlier run of the index is stored
+        """
+        rows = self.query(
+            """
+            SELECT mint_address, weight FROM token_snapshots
+            WHERE index_name = ? AND run_id = (
+                SELECT r.run_id FROM runs r
+                WHERE r.end_date < ? AND EXISTS (
+                    SELECT 1 FROM token_snapshots s WHERE s.run_id = r.run_id AND s.index_name = ?)
+                AND (? IS NULL OR window_months(r.start_date, r.end_date) = window_months(?, ?))
+                ORDER BY r.end_date DESC, r.start_date DESC LIMIT 1)
+            ORDER BY rank
+            """,
+            (index_name, end_date, index_name, start_date, start_date, end_date)
+        )
+        if rows.empty:
+            return None
+        return rows['mint_address'].tolist(), rows['weight'].to_numpy(dtype=np.float64)
+
+    def turnover_history(self, index_name: str) -> pd.DataFrame:
+        """
+        Compute the constituent turnover of an index across all stored runs.
+
+        Runs are ordered by end date and each is compared with the one before
+        it (see turnover.TurnoverEngine.summary).
+
+        Args:
+            index_name: Name of the index
+
+        Returns:
+            DataFrame with start_date, end_date and the turnover summary columns
+        """
+        rows = self.query(
+            """
+            SELECT r.start_date, r.end_date, s.run_id, s.mint_address, s.weight
+            FROM token_snapshots s JOIN runs r ON r.run_id = s.run_id
+            WHERE s.index_name = ?
+            ORDER BY r.end_date, r.start_date, s.run_id, s.rank
+            """,
+            (index_name,)
+        )
+        engine = TurnoverEngine()
+        windows = []
+        for (start_date, end_date, _), run in rows.groupby(['start_date', 'end_date', 'run_id'], sort=False):
+            engine.add_snapshot(end_date, run['mint_address'], run['weight'].to_numpy(dtype=np.float64))
+            windows.append(start_date)
+        summary = engine.summary()
+        summary.index.name = 'end_date'
+        summary.insert(0, 'start_date', windows)
+        return summary.reset_index()
+
+    def refresh_constituent_stability(self) -> int:
+        """
+        Recompute the stored constituent stability of runs whose predecessor
+        changed, as turnover against that predecessor.
+
+        The predecessor of a run is the latest earlier run of the same index
+        and window length, as in previous_constituents with a start date.
+        Runs analyzed before their predecessor was stored (e.g. windows of a
+        parallel sweep) fall back to the HHI-based stability; this brings them
+        in line with runs analyzed in order. The predecessor each run was
+        refreshed against is recorded, so later calls only recompute newly
+        loaded runs and the runs that now follow them.
+
+        Returns:
+            Number of profiles updated
+        """
+        runs = self.query(
+            """
+            SELECT DISTINCT r.run_id, r.start_date, r.end_date, s.index_name,
+                   p.run_id IS NOT NULL AS profiled, c.run_id IS NOT NULL AS refreshed, c.previous_run_id
+            FROM token_snapshots s JOIN runs r ON r.run_id = s.run_id
+            LEFT JOIN profiles p ON p.run_id = s.run_id AND p.index_name = s.index_name
+            LEFT JOIN stability_sources c ON c.run_id = s.run_id AND c.index_name = s.index_name
+            ORDER BY s.index_name, r.end_date, r.start_date, r.run_id
+            """
+        )
+        runs['months'] = [window_months(start, end) for start, end in zip(runs['start_date'], runs['end_date'])]
+        runs['previous_run_id'] = runs['previous_run_id'].astype(object).where(runs['previous_run_id'].notna(), None)
+
+        stale = []
+        for _, group in runs.groupby(['index_name', 'months'], sort=False):
+            previous = None
+            candidate = None
+            for run in group.itertuples(index=False):
+                # Runs are in (end_date, start_date) order, so the predecessor is
+                # the last run whose end date is strictly earlier
+                if candidate is not None and candidate.end_date < run.end_date:
+                    previous = candidate
+                previous_run_id = int(previous.run_id) if previous is not None else None
+                if run.profiled and (not run.refreshed or run.previous_run_id != previous_run_id):
+                    stale.append((int(run.run_id), run.index_name, previous_run_id))
+                candidate = run
+
+        compared = [(run_id, index_name, previous_run_id) for run_id, index_name, previous_run_id in stale
+                    if previous_run_id is not None]
+        constituents = {}
+        if compared:
+            run_ids = sorted({run_id for run_id, _, _ in compared} | {run_id for _, _, run_id in compared})
+            rows = self.query(
+                f"""
+                SELECT run_id, index_name, mint_address, weight FROM token_snapshots
+                WHERE run_id IN ({', '.join('?' * len(run_ids))})
+                ORDER BY run_id, index_name, rank
+                """,
+                run_ids
+            )
+            for (run_id, index_name), run in rows.groupby(['run_id', 'index_name'], sort=False):
+                constituents[run_id, index_name] = (run['mint_address'].tolist(),
+                                                    run['weight'].to_numpy(dtype=np.float64))
+
+        updates = []
+        for run_id, index_name, previous_run_id in compared:
+            # Rounded like the profiles (see calculations.build_risk_return_profile)
+            stability = round(turnover_stability(*constituents[previous_run_id, index_name],
+                                                 *constituents[run_id, index_name]), 2)
+            updates.append((stability, run_id, index_name))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE profiles SET constituent_stability = ? WHERE run_id = ? AND index_name = ?", updates)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stability_sources VALUES (?, ?, ?)",
+                stale)
+        logger.info("Refreshed constituent stability of %d profiles", len(updates))
+        return len(updates)
+
+    def profile_history(self, index_name: str = None) -> pd.DataFrame:
+        """
+        Get the stored profile metrics over time.
+
+        Args:
+            index_name: Only return this index's profiles
+
+        Returns:
+            DataFrame with start_date, end_date, index_name and the profile metrics
+        """
+        where = "WHERE p.index_name = ?" if index_name is not None else ""
+        return self.query(
+            f"""
+            SELECT r.start_date, r.end_date, p.*
+            FROM profiles p JOIN runs r ON r.run_id = p.run_id
+            {where}
+            ORDER BY r.end_date, p.index_name
+            """,
+            (index_name,) if index_name is not None else ()
+        ).drop(columns="run_id")
+
+
+def ingest_run(start_date: str, end_date: str, universe: Optional[TokenUniverse], profiles: Dict,
+               path: str = DEFAULT_DB_PATH) -> Optional[int]:
+    """
+    Bulk-load one pipeline run into the analytics database.
+
+    Args:
+        start_date: Window start date (YYYY-MM-DD)
+        end_date: Window end date (YYYY-MM-DD)
+        universe: TokenUniverse the profiles were computed from
+        profiles: Dictionary returned by analyze_memecoin_risk
+        path: Database file
+
+    Returns:
+        run_id of the window, or None if the data is malformed
+    """
+    with AnalyticsStore(path) as store:
+        return store.ingest_fetch(start_date, end_date, universe, profiles)
+
+
+def load_previous_constituents(start_date: str, end_date: str, path: str = DEFAULT_DB_PATH) -> Dict[str, tuple]:
+    """
+    Get the previous period's constituents of every stored index, from the
+    latest earlier run of the same window length.
+
+    Args:
+        start_date: Start date of the current window (YYYY-MM-DD)
+        end_date: End date of the current window (YYYY-MM-DD)
+        path: Database file
+
+    Returns:
+        Dictionary of index name -> (mint addresses, weights), for indices
+        with an earlier run
+    """
+    with AnalyticsStore(path) as store:
+        previous = {}
+        for index_name in store.query("SELECT DISTINCT index_name FROM token_snapshots")['index_name']:
+            constituents = store.previous_constituents(index_name, end_date, start_date)
+            if constituents is not None:
+                previous[index_name] = constituents
+        return previous
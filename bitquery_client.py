@@ -0,0 +1,173 @@
+"""
+HTTP client module for the Bitquery GraphQL endpoint.
+Owns a pooled keep-alive session shared by all fetchers.
+"""
+
+import json
+import threading
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from config import AUTH_TOKEN
+from response_cache import ResponseCache, make_cache_key
+
+BITQUERY_URL = "https://streaming.bitquery.io/eap"
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response served from the response cache.
+    """
+
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self._data)
+
+    def json(self):
+        return self._data
+
+
+class BitqueryClient:
+    """
+    Pooled, keep-alive client for the Bitquery API.
+
+    A single requests.Session is reused for every query so TCP and TLS
+    connections are kept alive between calls, and gzip/deflate transfer
+    encoding is negotiated on every request.
+    """
+
+    def __init__(self, auth_token: str = None, url: str = BITQUERY_URL,
+                 pool_connections: int = 4, pool_maxsize: int = 16,
+                 connect_timeout: float = 10.0, read_timeout: float = 300.0,
+                 max_retries: int = 2, cache: ResponseCache = None,
+                 adapter: BaseAdapter = None):
+        """
+        Args:
+            auth_token: Bitquery bearer token (defaults to config.AUTH_TOKEN)
+            url: GraphQL endpoint URL
+            pool_connections: Number of host pools to cache
+            pool_maxsize: Maximum number of connections kept alive per host
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send a response
+            max_retries: Retries on connection errors (not on HTTP error statuses)
+            cache: Optional ResponseCache used for queries with a cache range
+            adapter: Optional transport adapter to mount instead of the pooled
+                HTTPAdapter (e.g. bitquery_replay.RecordingAdapter or ReplayAdapter)
+        """
+        self.url = url
+        self.cache = cache
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Authorization': 'Bearer ' + (auth_token if auth_token is not None else AUTH_TOKEN)
+        })
+
+        if adapter is None:
+            adapter = HTTPAdapter(pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize,
+                                  max_retries=max_retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def post_query(self, query: str, variables: dict = None, cache_range: tuple = None,
+                   stream: bool = False):
+        """
+        POST a GraphQL query to the endpoint.
+
+        Args:
+            query: GraphQL query string
+            variables: Optional query variables
+            cache_range: Optional (start_date, end_date) of the query. When given
+                and the client has a cache, successful responses are cached
+                and served from disk on later calls.
+            stream: Return without reading the body so it can be decoded
+                incrementally from response.raw. Cache hits are still served,
+                but streamed bodies are consumed once and are not cached.
+
+        Returns:
+            The HTTP response, or a CachedResponse on a cache hit
+        """
+        if self.cache is not None and cache_range is not None:
+            start_date, end_date = cache_range
+            key = make_cache_key(query + json.dumps(variables or {}, sort_keys=True), start_date, end_date)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return CachedResponse(cached)
+
+            response = self._post(query, variables, stream)
+            if stream:
+                return response
+            if response.status_code == 200:
+                data = response.json()
+                if not data.get('errors'):
+                    self.cache.put(key, data, end_date)
+            return response
+
+        return self._post(query, variables, stream)
+
+    def _post(self, query: str, variables: dict = None, stream: bool = False) -> requests.Response:
+        payload = json.dumps({
+            "query": query,
+            "variables": json.dumps(variables or {})
+        })
+        response = self.session.post(self.url, data=payload, timeout=self.timeout, stream=stream)
+        if stream:
+            # Let response.raw yield gzip-decoded bytes to incremental decoders
+            response.raw.decode_content = True
+        return response
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> BitqueryClient:
+    """
+    Get the shared process-wide client, creating it on first use.
+
+    Returns:
+        The default BitqueryClient
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = BitqueryClient(cache=ResponseCache())
+    return _default_client
+
+
+def configure_client(**kwargs) -> BitqueryClient:
+    """
+    Replace the shared client with one built from the given options.
+
+    Args:
+        **kwargs: Keyword arguments forwarded to BitqueryClient
+
+    Returns:
+        The new default BitqueryClient
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is not None:
+            _default_client.close()
+        _default_client = BitqueryClient(**kwargs)
+    return _default_client
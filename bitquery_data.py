@@ -1,27 +1,40 @@
-import requests
 import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from string import Template
-from config import AUTH_TOKEN
+from bitquery_client import CachedResponse, get_client
+from bitquery_decode import decode_candles, decode_dex_trades, decode_price_data, decode_supply_balances, measure_decode
+from candle_store import format_epoch
+from fileio import atomic_write_json
+from response_cache import DEFAULT_CACHE_DIR
 
-def fetch_memecoin_data_by_period(start_date, end_date, order_by="volume"):
+logger = logging.getLogger(__name__)
+
+def _build_ranking_query(start_date, end_date, order_by="volume", limit=100, offset=0):
     """
-    Fetch memecoin data from Bitquery API for a specific time period.
+    Build the DEXTradeByTokens ranking query for a date range.
     
     Args:
         start_date: Start date in YYYY-MM-DD format
-        end_date: End date in YYYY-MM-DD format  
+        end_date: End date in YYYY-MM-DD format
         order_by: Field to order by ("volume" or "volatility_token")
+        limit: Maximum number of tokens to return
+        offset: Number of ranked tokens to skip
     
     Returns:
-        Dictionary containing the API response data
+        GraphQL query string
     """
-    url = "https://streaming.bitquery.io/eap"
-
+    offset_clause = f", offset: {offset}" if offset else ""
+    
     # Build the query with date range
     query = f"""{{
   Solana(dataset: archive) {{
     DEXTradeByTokens(
-      limit: {{count: 100}}
+      limit: {{count: {limit}{offset_clause}}}
       orderBy: {{descendingByField: "{order_by}"}}
       where: {{
         Trade: {{
@@ -72,26 +85,289 @@ def fetch_memecoin_data_by_period(start_date, end_date, order_by="volume"):
     }}
   }}
 }}"""
+    return query
 
-    payload = json.dumps({
-       "query": query,
-       "variables": "{}"
-    })
-    
-    headers = {
-       'Content-Type': 'application/json',
-       'Authorization': 'Bearer ' + AUTH_TOKEN
-    }
+def fetch_memecoin_data_by_period(start_date, end_date, order_by="volume", client=None, limit=100):
+    """
+    Fetch memecoin data from Bitquery API for a specific time period.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format  
+        order_by: Field to order by ("volume" or "volatility_token")
+        client: BitqueryClient to use (defaults to the shared client)
+        limit: Number of top-ranked tokens to fetch
+    
+    Returns:
+        Dictionary containing the API response data
+    """
+    query = _build_ranking_query(start_date, end_date, order_by, limit)
 
-    response = requests.request("POST", url, headers=headers, data=payload)
+    client = client or get_client()
+    response = client.post_query(query, cache_range=(start_date, end_date))
     
     if response.status_code == 200:
         return response.json()
     else:
-        print(f"Error fetching data for {start_date} to {end_date}: {response.status_code}")
-        print(response.text)
+        logger.error("Error fetching data for %s to %s: %s %s",
+                     start_date, end_date, response.status_code, response.text)
         return None
 
+def _response_source(response, streamed=False):
+    """
+    Get the body of a response in the cheapest form the decoders accept.
+    
+    Cache hits are already decoded, streamed responses are read incrementally
+    from response.raw, and anything else is handed over as raw bytes.
+    """
+    if isinstance(response, CachedResponse):
+        return response.json()
+    if streamed:
+        return response.raw
+    return response.content
+
+def fetch_memecoin_columns_by_period(start_date, end_date, order_by="volume", client=None, limit=100,
+                                     report=False):
+    """
+    Fetch the ranking for a period and decode it straight into column buffers.
+    
+    The response body is streamed and decoded incrementally (see
+    bitquery_decode), so only the fields used by the analyzer are kept.
+    Cached responses are still served, but a streamed body is consumed while
+    decoding and is never written to the ResponseCache; use
+    fetch_memecoin_data_by_period to populate the cache.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        order_by: Field to order by ("volume" or "volatility_token")
+        client: BitqueryClient to use (defaults to the shared client)
+        limit: Number of top-ranked tokens to fetch
+        report: Log decode backend, parse time and peak memory
+    
+    Returns:
+        ColumnBuffers with one entry per token, or None on error
+    """
+    query = _build_ranking_query(start_date, end_date, order_by, limit)
+    
+    client = client or get_client()
+    response = client.post_query(query, cache_range=(start_date, end_date), stream=True)
+    
+    if response.status_code != 200:
+        logger.error("Error fetching data for %s to %s: %s %s",
+                     start_date, end_date, response.status_code, response.text)
+        return None
+    
+    source = _response_source(response, streamed=True)
+    if report:
+        # measure_decode traces allocations process-wide, so only pay for it when asked
+        (buffers, errors), decode_stats = measure_decode(decode_dex_trades, source)
+        logger.info("Decoded %d rows with %s in %.1fms, peak memory %.1fKiB",
+                    len(buffers), decode_stats['backend'], decode_stats['parse_seconds'] * 1000,
+                    decode_stats['peak_bytes'] / 1024, extra={'decode_stats': decode_stats})
+    else:
+        buffers, errors = decode_dex_trades(source)
+    
+    if errors:
+        logger.error("API Errors: %s", errors)
+        return None
+    
+    return buffers
+
+def iter_memecoin_data_by_period(start_date, end_date, order_by="volume", page_size=1000,
+                                 max_tokens=None, prefetch=2, client=None):
+    """
+    Stream ranked DEXTradeByTokens rows page by page using offset paging.
+    
+    Up to prefetch pages are requested ahead of the page being consumed, so
+    network time overlaps with processing. Iteration stops at the first
+    short page or once max_tokens rows have been yielded.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        order_by: Field to order by ("volume" or "volatility_token")
+        page_size: Number of tokens requested per page
+        max_tokens: Maximum number of tokens to yield (None for all)
+        prefetch: Number of pages requested ahead of consumption
+        client: BitqueryClient to use (defaults to the shared client)
+    
+    Yields:
+        DEXTradeByTokens row dictionaries in ranking order
+    """
+    client = client or get_client()
+    
+    def fetch_page(offset):
+        query = _build_ranking_query(start_date, end_date, order_by, page_size, offset)
+        response = client.post_query(query, cache_range=(start_date, end_date))
+        if response.status_code != 200:
+            raise RuntimeError(f"Error fetching page at offset {offset} for {start_date} to {end_date}: "
+                               f"{response.status_code} {response.text}")
+        data = response.json()
+        if data.get('errors'):
+            raise RuntimeError(f"API Errors at offset {offset}: {data['errors']}")
+        return data['data']['Solana']['DEXTradeByTokens']
+    
+    if max_tokens is not None:
+        page_count = -(-max_tokens // page_size)
+    else:
+        page_count = None
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, prefetch))
+    try:
+        pending = []
+        next_page = 0
+        yielded = 0
+        while True:
+            # Keep up to prefetch pages in flight
+            while len(pending) < max(1, prefetch) and (page_count is None or next_page < page_count):
+                pending.append(executor.submit(fetch_page, next_page * page_size))
+                next_page += 1
+            if not pending:
+                return
+            
+            rows = pending.pop(0).result()
+            for row in rows:
+                if max_tokens is not None and yielded >= max_tokens:
+                    return
+                yield row
+                yielded += 1
+            
+            if len(rows) < page_size:
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _date_shards(start_date, end_date, shard="daily"):
+    """
+    Split an inclusive date range into consecutive shards.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        shard: "daily" or "weekly"
+    
+    Returns:
+        List of (shard_start, shard_end) date strings covering the range
+    """
+    shard_days = {"daily": 1, "weekly": 7}
+    if shard not in shard_days:
+        raise ValueError(f"Unknown shard size: {shard}. Expected 'daily' or 'weekly'.")
+    
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    step = timedelta(days=shard_days[shard])
+    
+    shards = []
+    shard_start = start
+    while shard_start <= end:
+        shard_end = min(shard_start + step - timedelta(days=1), end)
+        shards.append((shard_start.strftime("%Y-%m-%d"), shard_end.strftime("%Y-%m-%d")))
+        shard_start = shard_end + timedelta(days=1)
+    return shards
+
+def merge_ranking_shards(shard_responses, order_by="volume", limit=100):
+    """
+    Merge per-shard DEXTradeByTokens aggregates into one window-level response.
+    
+    Rows are matched by (mint address, side mint address), the grain of the
+    ranking query. Volumes and trade counts are summed, high/close are merged
+    as maxima and low/open as minima (matching the Price(maximum/minimum)
+    aggregates of the ranking query), and volatility is recomputed from the
+    merged high and low.
+    
+    Args:
+        shard_responses: List of ranking responses in date order
+        order_by: Field to rank the merged rows by ("volume" or "volatility_token")
+        limit: Number of top-ranked tokens to keep
+    
+    Returns:
+        Response dictionary with the same structure as fetch_memecoin_data_by_period
+    """
+    merged = {}
+    for response in shard_responses:
+        for row in response['data']['Solana']['DEXTradeByTokens']:
+            trade = row['Trade']
+            key = (trade['Currency']['MintAddress'], trade['Side']['Currency']['MintAddress'])
+            high = float(trade.get('high', 0))
+            low = float(trade.get('low', 0))
+            
+            if key not in merged:
+                merged[key] = {
+                    'volume': 0.0,
+                    'count': 0,
+                    'Trade': {
+                        'high': high,
+                        'low': low,
+                        'open': float(trade.get('open', 0)),
+                        'close': float(trade.get('close', 0)),
+                        'Currency': trade['Currency'],
+                        'Side': trade['Side']
+                    }
+                }
+            
+            entry = merged[key]
+            entry['volume'] += float(row.get('volume', 0))
+            entry['count'] += int(row.get('count', 0))
+            merged_trade = entry['Trade']
+            merged_trade['high'] = max(merged_trade['high'], high)
+            merged_trade['low'] = min(merged_trade['low'], low)
+            # The ranking query defines open as the minimum price and close as the maximum
+            merged_trade['open'] = min(merged_trade['open'], float(trade.get('open', 0)))
+            merged_trade['close'] = max(merged_trade['close'], float(trade.get('close', 0)))
+    
+    rows = []
+    for entry in merged.values():
+        high = entry['Trade']['high']
+        low = entry['Trade']['low']
+        entry['volatility_token'] = ((high - low) / low) * 100 if low > 0 else 0.0
+        rows.append(entry)
+    
+    rows.sort(key=lambda row: row[order_by], reverse=True)
+    return {'data': {'Solana': {'DEXTradeByTokens': rows[:limit]}}}
+
+def fetch_memecoin_data_sharded(start_date, end_date, order_by="volume", shard="daily",
+                                limit=100, shard_limit=1000, max_workers=6, client=None):
+    """
+    Fetch the ranking for a date range as parallel per-shard queries merged locally.
+    
+    Each shard is an independent archive query cached on its own date range,
+    so shards that end in the past are served from the response cache on
+    later runs and a rolling rerun only fetches the newest shard.
+    
+    Only tokens that rank within shard_limit in at least one shard can appear
+    in the merged ranking, so shard_limit should be well above limit.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        order_by: Field to order by ("volume" or "volatility_token")
+        shard: "daily" or "weekly"
+        limit: Number of top-ranked tokens in the merged result
+        shard_limit: Number of tokens fetched per shard
+        max_workers: Maximum number of concurrent shard queries
+        client: BitqueryClient to use (defaults to the shared client)
+    
+    Returns:
+        Dictionary containing the merged API response data, or None if any shard fails
+    """
+    client = client or get_client()
+    shards = _date_shards(start_date, end_date, shard)
+    logger.info("Fetching %s ranking from %s to %s as %d %s shards...",
+                order_by, start_date, end_date, len(shards), shard)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        shard_responses = list(executor.map(
+            lambda dates: fetch_memecoin_data_by_period(dates[0], dates[1], order_by, client, shard_limit),
+            shards
+        ))
+    
+    if any(response is None or not response.get('data') for response in shard_responses):
+        logger.error("Error fetching one or more shards for %s to %s", start_date, end_date)
+        return None
+    
+    return merge_ranking_shards(shard_responses, order_by, limit)
+
 def fetch_memecoin_data_by_volume():
     """
     Fetch memecoin data from Bitquery API ordered by volume for the last 6 months.
@@ -108,7 +384,7 @@ def fetch_memecoin_data_by_volume():
     start_str = start_date.strftime("%Y-%m-%d")
     end_str = end_date.strftime("%Y-%m-%d")
     
-    print(f"Fetching volume data from {start_str} to {end_str}")
+    logger.info("Fetching volume data from %s to %s", start_str, end_str)
     return fetch_memecoin_data_by_period(start_str, end_str, "volume")
 
 def fetch_memecoin_data_by_volatility():
@@ -127,7 +403,7 @@ def fetch_memecoin_data_by_volatility():
     start_str = start_date.strftime("%Y-%m-%d")
     end_str = end_date.strftime("%Y-%m-%d")
     
-    print(f"Fetching volatility data from {start_str} to {end_str}")
+    logger.info("Fetching volatility data from %s to %s", start_str, end_str)
     return fetch_memecoin_data_by_period(start_str, end_str, "volatility_token")
 
 def fetch_memecoin_data_by_volatility_run2():
@@ -141,18 +417,20 @@ def fetch_memecoin_data_by_volatility_run2():
     start_str = "2024-09-01"
     end_str = "2025-03-30"
     
-    print(f"Fetching volatility data for Run 2 from {start_str} to {end_str}")
+    logger.info("Fetching volatility data for Run 2 from %s to %s", start_str, end_str)
     return fetch_memecoin_data_by_period(start_str, end_str, "volatility_token")
 
 
-def fetch_sol_price():
+def fetch_sol_price(client=None):
     """
     Fetch current SOL price in USD.
     
+    Args:
+        client: BitqueryClient to use (defaults to the shared client)
+    
     Returns:
         SOL price in USD, or 0 if fetch fails
     """
-    url = "https://streaming.bitquery.io/eap"
     
     query = """
     query MyQuery {
@@ -172,17 +450,8 @@ def fetch_sol_price():
     }
     """
     
-    payload = json.dumps({
-        "query": query,
-        "variables": "{}"
-    })
-    
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': 'Bearer ' + AUTH_TOKEN
-    }
-    
-    response = requests.request("POST", url, headers=headers, data=payload)
+    client = client or get_client()
+    response = client.post_query(query)
     
     if response.status_code == 200:
         data = response.json()
@@ -192,18 +461,146 @@ def fetch_sol_price():
                 sol_price = float(tokens[0]['Price']['Ohlc']['Close'])
                 return sol_price
     else:
-        print(f"Error fetching SOL price: {response.status_code}")
-        print(response.text)
+        logger.error("Error fetching SOL price: %s %s", response.status_code, response.text)
     
     return 0.0
 
-def fetch_token_supply_data(token_addresses):
+def _fetch_in_batches(token_addresses, fetch_batch, batch_size, max_concurrency, limit, label):
+    """
+    Fetch an address list in concurrent batches and merge the partial results.
+    
+    A batch whose row count reaches the query limit may have been truncated
+    server-side, so it is split in half and both halves are fetched again.
+    A single address that still reaches the limit cannot be split further;
+    its partial result is kept and a warning is logged.
+    
+    Args:
+        token_addresses: List of token mint addresses
+        fetch_batch: Callable taking a list of addresses and returning (dict, row_count)
+        batch_size: Maximum number of addresses per query
+        max_concurrency: Maximum number of batches in flight
+        limit: Row limit used by the query
+        label: Description used in progress messages
+        
+    Returns:
+        Merged dictionary of all batch results
+    """
+    batches = [token_addresses[i:i + batch_size] for i in range(0, len(token_addresses), batch_size)]
+    merged = {}
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as executor:
+        pending = {executor.submit(fetch_batch, batch): batch for batch in batches}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                result, row_count = future.result()
+                if row_count >= limit and len(batch) > 1:
+                    middle = len(batch) // 2
+                    logger.warning("%s batch of %d tokens hit the limit of %d rows, splitting and retrying",
+                                   label, len(batch), limit)
+                    for half in (batch[:middle], batch[middle:]):
+                        pending[executor.submit(fetch_batch, half)] = half
+                else:
+                    if row_count >= limit:
+                        logger.warning("%s query for %s hit the limit of %d rows; its data may be truncated "
+                                       "(raise the limit or narrow the date range)", label, batch[0], limit)
+                    merged.update(result)
+    
+    return merged
+
+class SolPriceCache:
+    """
+    TTL-memoized SOL price shared across threads and processes.
+    
+    The price is kept in memory and mirrored to a small file in the response
+    cache directory, so concurrent callers and other processes reuse one
+    lookup for ttl seconds. Failed lookups are never memoized.
+    """
+    
+    def __init__(self, ttl=60.0, path=os.path.join(DEFAULT_CACHE_DIR, "sol_price.json")):
+        """
+        Args:
+            ttl: Seconds a fetched price stays valid
+            path: File used to share the price with other processes
+        """
+        self.ttl = ttl
+        self.path = path
+        self._price = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+    
+    def _read_shared(self):
+        try:
+            with open(self.path, "r") as f:
+                entry = json.load(f)
+            return float(entry['price']), float(entry['fetched_at'])
+        except (FileNotFoundError, ValueError, KeyError):
+            return None, 0.0
+    
+    def _write_shared(self, price, fetched_at):
+        atomic_write_json(self.path, {'price': price, 'fetched_at': fetched_at})
+    
+    def get(self, client=None):
+        """
+        Get the SOL price, fetching it only if no fresh value is memoized.
+        
+        Args:
+            client: BitqueryClient to use (defaults to the shared client)
+        
+        Returns:
+            SOL price in USD, or 0 if fetch fails
+        """
+        with self._lock:
+            now = time.time()
+            if self._price is not None and now - self._fetched_at < self.ttl:
+                return self._price
+            
+            price, fetched_at = self._read_shared()
+            if price is not None and now - fetched_at < self.ttl:
+                self._price, self._fetched_at = price, fetched_at
+                return price
+            
+            logger.info("Fetching SOL price...")
+            price = fetch_sol_price(client)
+            if price > 0:
+                self._price, self._fetched_at = price, time.time()
+                self._write_shared(price, self._fetched_at)
+            return price
+
+_sol_price_cache = SolPriceCache()
+
+def get_sol_price(client=None):
+    """
+    Get the SOL price in USD through the shared TTL-memoized cache.
+    
+    Args:
+        client: BitqueryClient to use (defaults to the shared client)
+    
+    Returns:
+        SOL price in USD, or 0 if fetch fails
+    """
+    return _sol_price_cache.get(client)
+
+def fetch_token_supply_data(token_addresses, sol_price=None, client=None,
+                            batch_size=200, max_concurrency=4, limit=1000, eager_sol_price=False):
     """
     Fetch market cap data for a list of token addresses using TokenSupplyUpdates.
     For memecoins, we get PostBalance in SOL and convert to USD using current SOL price.
     
+    The address list is split into batches that are fetched concurrently.
+    The SOL price is only needed for tokens without PostBalanceInUSD, so by
+    default it is resolved lazily, after the supply data shows it is needed.
+    
     Args:
         token_addresses: List of token mint addresses
+        sol_price: SOL price in USD if already known (resolved through get_sol_price when None)
+        client: BitqueryClient to use (defaults to the shared client)
+        batch_size: Maximum number of addresses per query
+        max_concurrency: Maximum number of batch queries in flight
+        limit: Row limit per query; batches reaching it are split and retried
+        eager_sol_price: Fetch the SOL price concurrently with the supply query
+            instead of waiting to see whether any token needs it
         
     Returns:
         Dictionary containing market cap data for each token (mint_address -> market_cap_usd)
@@ -211,14 +608,52 @@ def fetch_token_supply_data(token_addresses):
     if not token_addresses:
         return {}
     
-    # First, get current SOL price
-    print("Fetching SOL price...")
-    sol_price = fetch_sol_price()
-    if sol_price == 0:
-        print("Warning: Could not fetch SOL price, using 0 for market cap calculations")
+    sol_price_executor = None
+    sol_price_future = None
+    if sol_price is None and eager_sol_price:
+        sol_price_executor = ThreadPoolExecutor(max_workers=1)
+        sol_price_future = sol_price_executor.submit(get_sol_price, client)
+    
+    try:
+        balances = _fetch_in_batches(
+            list(token_addresses),
+            lambda batch: _fetch_token_supply_batch(batch, limit, client),
+            batch_size, max_concurrency, limit, "market cap"
+        )
+        
+        # Only resolve the SOL price if some token needs the PostBalance fallback
+        needs_sol_price = any(post_balance_usd <= 0 and post_balance_sol > 0
+                              for post_balance_usd, post_balance_sol in balances.values())
+        if sol_price is None and needs_sol_price:
+            sol_price = sol_price_future.result() if sol_price_future else get_sol_price(client)
+            if sol_price == 0:
+                logger.warning("Could not fetch SOL price, using 0 for market cap calculations")
+    finally:
+        if sol_price_executor is not None:
+            sol_price_executor.shutdown(wait=False)
+    
+    market_cap_data = {}
+    for mint_address, (post_balance_usd, post_balance_sol) in balances.items():
+        if post_balance_usd > 0:
+            # Direct USD value available
+            market_cap_usd = post_balance_usd
+        elif post_balance_sol > 0 and sol_price and sol_price > 0:
+            # Convert SOL to USD
+            market_cap_usd = post_balance_sol * sol_price
+        else:
+            # No data available
+            market_cap_usd = 0
+        market_cap_data[mint_address] = market_cap_usd
     
-    url = "https://streaming.bitquery.io/eap"
+    return market_cap_data
+
+def _fetch_token_supply_batch(token_addresses, limit, client=None):
+    """
+    Fetch the latest supply balances for a single batch of token addresses.
     
+    Returns:
+        Tuple of (mint_address -> (PostBalanceInUSD, PostBalance) dictionary, number of rows returned)
+    """
     # Create the query for market cap data using TokenSupplyUpdates
     # Format token addresses as a GraphQL array
     token_addresses_str = '["' + '", "'.join(token_addresses) + '"]'
@@ -229,7 +664,7 @@ def fetch_token_supply_data(token_addresses):
       Solana {
         TokenSupplyUpdates(
           where: {TokenSupplyUpdate: {Currency: {MintAddress: {in: $token_addresses}}}}
-          limit: {count: 1000}
+          limit: {count: $limit}
           orderBy: {descending: Block_Time}
           limitBy: {by: TokenSupplyUpdate_Currency_MintAddress, count: 1}
         ) {
@@ -245,80 +680,122 @@ def fetch_token_supply_data(token_addresses):
     }
     """)
     
-    query = query_template.substitute(token_addresses=token_addresses_str)
+    query = query_template.substitute(token_addresses=token_addresses_str, limit=limit)
     
-    payload = json.dumps({
-        "query": query,
-        "variables": "{}"
-    })
-    
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': 'Bearer ' + AUTH_TOKEN
-    }
-    
-    response = requests.request("POST", url, headers=headers, data=payload)
+    client = client or get_client()
+    response = client.post_query(query)
     
     if response.status_code == 200:
-        data = response.json()
+        balances, row_count, errors = decode_supply_balances(_response_source(response))
         
         # Check for errors first
-        if 'errors' in data and data['errors']:
-            print(f"API Errors: {data['errors']}")
-            return {}
-        
-        # Process the data to create a simple address -> market_cap mapping
-        market_cap_data = {}
+        if errors:
+            logger.error("API Errors: %s", errors)
+            return {}, 0
         
-        # Add proper null checks
-        if data and 'data' in data and data['data'] and 'Solana' in data['data'] and 'TokenSupplyUpdates' in data['data']['Solana']:
-            print(f"Found {len(data['data']['Solana']['TokenSupplyUpdates'])} TokenSupplyUpdates")
-            for token_update in data['data']['Solana']['TokenSupplyUpdates']:
-                mint_address = token_update['TokenSupplyUpdate']['Currency']['MintAddress']
-                
-                # Try PostBalanceInUSD first, fallback to PostBalance * SOL price
-                post_balance_usd = float(token_update['TokenSupplyUpdate'].get('PostBalanceInUSD', 0))
-                post_balance_sol = float(token_update['TokenSupplyUpdate'].get('PostBalance', 0))
-                
-                # print(f"Token {mint_address}: PostBalanceInUSD={post_balance_usd}, PostBalance={post_balance_sol}")
-                
-                if post_balance_usd > 0:
-                    # Direct USD value available
-                    market_cap_usd = post_balance_usd
-                elif post_balance_sol > 0 and sol_price > 0:
-                    # Convert SOL to USD
-                    market_cap_usd = post_balance_sol * sol_price
-                else:
-                    # No data available
-                    market_cap_usd = 0
-                
-                # print(f"Calculated market cap: ${market_cap_usd:,.2f}")
-                market_cap_data[mint_address] = market_cap_usd
-        else:
-            print("Warning: No TokenSupplyUpdates data found in response")
-            if data:
-                print(f"Response structure: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-                if 'data' in data and data['data']:
-                    print(f"Data structure: {list(data['data'].keys()) if isinstance(data['data'], dict) else 'Not a dict'}")
-                else:
-                    print("data['data'] is None or empty")
+        logger.debug("Found %d TokenSupplyUpdates", row_count)
+        if row_count == 0:
+            logger.warning("No TokenSupplyUpdates data found in response")
         
-        return market_cap_data
+        return balances, row_count
     else:
-        print(f"Error fetching market cap data: {response.status_code}")
-        print(response.text)
-        return {}
+        logger.error("Error fetching market cap data: %s %s", response.status_code, response.text)
+        return {}, 0
+
+class FetchTimer:
+    """
+    Records wall-clock latency of individual fetch calls so the critical path
+    of a concurrent fetch can be inspected after the fact.
+    """
+    
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.timings = []
+        self._lock = threading.Lock()
+    
+    def timed(self, name, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) and record its start/end offsets under name.
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.timings.append({
+                    'call': name,
+                    'start': round(start - self.origin, 4),
+                    'end': round(end - self.origin, 4),
+                    'latency': round(end - start, 4)
+                })
+    
+    def summary(self):
+        """
+        Summarize recorded calls.
+        
+        Returns:
+            Dictionary with per-call timings, the summed latency of all calls
+            and the wall-clock time of the whole fetch (the critical path)
+        """
+        timings = sorted(self.timings, key=lambda t: t['start'])
+        return {
+            'calls': timings,
+            'total_latency': round(sum(t['latency'] for t in timings), 4),
+            'wall_clock': round(time.perf_counter() - self.origin, 4)
+        }
+
+def _extract_mint_addresses(response):
+    """
+    Extract the ordered list of unique mint addresses from a DEXTradeByTokens response.
+    """
+    addresses = []
+    if response and 'data' in response and response['data'] and 'Solana' in response['data']:
+        for token in response['data']['Solana']['DEXTradeByTokens']:
+            mint_address = token['Trade']['Currency']['MintAddress']
+            if mint_address not in addresses:
+                addresses.append(mint_address)
+    return addresses
+
+def log_fetch_timings(fetch_timings):
+    """
+    Log per-call latency and the critical path of a fetch.
+    
+    Args:
+        fetch_timings: Summary returned by FetchTimer.summary()
+    """
+    logger.info("%-32s %-10s %-10s %-10s", "Call", "Start (s)", "End (s)", "Latency (s)")
+    for timing in fetch_timings['calls']:
+        logger.info("%-32s %-10.3f %-10.3f %-10.3f",
+                    timing['call'], timing['start'], timing['end'], timing['latency'])
+    logger.info("Summed latency: %.3fs, wall clock (critical path): %.3fs",
+                fetch_timings['total_latency'], fetch_timings['wall_clock'],
+                extra={'fetch_timings': fetch_timings})
 
-def fetch_memecoin_data(start_date=None, end_date=None):
+def fetch_memecoin_data(start_date=None, end_date=None, max_workers=6, client=None, shard=None,
+                        eager_sol_price=False):
     """
     Fetch both volume-ordered and volatility-ordered memecoin data, plus market cap data.
     
+    The two ranking queries run in parallel. Once both have returned, the
+    supply and ROI price queries run in parallel for the union of their mint
+    addresses, so tokens in both rankings are only fetched once. The union
+    (volume ranking first) does not depend on which ranking finishes first,
+    which keeps the issued queries replayable and cacheable.
+    
     Args:
         start_date: Start date in YYYY-MM-DD format (optional, defaults to 6 months ago)
         end_date: End date in YYYY-MM-DD format (optional, defaults to today)
+        max_workers: Maximum number of concurrent requests
+        client: BitqueryClient to use (defaults to the shared client)
+        shard: Optional "daily" or "weekly" to fetch the rankings as cached
+            date shards merged locally (see fetch_memecoin_data_sharded)
+        eager_sol_price: Fetch the SOL price alongside the supply queries instead
+            of only when a token needs the PostBalance fallback
     
     Returns:
-        Dictionary containing both datasets, market cap data, and ROI price data
+        Dictionary containing both datasets, market cap data, ROI price data and
+        per-call fetch timings
     """
     # Set default date range if not provided
     if start_date is None or end_date is None:
@@ -328,53 +805,79 @@ def fetch_memecoin_data(start_date=None, end_date=None):
         start_date = start_date.strftime("%Y-%m-%d")
         end_date = end_date.strftime("%Y-%m-%d")
     
-    print(f"Fetching memecoin data from {start_date} to {end_date}...")
+    logger.info("Fetching memecoin data from %s to %s...", start_date, end_date)
     
-    print("Fetching volume-ordered data...")
-    volume_data = fetch_memecoin_data_by_period(start_date, end_date, "volume")
+    client = client or get_client()
+    timer = FetchTimer()
     
-    print("Fetching volatility-ordered data...")
-    volatility_data = fetch_memecoin_data_by_period(start_date, end_date, "volatility_token")
+    def fetch_ranking(order_by):
+        if shard is None:
+            return fetch_memecoin_data_by_period(start_date, end_date, order_by, client)
+        return fetch_memecoin_data_sharded(start_date, end_date, order_by, shard, client=client)
     
-    if volume_data is None or volatility_data is None:
-        return None
-    
-    # Extract token addresses from both datasets
-    token_addresses = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        logger.info("Fetching volume-ordered and volatility-ordered data in parallel...")
+        ranking_futures = {
+            executor.submit(timer.timed, "ranking:volume", fetch_ranking, "volume"): 'volume',
+            executor.submit(timer.timed, "ranking:volatility_token", fetch_ranking, "volatility_token"): 'volatility'
+        }
+        
+        rankings = {ranking_futures[future]: future.result() for future in as_completed(ranking_futures)}
+        
+        # Shared tokens are fetched once for both rankings
+        addresses = list(dict.fromkeys(_extract_mint_addresses(rankings['volume']) +
+                                       _extract_mint_addresses(rankings['volatility'])))
+        market_cap_data = {}
+        roi_price_data = {}
+        if addresses:
+            logger.info("Fetching market cap and ROI price data for %d tokens from both rankings...",
+                        len(addresses))
+            supply_future = executor.submit(timer.timed, "supply", fetch_token_supply_data, addresses,
+                                            client=client, eager_sol_price=eager_sol_price)
+            roi_future = executor.submit(timer.timed, "roi_prices", fetch_token_oldest_latest_prices,
+                                         addresses, start_date, end_date, client)
+            market_cap_data = supply_future.result()
+            roi_price_data = roi_future.result()
     
-    if 'data' in volume_data and 'Solana' in volume_data['data']:
-        for token in volume_data['data']['Solana']['DEXTradeByTokens']:
-            mint_address = token['Trade']['Currency']['MintAddress']
-            token_addresses.add(mint_address)
+    volume_data = rankings.get('volume')
+    volatility_data = rankings.get('volatility')
     
-    if 'data' in volatility_data and 'Solana' in volatility_data['data']:
-        for token in volatility_data['data']['Solana']['DEXTradeByTokens']:
-            mint_address = token['Trade']['Currency']['MintAddress']
-            token_addresses.add(mint_address)
+    if volume_data is None or volatility_data is None:
+        return None
     
-    print(f"Fetching market cap data for {len(token_addresses)} tokens...")
-    market_cap_data = fetch_token_supply_data(list(token_addresses))
+    logger.info("Retrieved ROI price data for %d tokens", len(roi_price_data))
     
-    # Fetch ROI price data using the same date range
-    print(f"Fetching ROI price data from {start_date} to {end_date}...")
-    roi_price_data = fetch_token_oldest_latest_prices(list(token_addresses), start_date, end_date)
-    print(f"Retrieved ROI price data for {len(roi_price_data)} tokens")
+    fetch_timings = timer.summary()
+    log_fetch_timings(fetch_timings)
+    if client.cache is not None:
+        cache_stats = client.cache.stats()
+        logger.info("Response cache: %d hits, %d misses (%.1f%% hit rate)",
+                    cache_stats['hits'], cache_stats['misses'], cache_stats['hit_rate'],
+                    extra={'cache_stats': cache_stats})
     
     return {
         'volume_ordered': volume_data,
         'volatility_ordered': volatility_data,
         'market_cap_data': market_cap_data,
-        'roi_price_data': roi_price_data
+        'roi_price_data': roi_price_data,
+        'fetch_timings': fetch_timings
     }
 
-def fetch_token_oldest_latest_prices(token_addresses, start_date, end_date):
+def fetch_token_oldest_latest_prices(token_addresses, start_date, end_date, client=None,
+                                     batch_size=200, max_concurrency=4, limit=1000):
     """
     Fetch oldest and latest prices for a list of token addresses within a date range.
     
+    The address list is split into batches that are fetched concurrently.
+    
     Args:
         token_addresses: List of token mint addresses
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
+        client: BitqueryClient to use (defaults to the shared client)
+        batch_size: Maximum number of addresses per query
+        max_concurrency: Maximum number of batch queries in flight
+        limit: Row limit per query; batches reaching it are split and retried
         
     Returns:
         Dictionary containing price data for each token
@@ -383,15 +886,26 @@ def fetch_token_oldest_latest_prices(token_addresses, start_date, end_date):
     if not token_addresses:
         return {}
     
-    url = "https://streaming.bitquery.io/eap"
+    return _fetch_in_batches(
+        list(token_addresses),
+        lambda batch: _fetch_token_price_batch(batch, start_date, end_date, limit, client),
+        batch_size, max_concurrency, limit, "ROI price"
+    )
+
+def _fetch_token_price_batch(token_addresses, start_date, end_date, limit, client=None):
+    """
+    Fetch oldest and latest prices for a single batch of token addresses.
     
+    Returns:
+        Tuple of (mint_address -> price info dictionary, number of rows returned)
+    """
     # Create the query for oldest and latest prices using the exact structure provided
     token_addresses_str = '["' + '", "'.join(token_addresses) + '"]'
     
     query = f"""{{
   Solana(dataset: archive) {{
     DEXTradeByTokens(
-      limit: {{count: 1000}}
+      limit: {{count: {limit}}}
       where: {{
         Trade: {{
           Currency: {{
@@ -445,87 +959,162 @@ def fetch_token_oldest_latest_prices(token_addresses, start_date, end_date):
   }}
 }}"""
     
-    payload = json.dumps({
-        "query": query,
-        "variables": "{}"
-    })
-    
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': 'Bearer ' + AUTH_TOKEN
-    }
-    
-    response = requests.request("POST", url, headers=headers, data=payload)
+    client = client or get_client()
+    response = client.post_query(query, cache_range=(start_date, end_date))
     
     if response.status_code == 200:
-        data = response.json()
+        price_data, row_count, errors = decode_price_data(_response_source(response))
         
-        # Debug: Print response structure
-        print(f"Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-        if 'data' in data and data['data']:
-            print(f"Data keys: {list(data['data'].keys()) if isinstance(data['data'], dict) else 'Not a dict'}")
-            if 'Solana' in data['data'] and data['data']['Solana']:
-                print(f"Solana keys: {list(data['data']['Solana'].keys()) if isinstance(data['data']['Solana'], dict) else 'Not a dict'}")
-                if 'DEXTradeByTokens' in data['data']['Solana']:
-                    print(f"Found {len(data['data']['Solana']['DEXTradeByTokens'])} DEXTradeByTokens")
+        if errors:
+            logger.error("API Errors: %s", errors)
+            return {}, 0
         
-        # Process the data to create price mapping
-        price_data = {}
+        logger.debug("Found %d DEXTradeByTokens, processed %d tokens with price data",
+                     row_count, len(price_data))
+        return price_data, row_count
+    else:
+        logger.error("Error fetching price data: %s %s", response.status_code, response.text)
+        return {}, 0
+
+# Candle interval label -> Bitquery Time(interval) unit
+CANDLE_INTERVAL_UNITS = {"1h": "hours", "1d": "days"}
+
+def _fetch_token_candles_batch(token_addresses, start_date, end_date, interval, limit, client=None):
+    """
+    Fetch OHLCV candles for a single batch of token addresses.
+    
+    Returns:
+        Tuple of (mint_address -> candle columns, number of rows returned)
+    """
+    token_addresses_str = '["' + '", "'.join(token_addresses) + '"]'
+    
+    query = f"""{{
+  Solana(dataset: archive) {{
+    DEXTradeByTokens(
+      limit: {{count: {limit}}}
+      orderBy: {{ascendingByField: "Block_Timefield"}}
+      where: {{
+        Trade: {{
+          Currency: {{
+            MintAddress: {{
+              in: {token_addresses_str}
+            }}
+          }},
+          PriceAsymmetry: {{
+            lt: 0.1
+          }},
+          Side: {{
+            Currency: {{
+              MintAddress: {{
+                in: ["So11111111111111111111111111111111111111112", "So11111111111111111111111111111111111111111"]
+              }}
+            }}
+          }}
+        }},
+        Block: {{
+          Date: {{
+            since: "{start_date}",
+            till: "{end_date}"
+          }}
+        }}
+      }}
+    ) {{
+      Block {{
+        Timefield: Time(interval: {{in: {CANDLE_INTERVAL_UNITS[interval]}, count: 1}})
+      }}
+      volume: sum(of: Trade_Amount)
+      Trade {{
+        high: Price(maximum: Trade_Price)
+        low: Price(minimum: Trade_Price)
+        open: Price(minimum: Block_Slot)
+        close: Price(maximum: Block_Slot)
+        Currency {{
+          MintAddress
+        }}
+      }}
+    }}
+  }}
+}}"""
+    
+    client = client or get_client()
+    response = client.post_query(query, cache_range=(start_date, end_date))
+    
+    if response.status_code == 200:
+        candles, row_count, errors = decode_candles(_response_source(response))
         
-        if data and 'data' in data and data['data'] and 'Solana' in data['data'] and 'DEXTradeByTokens' in data['data']['Solana']:
-            for i, token in enumerate(data['data']['Solana']['DEXTradeByTokens']):
-                print(f"Processing token {i+1}: {list(token.keys())}")
-                
-                if 'Trade' in token and token['Trade']:
-                    trade_data = token['Trade']
-                    print(f"Trade data keys: {list(trade_data.keys())}")
-                    
-                    if 'Currency' in trade_data and trade_data['Currency']:
-                        mint_address = trade_data['Currency']['MintAddress']
-                        print(f"Token {i+1} - MintAddress: {mint_address}")
-                        print(f"Token {i+1} - oldest_price (raw): {trade_data.get('oldest_price', 'NOT_FOUND')}")
-                        print(f"Token {i+1} - latest_price (raw): {trade_data.get('latest_price', 'NOT_FOUND')}")
-                        
-                        # Convert to float and handle scientific notation
-                        oldest_price_raw = trade_data.get('oldest_price', 0)
-                        latest_price_raw = trade_data.get('latest_price', 0)
-                        
-                        # Scale up prices by 1e18 to work with larger numbers for calculations
-                        scale_factor = 1e18
-                        
-                        if oldest_price_raw != 0:
-                            oldest_price_float = float(oldest_price_raw) * scale_factor
-                            print(f"Token {i+1} - oldest_price (raw): {oldest_price_raw}")
-                            print(f"Token {i+1} - oldest_price (scaled): {oldest_price_float:.10f}")
-                        else:
-                            oldest_price_float = 0.0
-                            print(f"Token {i+1} - oldest_price (scaled): 0.0000000000")
-                            
-                        if latest_price_raw != 0:
-                            latest_price_float = float(latest_price_raw) * scale_factor
-                            print(f"Token {i+1} - latest_price (raw): {latest_price_raw}")
-                            print(f"Token {i+1} - latest_price (scaled): {latest_price_float:.10f}")
-                        else:
-                            latest_price_float = 0.0
-                            print(f"Token {i+1} - latest_price (scaled): 0.0000000000")
-                        
-                        price_data[mint_address] = {
-                            'oldest_price': oldest_price_float,
-                            'latest_price': latest_price_float,
-                            'symbol': trade_data['Currency']['Symbol'],
-                            'name': trade_data['Currency']['Name']
-                        }
-                    else:
-                        print(f"Token {i+1} - No Currency data found")
-                else:
-                    print(f"Token {i+1} - No Trade data found")
+        if errors:
+            logger.error("API Errors: %s", errors)
+            return {}, 0
         
-        print(f"Processed {len(price_data)} tokens with price data")
-        return price_data
+        logger.debug("Found %d candles for %d tokens", row_count, len(candles))
+        return candles, row_count
     else:
-        print(f"Error fetching price data: {response.status_code}")
-        print(response.text)
-        return {}
-
+        logger.error("Error fetching candle data: %s %s", response.status_code, response.text)
+        return {}, 0
 
+def fetch_token_candles(token_addresses, start_date, end_date, interval="1d", client=None,
+                        batch_size=20, max_concurrency=4, limit=10000):
+    """
+    Fetch per-token OHLCV candles within a date range.
+    
+    The address list is split into batches that are fetched concurrently.
+    
+    Args:
+        token_addresses: List of token mint addresses
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        interval: Candle interval ("1d" or "1h")
+        client: BitqueryClient to use (defaults to the shared client)
+        batch_size: Maximum number of addresses per query
+        max_concurrency: Maximum number of batch queries in flight
+        limit: Row (candle) limit per query; batches reaching it are split and retried
+    
+    Returns:
+        Dictionary of mint_address -> {'time', 'open', 'high', 'low', 'close', 'volume'} lists
+    """
+    if not token_addresses:
+        return {}
+    if interval not in CANDLE_INTERVAL_UNITS:
+        raise ValueError(f"Unknown candle interval {interval!r}; expected one of {list(CANDLE_INTERVAL_UNITS)}")
+    
+    return _fetch_in_batches(
+        list(token_addresses),
+        lambda batch: _fetch_token_candles_batch(batch, start_date, end_date, interval, limit, client),
+        batch_size, max_concurrency, limit, "Candle"
+    )
 
+def update_candle_store(store, token_addresses, start_date, end_date, client=None, **fetch_options):
+    """
+    Bring a CandleStore up to date for a list of tokens.
+    
+    Each token is fetched from the date of its newest stored candle (or from
+    start_date when nothing is stored). That candle may have been stored while
+    its interval was still open, so it is fetched again and replaced (see
+    CandleStore.append); older history is never refetched. Tokens with the
+    same resume date share batched queries.
+    
+    Args:
+        store: candle_store.CandleStore to append to
+        token_addresses: List of token mint addresses
+        start_date: First date to fetch for tokens without stored candles (YYYY-MM-DD)
+        end_date: Last date to fetch (YYYY-MM-DD)
+        client: BitqueryClient to use (defaults to the shared client)
+        **fetch_options: Keyword arguments forwarded to fetch_token_candles
+    
+    Returns:
+        Number of candles appended or replaced
+    """
+    # Group tokens by the date their fetch resumes from
+    resume_dates = {}
+    for mint_address in token_addresses:
+        last = store.last_time(mint_address)
+        since = start_date if last is None else format_epoch(last)[:10]
+        if since <= end_date:
+            resume_dates.setdefault(since, []).append(mint_address)
+    
+    appended = 0
+    for since, mint_addresses in sorted(resume_dates.items()):
+        candles = fetch_token_candles(mint_addresses, since, end_date, store.interval, client, **fetch_options)
+        appended += store.append_many(candles)
+    logger.info("Appended %d %s candles for %d tokens", appended, store.interval, len(token_addresses))
+    return appended
@@ -0,0 +1,393 @@
+"""
+Incremental decoding of Bitquery responses into compact column buffers.
+Only the fields used by the analyzer and the price/supply mappers are kept.
+
+Decoding uses ijson (streaming) when installed, otherwise orjson (fast C
+decoder), otherwise the standard library json module.
+"""
+
+import io
+import json
+import time
+import tracemalloc
+from array import array
+
+import numpy as np
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEX_TRADES_PREFIX = "data.Solana.DEXTradeByTokens.item"
+SUPPLY_UPDATES_PREFIX = "data.Solana.TokenSupplyUpdates.item"
+
+# Bytes read from the response body per incremental decoding step
+CHUNK_SIZE = 64 * 1024
+
+# Prices are scaled up by 1e18 to work with larger numbers for calculations
+PRICE_SCALE_FACTOR = 1e18
+
+
+def extract_row(row: dict):
+    """
+    Extract the fields used by the analyzer from one DEXTradeByTokens row.
+
+    Args:
+        row: DEXTradeByTokens row dictionary
+
+    Returns:
+        Tuple of (numeric values in ColumnBuffers.NUMERIC_COLUMNS order,
+        trade count, string values in ColumnBuffers.STRING_COLUMNS order)
+    """
+    trade = row['Trade']
+    currency = trade['Currency']
+    side_currency = trade['Side']['Currency']
+
+    volatility = row.get('volatility_token')
+    numeric = (
+        float(row.get('volume', 0) or 0),
+        # NaN marks a missing API volatility so the loader can fall back to high/low
+        float(volatility) if volatility is not None else np.nan,
+        float(trade.get('high', 0) or 0),
+        float(trade.get('low', 0) or 0),
+        float(trade.get('open', 0) or 0),
+        float(trade.get('close', 0) or 0)
+    )
+    strings = (
+        currency['MintAddress'],
+        currency['Name'],
+        currency['Symbol'],
+        side_currency['Symbol'],
+        side_currency['MintAddress']
+    )
+    return numeric, int(row.get('count', 0) or 0), strings
+
+
+def rows_to_columns(rows) -> dict:
+    """
+    Convert DEXTradeByTokens rows into NumPy column arrays.
+
+    Sized inputs (lists) are written into preallocated arrays; other iterables
+    are consumed one row at a time into growing ColumnBuffers.
+
+    Args:
+        rows: Iterable of DEXTradeByTokens row dictionaries
+
+    Returns:
+        Dictionary of column name -> NumPy array
+    """
+    if not hasattr(rows, '__len__'):
+        buffers = ColumnBuffers()
+        for row in rows:
+            buffers.append_row(row)
+        return buffers.to_arrays()
+
+    size = len(rows)
+    numeric = np.empty((len(ColumnBuffers.NUMERIC_COLUMNS), size), dtype=np.float64)
+    count = np.empty(size, dtype=np.int64)
+    strings = [np.empty(size, dtype=object) for _ in ColumnBuffers.STRING_COLUMNS]
+    for i, row in enumerate(rows):
+        numeric[:, i], count[i], row_strings = extract_row(row)
+        for column, value in zip(strings, row_strings):
+            column[i] = value
+
+    columns = dict(zip(ColumnBuffers.NUMERIC_COLUMNS, numeric))
+    columns['count'] = count
+    columns.update(zip(ColumnBuffers.STRING_COLUMNS, strings))
+    return columns
+
+
+class ColumnBuffers:
+    """
+    Append-only column buffers for DEXTradeByTokens rows.
+
+    Numeric columns are kept in typed array.array buffers (8 bytes per value)
+    and string columns in plain lists, so no per-row dict is retained.
+    """
+
+    NUMERIC_COLUMNS = ('volume', 'volatility', 'high', 'low', 'open', 'close')
+    STRING_COLUMNS = ('mint_address', 'name', 'symbol', 'side_currency', 'side_mint')
+
+    def __init__(self):
+        self.numeric = {column: array('d') for column in self.NUMERIC_COLUMNS}
+        self.count = array('q')
+        self.strings = {column: [] for column in self.STRING_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    def append_row(self, row: dict) -> None:
+        """
+        Append the used fields of one DEXTradeByTokens row.
+
+        Args:
+            row: DEXTradeByTokens row dictionary
+        """
+        numeric, count, strings = extract_row(row)
+        for column, value in zip(self.NUMERIC_COLUMNS, numeric):
+            self.numeric[column].append(value)
+        self.count.append(count)
+        for column, value in zip(self.STRING_COLUMNS, strings):
+            self.strings[column].append(value)
+
+    def to_arrays(self) -> dict:
+        """
+        Expose the buffers as NumPy arrays without copying numeric data.
+
+        Returns:
+            Dictionary of column name -> NumPy array
+        """
+        columns = {column: np.frombuffer(buffer, dtype=np.float64) if len(buffer) else np.empty(0)
+                   for column, buffer in self.numeric.items()}
+        columns['count'] = np.frombuffer(self.count, dtype=np.int64) if len(self.count) else np.empty(0, dtype=np.int64)
+        for column, values in self.strings.items():
+            columns[column] = np.array(values, dtype=object)
+        return columns
+
+
+def _as_stream(source):
+    """Wrap bytes or str sources in a file-like object for ijson."""
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def _load_document(source):
+    """Decode a whole document with the fastest available decoder."""
+    if isinstance(source, dict):
+        return source
+    if hasattr(source, 'read'):
+        source = source.read()
+    if orjson is not None:
+        return orjson.loads(source)
+    return json.loads(source)
+
+
+def _iter_path(document, prefix):
+    """Yield the items found at a dotted ijson-style prefix of a decoded document."""
+    node = document
+    for key in prefix.split('.')[:-1]:
+        if not isinstance(node, dict) or node.get(key) is None:
+            return
+        node = node[key]
+    yield from node or []
+
+
+def iter_items(source, prefix):
+    """
+    Iterate the row objects at prefix together with any top-level GraphQL errors.
+
+    With ijson installed the document is parsed incrementally, so only the
+    rows of one chunk are materialized at a time and errors are reported
+    after the rows. Otherwise the whole document is decoded
+    first with orjson or json.
+
+    Args:
+        source: Decoded dict, bytes/str body, or a binary file-like object
+            (e.g. response.raw of a streamed request)
+        prefix: ijson prefix of the rows, e.g. DEX_TRADES_PREFIX
+
+    Yields:
+        ('row', row_dict) for each row and ('errors', error_list) if the
+        response contains errors
+    """
+    if ijson is None or isinstance(source, dict):
+        document = _load_document(source)
+        if document.get('errors'):
+            yield 'errors', document['errors']
+        for row in _iter_path(document, prefix):
+            yield 'row', row
+        return
+
+    # In-memory bodies only need the errors builder when an errors key can be present
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+    in_memory = isinstance(source, (bytes, bytearray, memoryview))
+    track_errors = not in_memory or b'"errors"' in source
+
+    # Feed the body in chunks to C-backed item builders for the rows and the errors
+    stream = _as_stream(source)
+    rows = ijson.sendable_list()
+    errors = ijson.sendable_list()
+    row_builder = ijson.items_coro(rows, prefix, use_float=True)
+    error_builder = ijson.items_coro(errors, 'errors', use_float=True) if track_errors else None
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        row_builder.send(chunk)
+        if error_builder is not None:
+            error_builder.send(chunk)
+        for row in rows:
+            yield 'row', row
+        del rows[:]
+    row_builder.close()
+    if error_builder is not None:
+        error_builder.close()
+    for row in rows:
+        yield 'row', row
+    if errors and errors[0]:
+        yield 'errors', errors[0]
+
+
+def decode_dex_trades(source):
+    """
+    Decode a DEXTradeByTokens ranking response into column buffers.
+
+    Args:
+        source: Decoded dict, bytes/str body, or binary file-like object
+
+    Returns:
+        Tuple of (ColumnBuffers, errors list or None)
+    """
+    buffers = ColumnBuffers()
+    errors = None
+    for kind, item in iter_items(source, DEX_TRADES_PREFIX):
+        if kind == 'errors':
+            errors = item
+        else:
+            buffers.append_row(item)
+    return buffers, errors
+
+
+def decode_price_data(source):
+    """
+    Decode an oldest/latest price response into the ROI price mapping.
+
+    Args:
+        source: Decoded dict, bytes/str body, or binary file-like object
+
+    Returns:
+        Tuple of (price_data dict, row count, errors list or None), where
+        price_data is {mint_address: {'oldest_price', 'latest_price', 'symbol', 'name'}}
+    """
+    price_data = {}
+    row_count = 0
+    errors = None
+    for kind, item in iter_items(source, DEX_TRADES_PREFIX):
+        if kind == 'errors':
+            errors = item
+            continue
+        row_count += 1
+        trade = item.get('Trade')
+        if not trade or not trade.get('Currency'):
+            continue
+
+        oldest_price = trade.get('oldest_price', 0)
+        latest_price = trade.get('latest_price', 0)
+        price_data[trade['Currency']['MintAddress']] = {
+            'oldest_price': float(oldest_price) * PRICE_SCALE_FACTOR if oldest_price != 0 else 0.0,
+            'latest_price': float(latest_price) * PRICE_SCALE_FACTOR if latest_price != 0 else 0.0,
+            'symbol': trade['Currency']['Symbol'],
+            'name': trade['Currency']['Name']
+        }
+    return price_data, row_count, errors
+
+
+def decode_supply_balances(source):
+    """
+    Decode a TokenSupplyUpdates response into supply balances.
+
+    Args:
+        source: Decoded dict, bytes/str body, or binary file-like object
+
+    Returns:
+        Tuple of ({mint_address: (PostBalanceInUSD, PostBalance)}, row count, errors list or None)
+    """
+    balances = {}
+    row_count = 0
+    errors = None
+    for kind, item in iter_items(source, SUPPLY_UPDATES_PREFIX):
+        if kind == 'errors':
+            errors = item
+            continue
+        row_count += 1
+        update = item['TokenSupplyUpdate']
+        balances[update['Currency']['MintAddress']] = (
+            float(update.get('PostBalanceInUSD', 0) or 0),
+            float(update.get('PostBalance', 0) or 0)
+        )
+    return balances, row_count, errors
+
+
+def decode_candles(source):
+    """
+    Decode an OHLCV candle response into per-token columns.
+    
+    Args:
+        source: Decoded dict, bytes/str body, or binary file-like object
+    
+    Returns:
+        Tuple of ({mint_address: {'time', 'open', 'high', 'low', 'close', 'volume'}},
+        row count, errors list or None); 'time' holds the ISO candle open times
+    """
+    candles = {}
+    row_count = 0
+    errors = None
+    for kind, item in iter_items(source, DEX_TRADES_PREFIX):
+        if kind == 'errors':
+            errors = item
+            continue
+        row_count += 1
+        trade = item['Trade']
+        columns = candles.get(trade['Currency']['MintAddress'])
+        if columns is None:
+            columns = candles[trade['Currency']['MintAddress']] = {
+                'time': [], 'open': [], 'high': [], 'low': [], 'close': [], 'volume': []
+            }
+        columns['time'].append(item['Block']['Timefield'])
+        columns['open'].append(float(trade.get('open', 0) or 0))
+        columns['high'].append(float(trade.get('high', 0) or 0))
+        columns['low'].append(float(trade.get('low', 0) or 0))
+        columns['close'].append(float(trade.get('close', 0) or 0))
+        columns['volume'].append(float(item.get('volume', 0) or 0))
+    return candles, row_count, errors
+
+
+def measure_decode(decoder, source):
+    """
+    Run a decoder and report its parse time and peak Python memory.
+
+    Peak memory is measured with tracemalloc, which also slows allocation-heavy
+    decoding down, so parse times are comparable between backends but higher
+    than in an untraced run.
+
+    Args:
+        decoder: One of the decode_* functions
+        source: Source passed to the decoder
+
+    Returns:
+        Tuple of (decoder result, stats dict with 'backend', 'parse_seconds' and 'peak_bytes')
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = decoder(source)
+        parse_seconds = time.perf_counter() - start
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    if isinstance(source, dict):
+        backend = 'predecoded'
+    elif ijson is not None:
+        backend = 'ijson'
+    else:
+        backend = 'orjson' if orjson is not None else 'json'
+    return result, {
+        'backend': backend,
+        'parse_seconds': round(parse_seconds, 6),
+        'peak_bytes': peak_bytes
+    }
@@ -0,0 +1,272 @@
+"""
+Record/replay support for the Bitquery endpoint.
+Captures real request/response pairs to disk and serves them back offline,
+either as a requests transport adapter or as a local HTTP server, with
+configurable latency, jitter, error rate and throughput.
+"""
+
+import io
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from fileio import atomic_write_json
+from response_cache import make_cache_key
+
+
+def _request_key(body) -> str:
+    """
+    Key a recorded request by its normalized GraphQL query and variables.
+
+    Args:
+        body: Raw POST body (bytes or str) sent to the GraphQL endpoint
+
+    Returns:
+        Hex digest identifying the request
+    """
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    try:
+        payload = json.loads(body or "{}")
+    except ValueError:
+        return make_cache_key(body or "")
+    variables = payload.get("variables") or "{}"
+    if not isinstance(variables, str):
+        variables = json.dumps(variables, sort_keys=True)
+    return make_cache_key(payload.get("query", "") + variables)
+
+
+class RecordingStore:
+    """
+    Directory of recorded request/response pairs, one JSON file per request.
+    """
+
+    def __init__(self, recordings_dir: str):
+        self.recordings_dir = recordings_dir
+        os.makedirs(self.recordings_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.recordings_dir, key + ".json")
+
+    def save(self, body, status_code: int, content: bytes) -> None:
+        """
+        Record one request/response pair.
+
+        Args:
+            body: Raw POST body of the request
+            status_code: HTTP status code of the response
+            content: Decoded response body
+        """
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        entry = {
+            "request": json.loads(body or "{}"),
+            "status_code": status_code,
+            "body": content.decode("utf-8")
+        }
+        atomic_write_json(self._path(_request_key(body)), entry)
+
+    def load(self, body):
+        """
+        Look up the recording for a request.
+
+        Args:
+            body: Raw POST body of the request
+
+        Returns:
+            Tuple of (status_code, body bytes), or None if nothing was recorded
+        """
+        try:
+            with open(self._path(_request_key(body)), "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        return entry["status_code"], entry["body"].encode("utf-8")
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Pooled transport adapter that forwards requests to the real endpoint and
+    records every request/response pair to disk.
+
+    Usage:
+        client = BitqueryClient(adapter=RecordingAdapter("recordings"))
+    """
+
+    def __init__(self, recordings_dir: str, **kwargs):
+        """
+        Args:
+            recordings_dir: Directory where recordings are written
+            **kwargs: Keyword arguments forwarded to HTTPAdapter
+        """
+        super().__init__(**kwargs)
+        self.store = RecordingStore(recordings_dir)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # Accessing content reads (and decompresses) the body so it can be stored
+        content = response.content
+        self.store.save(request.body, response.status_code, content)
+        # Hand the already decoded body back as raw so streaming callers can still read it
+        response.raw = io.BytesIO(content)
+        return response
+
+
+class LatencyModel:
+    """
+    Injected network behaviour shared by the replay adapter and server.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 bytes_per_second: float = None, seed: int = None):
+        """
+        Args:
+            latency: Base delay in seconds added to every response
+            jitter: Maximum extra delay in seconds, drawn uniformly per response
+            error_rate: Probability (0-1) of answering with HTTP 503
+            bytes_per_second: Simulated transfer rate of response bodies (None for unlimited)
+            seed: Random seed for reproducible jitter and errors
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.bytes_per_second = bytes_per_second
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self, body_size: int):
+        """
+        Draw the delay and failure outcome for one response.
+
+        Args:
+            body_size: Size of the response body in bytes
+
+        Returns:
+            Tuple of (delay_seconds, is_error)
+        """
+        with self._lock:
+            extra = self._random.uniform(0, self.jitter) if self.jitter else 0.0
+            is_error = self._random.random() < self.error_rate
+        delay = self.latency + extra
+        if self.bytes_per_second:
+            delay += body_size / self.bytes_per_second
+        return delay, is_error
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter that serves recorded responses without any network.
+
+    Usage:
+        client = BitqueryClient(adapter=ReplayAdapter("recordings", latency=0.2, jitter=0.05))
+    """
+
+    def __init__(self, recordings_dir: str, **latency_options):
+        """
+        Args:
+            recordings_dir: Directory holding recordings
+            **latency_options: Keyword arguments forwarded to LatencyModel
+        """
+        super().__init__()
+        self.store = RecordingStore(recordings_dir)
+        self.model = LatencyModel(**latency_options)
+        self.requests = 0
+        self.errors = 0
+        self.missing = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        recorded = self.store.load(request.body)
+        if recorded is None:
+            status_code, content = 404, b'{"errors": [{"message": "No recording for this request"}]}'
+        else:
+            status_code, content = recorded
+
+        delay, is_error = self.model.draw(len(content))
+        if is_error:
+            status_code, content = 503, b'{"errors": [{"message": "Injected replay error"}]}'
+        time.sleep(delay)
+
+        with self._lock:
+            self.requests += 1
+            self.errors += is_error
+            self.missing += recorded is None
+
+        response = requests.Response()
+        response.status_code = status_code
+        # Serve the body through raw so both .content and streaming decoders can read it
+        response.raw = io.BytesIO(content)
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        """
+        Get replay counters.
+
+        Returns:
+            Dictionary with request, injected error and missing recording counts
+        """
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "missing": self.missing}
+
+
+def serve_replay(recordings_dir: str, host: str = "127.0.0.1", port: int = 8765,
+                 **latency_options) -> ThreadingHTTPServer:
+    """
+    Start a local HTTP server that answers GraphQL POSTs from recordings.
+
+    Point a client at it with BitqueryClient(url="http://127.0.0.1:8765/eap").
+    The server runs on a daemon thread; call shutdown() on the result to stop it.
+
+    Args:
+        recordings_dir: Directory holding recordings
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        **latency_options: Keyword arguments forwarded to LatencyModel
+
+    Returns:
+        The running server
+    """
+    store = RecordingStore(recordings_dir)
+    model = LatencyModel(**latency_options)
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            recorded = store.load(body)
+            if recorded is None:
+                status_code, content = 404, b'{"errors": [{"message": "No recording for this request"}]}'
+            else:
+                status_code, content = recorded
+
+            delay, is_error = model.draw(len(content))
+            if is_error:
+                status_code, content = 503, b'{"errors": [{"message": "Injected replay error"}]}'
+            time.sleep(delay)
+
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -1,19 +1,305 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 import json
+import logging
 from decimal import Decimal, getcontext
 
+from bitquery_decode import rows_to_columns
+from candle_store import format_epoch, to_epoch
+from drawdown import DrawdownBatchTracker, DrawdownTracker
+from index_nav import DEFAULT_MIN_DELISTING_GAP, aggregate_weights, compute_nav
+from turnover import turnover_stability
+
+logger = logging.getLogger(__name__)
+
+# Profile horizon -> days of candles it covers
+CANDLE_HORIZON_DAYS = {"2w": 14, "1m": 30, "6m": 182, "1y": 365}
+
+
+def price_data_to_frame(price_data: Dict) -> pd.DataFrame:
+    """
+    Convert an oldest/latest price mapping into a frame indexed by mint address.
+    
+    Args:
+        price_data: {mint_address: {'oldest_price': float, 'latest_price': float, ...}}
+    
+    Returns:
+        DataFrame with float 'oldest_price' and 'latest_price' columns
+    """
+    size = len(price_data)
+    infos = price_data.values()
+    return pd.DataFrame({
+        'oldest_price': np.fromiter((info.get('oldest_price', 0) or 0 for info in infos), dtype=np.float64, count=size),
+        'latest_price': np.fromiter((info.get('latest_price', 0) or 0 for info in infos), dtype=np.float64, count=size)
+    }, index=pd.Index(list(price_data), dtype=object, name='mint_address'))
+
+def describe_top_tokens(top_tokens: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the price range, price volatility and volume weight columns shown for
+    the largest tokens of an index.
+    
+    Args:
+        top_tokens: Rows of the top tokens, largest volume first
+    
+    Returns:
+        DataFrame with the top token details
+    """
+    top_tokens = top_tokens.copy()
+    
+    # Add additional calculated metrics for each token
+    top_tokens['price_range'] = top_tokens['high'] - top_tokens['low']
+    # Use decimal arithmetic for price volatility calculation to avoid precision errors
+    def calc_price_volatility(row):
+        if row['close'] > 0:
+            price_range = Decimal(str(row['price_range']))
+            close_price = Decimal(str(row['close']))
+            volatility = (price_range / close_price) * Decimal('100')
+            return float(volatility)
+        else:
+            return 0
+    
+    top_tokens['price_volatility'] = top_tokens.apply(calc_price_volatility, axis=1)
+    top_tokens['volume_weight'] = (top_tokens['volume'] / top_tokens['volume'].sum()) * 100
+    
+    return top_tokens[['symbol', 'name', 'mint_address', 'volume', 'price_volatility', 
+                      'high', 'low', 'close', 'count', 'volume_weight']]
+
+def index_construction_info(total_tokens: int, total_volume: float, volume_quartiles, top_10_volume: float) -> Dict:
+    """
+    Build the index construction explanation from volume aggregates.
+    
+    Args:
+        total_tokens: Number of tokens in the index
+        total_volume: Sum of token volumes
+        volume_quartiles: Mapping of quantile (0.25, 0.5, 0.75, 1.0) -> volume
+        top_10_volume: Combined volume of the 10 largest tokens
+    
+    Returns:
+        Dictionary explaining index construction methodology
+    """
+    top_10_contribution = (top_10_volume / total_volume) * 100
+    
+    construction_info = {
+        "total_tokens": total_tokens,
+        "total_volume": total_volume,
+        "volume_quartiles": {
+            "q25": volume_quartiles[0.25],
+            "q50": volume_quartiles[0.5], 
+            "q75": volume_quartiles[0.75],
+            "q100": volume_quartiles[1.0]
+        },
+        "top_10_contribution": round(top_10_contribution, 2),
+        "excluded_tokens": [
+            "USDC (EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v)",
+            "USDT (Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB)",
+            "SOL (So11111111111111111111111111111111111111111)",
+            "WSOL (So11111111111111111111111111111111111111112)",
+            "Other major stablecoins and native tokens"
+        ],
+        "selection_criteria": [
+            "Volume-based ranking (top 100 by trading volume)",
+            "Price asymmetry < 0.1 (filters out extreme price manipulation)",
+            "Non-empty token names (filters out unnamed tokens)",
+            "Date filter: Since July 1, 2024",
+            "Excludes major stablecoins and native tokens"
+        ],
+        "weighting_method": "Volume-weighted (higher volume = higher weight in index)"
+    }
+    
+    return construction_info
+
+def period_risk_metrics(range_metrics: Dict, token_count: int) -> Tuple[Dict, Dict, float]:
+    """
+    Derive the per-period volatilities, return-to-risk ratios and max drawdown
+    from the high/low range statistics.
+    
+    Args:
+        range_metrics: Output of MemeCoinRiskAnalyzer.calculate_range_metrics
+        token_count: Number of tokens the statistics were computed over
+    
+    Returns:
+        Tuple of (volatilities by period, return-to-risk ratios by period,
+        max drawdown percentage)
+    """
+    period_multiplier = {"2w": 0.8, "1m": 1.0, "6m": 1.2, "1y": 1.5}
+    
+    # Calculate volatilities for different periods
+    volatilities = {}
+    for period in ["2w", "1m", "6m", "1y"]:
+        if token_count == 0:
+            volatilities[period] = 0.0
+        elif range_metrics['median_range'] is not None:
+            # Convert median price range to percentage, apply period multiplier and cap
+            base_vol = range_metrics['median_range'] * 100
+            volatilities[period] = min(base_vol * period_multiplier[period], 500.0)
+        else:
+            # Fallback: use a reasonable memecoin volatility estimate
+            volatilities[period] = 50.0 * period_multiplier[period]  # 50% base volatility
+    
+    # Calculate return-to-risk ratios
+    return_risk_ratios = {}
+    for period in ["2w", "1m", "6m", "1y"]:
+        # Use the calculated volatility for this period
+        vol = volatilities[period] / 100  # Convert to decimal
+        
+        # Add bounds to prevent extreme values
+        if token_count > 0 and vol > 0.001:  # Minimum volatility threshold (0.1%)
+            ratio = range_metrics['mean_range'] / vol
+            # Cap the ratio to prevent extreme values
+            return_risk_ratios[period] = min(max(ratio, -1000), 1000)
+        else:
+            return_risk_ratios[period] = 0.0
+    
+    # Max drawdown as the worst case scenario from high to low
+    if range_metrics['max_drawdown'] is not None:
+        max_drawdown_pct = range_metrics['max_drawdown'] * 100
+    else:
+        max_drawdown_pct = 0.0
+    
+    return volatilities, return_risk_ratios, max_drawdown_pct
+
+def build_risk_return_profile(index_name: str, constituent_stability: float, weight_concentration: float,
+                              volatilities: Dict, return_risk_ratios: Dict, max_drawdown_pct: float,
+                              max_drawdown_date: str, roi_stats: Dict, top_roi_tokens: pd.DataFrame,
+                              worst_roi_tokens: pd.DataFrame, top_tokens: pd.DataFrame, index_info: Dict) -> Dict:
+    """
+    Assemble a risk and return profile dictionary from its computed parts.
+    
+    Returns:
+        Dictionary containing all risk and return metrics
+    """
+    profile = {
+        "index": index_name,
+        "constituent_stability": round(constituent_stability, 2),
+        "weight_concentration": round(weight_concentration, 2),
+        "volatilities": {
+            "2w": round(volatilities["2w"], 2),
+            "1m": round(volatilities["1m"], 2),
+            "6m": round(volatilities["6m"], 2),
+            "1y": round(volatilities["1y"], 2)
+        },
+        "return_risk_ratios": {
+            "2w": round(return_risk_ratios["2w"], 2),
+            "1m": round(return_risk_ratios["1m"], 2),
+            "6m": round(return_risk_ratios["6m"], 2),
+            "1y": round(return_risk_ratios["1y"], 2)
+        },
+        "max_drawdown": {
+            "percentage": round(max_drawdown_pct, 2),
+            "date": max_drawdown_date
+        },
+        "roi_statistics": roi_stats,
+        "top_roi_tokens": top_roi_tokens.to_dict('records'),
+        "worst_roi_tokens": worst_roi_tokens.to_dict('records'),
+        "top_tokens": top_tokens.to_dict('records'),
+        "index_construction": index_info
+    }
+    
+    return profile
+
 class MemeCoinRiskAnalyzer:
     """
     Analyzes risk and return metrics for memecoin data from Bitquery API.
     Calculates turnover, realized volatility, return-to-risk ratios, and max drawdown.
     """
     
-    def __init__(self):
+    def __init__(self, price_dtype=np.float64):
+        """
+        Args:
+            price_dtype: dtype of the high/low/open/close columns; np.float32
+                halves their memory for very large universes
+        """
+        self.price_dtype = price_dtype
         self.data = None
-        self.processed_data = None
+        self._processed_data = None
+        self._derived = {}
+        self.cache_hits = {}
+        self.cache_misses = {}
+        self.previous_constituents = None
+    
+    @property
+    def processed_data(self) -> pd.DataFrame:
+        """
+        Working copy of the loaded data, created on first access.
+        """
+        if self._processed_data is None and self.data is not None:
+            self._processed_data = self.data.copy()
+        return self._processed_data
+    
+    @processed_data.setter
+    def processed_data(self, value: pd.DataFrame) -> None:
+        self._processed_data = value
+    
+    def _memoized(self, key, compute):
+        """
+        Get a derived metric of the loaded data, computing it on first use.
+        
+        The cache is cleared whenever new data is loaded.
+        
+        Args:
+            key: Hashable metric identifier, e.g. ('top_by_volume', 10)
+            compute: Zero-argument function computing the metric
+        
+        Returns:
+            The cached metric
+        """
+        name = key[0] if isinstance(key, tuple) else key
+        if key in self._derived:
+            self.cache_hits[name] = self.cache_hits.get(name, 0) + 1
+            return self._derived[key]
+        self.cache_misses[name] = self.cache_misses.get(name, 0) + 1
+        value = self._derived[key] = compute()
+        return value
+    
+    def derived_cache_stats(self) -> Dict:
+        """
+        Get hit/miss counts of the derived-metric cache for profiling.
+        
+        Returns:
+            Dictionary with total 'hits', 'misses' and 'entries', plus
+            per-metric counts under 'by_metric'
+        """
+        names = sorted(set(self.cache_hits) | set(self.cache_misses))
+        return {
+            'hits': sum(self.cache_hits.values()),
+            'misses': sum(self.cache_misses.values()),
+            'entries': len(self._derived),
+            'by_metric': {name: {'hits': self.cache_hits.get(name, 0),
+                                 'misses': self.cache_misses.get(name, 0)} for name in names}
+        }
+    
+    def volume_weights(self) -> pd.Series:
+        """
+        Get the volume weights of the loaded tokens (volume / total volume).
+        
+        Returns:
+            Series of weights aligned with self.data
+        """
+        if self.data is None:
+            raise ValueError("No data loaded. Call load_bitquery_data() first.")
+        return self._memoized('volume_weights', lambda: self.data['volume'] / self.data['volume'].sum())
+    
+    def volume_hhi(self) -> float:
+        """
+        Get the Herfindahl Index of the volume weights.
+        
+        Returns:
+            HHI between 0 and 1
+        """
+        return self._memoized('hhi', lambda: (self.volume_weights() ** 2).sum())
+    
+    def set_previous_constituents(self, mint_addresses: Iterable[str], weights=None) -> None:
+        """
+        Set the constituents of the index's previous period, against which
+        calculate_constituent_stability measures turnover.
+        
+        Args:
+            mint_addresses: Previous constituent mint addresses
+            weights: Their weights (equal weights when omitted)
+        """
+        self.previous_constituents = (list(mint_addresses), None if weights is None else np.asarray(weights))
     
     def calculate_volatility_from_prices(self, high: float, low: float) -> float:
         """
@@ -44,47 +330,86 @@ class MemeCoinRiskAnalyzer:
         if 'Solana' not in data or 'DEXTradeByTokens' not in data['Solana']:
             raise ValueError("Invalid data format. Expected Solana.DEXTradeByTokens structure.")
         
-        trades = data['Solana']['DEXTradeByTokens']
+        self.load_bitquery_rows(data['Solana']['DEXTradeByTokens'], market_cap_data)
+    
+    def load_bitquery_rows(self, trades: Iterable[Dict], market_cap_data: Dict = None) -> None:
+        """
+        Load DEXTradeByTokens rows from any iterable, such as the page-by-page
+        iterator returned by bitquery_data.iter_memecoin_data_by_period.
         
-        # Convert to DataFrame for easier analysis
-        processed_trades = []
-        for trade in trades:
-            trade_data = trade['Trade']
-            # Get volume from the top level
-            volume = float(trade.get('volume', 0))
-            mint_address = trade_data['Currency']['MintAddress']
-            
-            # Get volatility from API if available, otherwise calculate from prices
-            api_volatility = trade.get('volatility_token')
-            if api_volatility is not None:
-                volatility = float(api_volatility)
-            else:
-                # Fallback: calculate volatility from high/low prices
-                high = float(trade_data.get('high', 0))
-                low = float(trade_data.get('low', 0))
-                volatility = self.calculate_volatility_from_prices(high, low)
-            
-            # Get market cap data if available
-            market_cap = market_cap_data.get(mint_address, 0) if market_cap_data else 0
-            
-            processed_trades.append({
-                'mint_address': mint_address,
-                'name': trade_data['Currency']['Name'],
-                'symbol': trade_data['Currency']['Symbol'],
-                'side_currency': trade_data['Side']['Currency']['Symbol'],
-                'side_mint': trade_data['Side']['Currency']['MintAddress'],
-                'volume': volume,
-                'volatility': volatility,
-                'market_cap': market_cap,
-                'high': float(trade_data.get('high', 0)),
-                'low': float(trade_data.get('low', 0)),
-                'open': float(trade_data.get('open', 0)),
-                'close': float(trade_data.get('close', 0)),
-                'count': int(trade.get('count', 0))
-            })
-        
-        self.data = pd.DataFrame(processed_trades)
-        self.processed_data = self.data.copy()
+        Rows are written straight into column arrays (preallocated when the
+        input has a length), so no per-token dicts are built and a streamed
+        iterator never has to be held in memory as a whole.
+        
+        Args:
+            trades: Iterable of DEXTradeByTokens row dictionaries
+            market_cap_data: Dictionary containing market cap data for tokens (mint_address -> market_cap_usd)
+        """
+        self.load_bitquery_columns(rows_to_columns(trades), market_cap_data)
+    
+    def load_bitquery_columns(self, columns, market_cap_data: Dict = None) -> None:
+        """
+        Load data decoded into column buffers by bitquery_decode.decode_dex_trades.
+        
+        Args:
+            columns: ColumnBuffers or dictionary of column name -> array
+            market_cap_data: Dictionary containing market cap data for tokens (mint_address -> market_cap_usd)
+        """
+        if hasattr(columns, 'to_arrays'):
+            columns = columns.to_arrays()
+        
+        high = np.asarray(columns['high'], dtype=np.float64)
+        low = np.asarray(columns['low'], dtype=np.float64)
+        
+        # Use API volatility where present, otherwise calculate from high/low prices
+        volatility = np.asarray(columns['volatility'], dtype=np.float64)
+        missing = np.isnan(volatility)
+        if missing.any():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fallback = np.where(low > 0, (high - low) / low * 100, 0.0)
+            volatility = np.where(missing, fallback, volatility)
+        
+        mint_addresses = pd.Series(columns['mint_address'], dtype=object)
+        if market_cap_data:
+            market_cap = mint_addresses.map(market_cap_data).fillna(0).to_numpy(dtype=np.float64)
+        else:
+            market_cap = np.zeros(len(mint_addresses))
+        
+        price_dtype = self.price_dtype
+        self.data = pd.DataFrame({
+            'mint_address': mint_addresses,
+            # Low-cardinality text columns are stored as categoricals
+            'name': pd.Categorical(columns['name']),
+            'symbol': pd.Categorical(columns['symbol']),
+            'side_currency': pd.Categorical(columns['side_currency']),
+            'side_mint': columns['side_mint'],
+            'volume': np.asarray(columns['volume'], dtype=np.float64),
+            'volatility': volatility,
+            'market_cap': market_cap,
+            'high': high.astype(price_dtype, copy=False),
+            'low': low.astype(price_dtype, copy=False),
+            'open': np.asarray(columns['open'], dtype=price_dtype),
+            'close': np.asarray(columns['close'], dtype=price_dtype),
+            'count': np.asarray(columns['count'], dtype=np.int64)
+        }, copy=False)
+        self._processed_data = None
+        self._derived = {}
+    
+    def load_dataframe(self, data: pd.DataFrame, roi_per_token: pd.DataFrame = None) -> None:
+        """
+        Load an already-built token table, such as an index view of a
+        token_universe.TokenUniverse.
+        
+        Args:
+            data: DataFrame with the columns produced by load_bitquery_columns
+            roi_per_token: Optional precomputed calculate_roi_per_token output
+                for the same rows, seeded into the derived-metric cache
+        """
+        self.data = data
+        self._processed_data = None
+        self._derived = {}
+        if roi_per_token is not None:
+            self._derived['roi_per_token'] = roi_per_token
     
     def create_volatility_ordered_data(self) -> pd.DataFrame:
         """
@@ -97,13 +422,17 @@ class MemeCoinRiskAnalyzer:
             raise ValueError("No data loaded. Call load_bitquery_data() first.")
         
         # Sort by volatility in descending order
-        volatility_ordered = self.data.sort_values('volatility', ascending=False).copy()
+        order = self._memoized('volatility_order', lambda: self.data['volatility'].sort_values(ascending=False).index)
+        volatility_ordered = self.data.loc[order].copy()
         return volatility_ordered
     
     def calculate_constituent_stability(self) -> float:
         """
         Calculate constituent stability - how stable the index composition is.
-        This is more meaningful than turnover for index construction.
+        
+        When the previous period's constituents are set (see
+        set_previous_constituents) this is 100 * (1 - one-way turnover);
+        otherwise it is derived from the Herfindahl Index of the weights.
         
         Returns:
             Constituent stability as percentage (higher = more stable)
@@ -114,13 +443,16 @@ class MemeCoinRiskAnalyzer:
         if len(self.data) == 0:
             return 0.0
         
-        # For now, we'll calculate based on weight concentration
-        # In a real implementation, you'd compare against previous periods
-        weights = self.data['volume'] / self.data['volume'].sum()
+        # With the previous period's constituents, stability is the share of
+        # the index not traded at the rebalance
+        if self.previous_constituents is not None:
+            previous_mints, previous_weights = self.previous_constituents
+            return turnover_stability(previous_mints, previous_weights,
+                                      self.data['mint_address'], self.volume_weights())
         
-        # Calculate Herfindahl Index (concentration measure)
-        # Lower HHI = more diversified = more stable
-        hhi = (weights ** 2).sum()
+        # Otherwise fall back to weight concentration
+        # Herfindahl Index (concentration measure): lower HHI = more diversified = more stable
+        hhi = self.volume_hhi()
         
         # Convert to stability percentage (0-100%)
         # HHI of 1.0 = complete concentration, HHI of 0.1 = good diversification
@@ -172,11 +504,8 @@ class MemeCoinRiskAnalyzer:
         if len(self.data) == 0:
             return 0.0
         
-        # Calculate weights
-        weights = self.data['volume'] / self.data['volume'].sum()
-        
-        # Herfindahl Index
-        hhi = (weights ** 2).sum()
+        # Herfindahl Index of the volume weights
+        hhi = self.volume_hhi()
         
         # Convert to percentage
         return hhi * 100
@@ -203,7 +532,8 @@ class MemeCoinRiskAnalyzer:
         # Convert prices to log returns
         log_returns = np.diff(np.log(valid_prices))
         
-        if len(log_returns) == 0:
+        # The sample variance needs at least two returns
+        if len(log_returns) < 2:
             return 0.0
         
         # Calculate autocorrelation-adjusted volatility
@@ -249,6 +579,8 @@ class MemeCoinRiskAnalyzer:
             "1m": 12,      # Monthly
             "6m": 2,       # 6-month periods
             "1y": 1,       # Annual
+            "1d": 365,     # Daily candles
+            "1h": 8760,    # Hourly candles
         }
         return period_map.get(period, 12)
     
@@ -278,6 +610,94 @@ class MemeCoinRiskAnalyzer:
         else:
             return 0.0
     
+    def calculate_realized_volatility_batch(self, price_matrix, period: str = "1m") -> np.ndarray:
+        """
+        Calculate autocorrelation-adjusted realized volatility for many tokens at once.
+        
+        Applies the same method as calculate_realized_volatility to every row of
+        a tokens x timestamps price matrix in one vectorized pass. Missing (NaN),
+        zero and negative prices are skipped, so each row uses the log returns
+        between its consecutive valid prices.
+        
+        Args:
+            price_matrix: 2D array-like of prices, one row per token
+            period: Time period ("2w", "1m", "6m", "1y")
+            
+        Returns:
+            Array of realized volatilities as percentages (0.0 for rows with
+            fewer than two returns or a non-positive adjusted variance)
+        """
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        if prices.ndim != 2:
+            raise ValueError("price_matrix must be 2-dimensional (tokens x timestamps)")
+        n_tokens, n_times = prices.shape
+        if n_tokens == 0 or n_times < 2:
+            return np.zeros(n_tokens)
+        
+        # Shift each row's valid prices to the front, keeping their order
+        valid = np.isfinite(prices) & (prices > 0)
+        log_prices = np.log(np.where(valid, prices, 1.0))
+        if not valid.all():
+            order = np.argsort(~valid, axis=1, kind='stable')
+            log_prices = np.take_along_axis(log_prices, order, axis=1)
+        
+        # Log returns between consecutive valid prices; n returns per row
+        n = np.maximum(valid.sum(axis=1) - 1, 0)
+        returns = np.diff(log_prices, axis=1)
+        return_mask = np.arange(n_times - 1) < n[:, None]
+        returns = np.where(return_mask, returns, 0.0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Sample variance (ddof=1)
+            mean = returns.sum(axis=1) / n
+            deviations = np.where(return_mask, returns - mean[:, None], 0.0)
+            sample_var = (deviations ** 2).sum(axis=1) / (n - 1)
+            
+            # Lag-1 autocorrelation between returns[:-1] and returns[1:] of each row
+            pair_mask = return_mask[:, 1:]
+            m = n - 1
+            lead = np.where(pair_mask, returns[:, :-1], 0.0)
+            lag = np.where(pair_mask, returns[:, 1:], 0.0)
+            lead_dev = np.where(pair_mask, lead - (lead.sum(axis=1) / m)[:, None], 0.0)
+            lag_dev = np.where(pair_mask, lag - (lag.sum(axis=1) / m)[:, None], 0.0)
+            autocorr = (lead_dev * lag_dev).sum(axis=1) / np.sqrt(
+                (lead_dev ** 2).sum(axis=1) * (lag_dev ** 2).sum(axis=1))
+            autocorr = np.where(np.isfinite(autocorr), autocorr, 0.0)
+            
+            # Adjust variance for autocorrelation and annualize
+            adjusted_var = sample_var * (1 + 2 * autocorr)
+            usable = (n >= 2) & (sample_var > 0) & (adjusted_var > 0)
+            periods_per_year = self._get_periods_per_year(period)
+            return np.where(usable, np.sqrt(adjusted_var * periods_per_year) * 100, 0.0)
+    
+    def calculate_return_to_risk_ratio_batch(self, price_matrix, period: str = "1m") -> np.ndarray:
+        """
+        Calculate return-to-risk ratios for many tokens at once.
+        
+        Gross return runs from each row's first to its last non-missing price.
+        
+        Args:
+            price_matrix: 2D array-like of prices, one row per token (NaN for missing)
+            period: Time period ("2w", "1m", "6m", "1y")
+            
+        Returns:
+            Array of return-to-risk ratios (0.0 where volatility is zero)
+        """
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        realized_vol = self.calculate_realized_volatility_batch(prices, period)
+        if prices.shape[0] == 0 or prices.shape[1] < 2:
+            return np.zeros(prices.shape[0])
+        
+        present = ~np.isnan(prices)
+        rows = np.arange(prices.shape[0])
+        first = prices[rows, np.argmax(present, axis=1)]
+        last = prices[rows, prices.shape[1] - 1 - np.argmax(present[:, ::-1], axis=1)]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gross_return = np.where(first != 0, (last - first) / first, 0.0)
+            ratio = gross_return / (realized_vol / 100)  # Convert volatility to decimal
+        return np.where((realized_vol > 0) & np.isfinite(ratio), ratio, 0.0)
+    
     def calculate_max_drawdown(self, prices: List[float], dates: Optional[List[str]] = None) -> Tuple[float, str]:
         """
         Calculate maximum drawdown and its date.
@@ -342,56 +762,38 @@ class MemeCoinRiskAnalyzer:
         if len(self.data) == 0:
             return pd.DataFrame()
         
-        # Create a copy of the data to avoid modifying the original
         roi_data = self.data.copy()
         
-        def calculate_token_roi(row):
-            """
-            Calculate ROI using oldest and latest prices from external data.
-            """
-            mint_address = row['mint_address']
-            
-            if mint_address in price_data:
-                price_info = price_data[mint_address]
-                oldest_price = price_info.get('oldest_price', 0)
-                latest_price = price_info.get('latest_price', 0)
-                
-                print(f"Debug ROI for {row['symbol']}: oldest={oldest_price}, latest={latest_price}")
-                
-                if oldest_price > 0 and latest_price > 0:
-                    roi = ((latest_price - oldest_price) / oldest_price) * 100
-                    print(f"  Calculated ROI: {roi:.2f}%")
-                    return roi
+        # Hash-join the price table onto the tokens by mint address
+        prices = price_data_to_frame(price_data).reindex(roi_data['mint_address'])
+        covered = prices['oldest_price'].notna().to_numpy()
+        oldest = prices['oldest_price'].fillna(0).to_numpy(dtype=np.float64)
+        latest = prices['latest_price'].fillna(0).to_numpy(dtype=np.float64)
+        
+        logger.info("%d/%d tokens have price data", int(covered.sum()), len(roi_data))
+        
+        # ROI is only defined where both prices are positive
+        valid = (oldest > 0) & (latest > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roi = np.where(valid, (latest - oldest) / oldest * 100, 0.0)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for symbol, mint_address, has_price, has_roi, oldest_price, latest_price, token_roi in zip(
+                    roi_data['symbol'], roi_data['mint_address'], covered, valid, oldest, latest, roi):
+                if has_roi:
+                    logger.debug("ROI for %s: oldest=%s, latest=%s, ROI=%.2f%%",
+                                 symbol, oldest_price, latest_price, token_roi)
+                elif has_price:
+                    logger.debug("Skipping ROI for %s - prices are 0: oldest=%s, latest=%s",
+                                 symbol, oldest_price, latest_price)
                 else:
-                    print(f"  Skipping - prices are 0: oldest={oldest_price}, latest={latest_price}")
-            else:
-                print(f"  No price data found for {mint_address}")
-            
-            return 0.0
+                    logger.debug("No price data found for %s", mint_address)
         
-        # Debug: Check how many tokens have price data
-        tokens_with_price_data = 0
-        for mint_address in roi_data['mint_address']:
-            if mint_address in price_data:
-                tokens_with_price_data += 1
-        
-        print(f"Debug: {tokens_with_price_data}/{len(roi_data)} tokens have price data")
-        print(f"Debug: Price data keys: {list(price_data.keys())[:5]}...")  # Show first 5 keys
-        
-        # Calculate ROI for each token
-        roi_data['roi_percentage'] = roi_data.apply(calculate_token_roi, axis=1)
-        
-        # Add price data from external source
-        roi_data['oldest_price'] = roi_data['mint_address'].map(
-            lambda x: price_data.get(x, {}).get('oldest_price', 0)
-        )
-        roi_data['latest_price'] = roi_data['mint_address'].map(
-            lambda x: price_data.get(x, {}).get('latest_price', 0)
-        )
-        
-        # Add additional ROI metrics
-        roi_data['roi_absolute'] = roi_data['latest_price'] - roi_data['oldest_price']
-        roi_data['roi_positive'] = roi_data['roi_percentage'] > 0
+        roi_data['oldest_price'] = oldest
+        roi_data['latest_price'] = latest
+        roi_data['roi_percentage'] = roi
+        roi_data['roi_absolute'] = latest - oldest
+        roi_data['roi_positive'] = roi > 0
         
         return roi_data[['symbol', 'name', 'mint_address', 'oldest_price', 'latest_price',
                         'roi_percentage', 'roi_absolute', 'roi_positive', 'volume', 'volatility']]
@@ -410,28 +812,21 @@ class MemeCoinRiskAnalyzer:
         if len(self.data) == 0:
             return pd.DataFrame()
         
-        # Create a copy of the data to avoid modifying the original
+        return self._memoized('roi_per_token', self._calculate_roi_per_token).copy()
+    
+    def _calculate_roi_per_token(self) -> pd.DataFrame:
+        """Compute the open/close ROI frame cached by calculate_roi_per_token."""
         roi_data = self.data.copy()
         
-        def calculate_token_roi(row):
-            """
-            Calculate ROI using open as earliest price and close as latest price.
-            """
-            open_price = row['open']
-            close_price = row['close']
-            
-            if open_price > 0 and close_price > 0:
-                roi = ((close_price - open_price) / open_price) * 100
-                return roi
-            else:
-                return 0.0
-        
-        # Calculate ROI for each token
-        roi_data['roi_percentage'] = roi_data.apply(calculate_token_roi, axis=1)
+        open_price = roi_data['open'].to_numpy(dtype=np.float64)
+        close_price = roi_data['close'].to_numpy(dtype=np.float64)
+        valid = (open_price > 0) & (close_price > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roi = np.where(valid, (close_price - open_price) / open_price * 100, 0.0)
         
-        # Add additional ROI metrics
+        roi_data['roi_percentage'] = roi
         roi_data['roi_absolute'] = roi_data['close'] - roi_data['open']
-        roi_data['roi_positive'] = roi_data['roi_percentage'] > 0
+        roi_data['roi_positive'] = roi > 0
         
         return roi_data[['symbol', 'name', 'mint_address', 'open', 'close',
                         'roi_percentage', 'roi_absolute', 'roi_positive', 'volume', 'volatility']]
@@ -655,26 +1050,12 @@ class MemeCoinRiskAnalyzer:
         if self.data is None:
             raise ValueError("No data loaded. Call load_bitquery_data() first.")
         
+        return self._memoized(('top_by_volume', top_n), lambda: self._top_tokens_by_volume(top_n)).copy()
+    
+    def _top_tokens_by_volume(self, top_n: int) -> pd.DataFrame:
+        """Compute the frame cached by get_top_tokens_by_volume."""
         # Sort by volume and get top N
-        top_tokens = self.data.nlargest(top_n, 'volume').copy()
-        
-        # Add additional calculated metrics for each token
-        top_tokens['price_range'] = top_tokens['high'] - top_tokens['low']
-        # Use decimal arithmetic for price volatility calculation to avoid precision errors
-        def calc_price_volatility(row):
-            if row['close'] > 0:
-                price_range = Decimal(str(row['price_range']))
-                close_price = Decimal(str(row['close']))
-                volatility = (price_range / close_price) * Decimal('100')
-                return float(volatility)
-            else:
-                return 0
-        
-        top_tokens['price_volatility'] = top_tokens.apply(calc_price_volatility, axis=1)
-        top_tokens['volume_weight'] = (top_tokens['volume'] / top_tokens['volume'].sum()) * 100
-        
-        return top_tokens[['symbol', 'name', 'mint_address', 'volume', 'price_volatility', 
-                          'high', 'low', 'close', 'count', 'volume_weight']]
+        return describe_top_tokens(self.data.nlargest(top_n, 'volume'))
     
     def explain_index_construction(self) -> Dict:
         """
@@ -695,43 +1076,245 @@ class MemeCoinRiskAnalyzer:
         # Get top contributors
         top_10 = self.get_top_tokens_by_volume(10)
         top_10_volume = top_10['volume'].sum()
-        top_10_contribution = (top_10_volume / total_volume) * 100
-        
-        construction_info = {
-            "total_tokens": total_tokens,
-            "total_volume": total_volume,
-            "volume_quartiles": {
-                "q25": volume_quartiles[0.25],
-                "q50": volume_quartiles[0.5], 
-                "q75": volume_quartiles[0.75],
-                "q100": volume_quartiles[1.0]
-            },
-            "top_10_contribution": round(top_10_contribution, 2),
-            "excluded_tokens": [
-                "USDC (EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v)",
-                "USDT (Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB)",
-                "SOL (So11111111111111111111111111111111111111111)",
-                "WSOL (So11111111111111111111111111111111111111112)",
-                "Other major stablecoins and native tokens"
-            ],
-            "selection_criteria": [
-                "Volume-based ranking (top 100 by trading volume)",
-                "Price asymmetry < 0.1 (filters out extreme price manipulation)",
-                "Non-empty token names (filters out unnamed tokens)",
-                "Date filter: Since July 1, 2024",
-                "Excludes major stablecoins and native tokens"
-            ],
-            "weighting_method": "Volume-weighted (higher volume = higher weight in index)"
+        
+        return index_construction_info(total_tokens, total_volume, volume_quartiles, top_10_volume)
+    
+    def calculate_range_metrics(self) -> Dict:
+        """
+        Calculate the high/low range statistics behind the risk-return profile
+        in a few vectorized passes.
+        
+        The per-token range (high - low) / low is computed once; its median
+        (capped at 10, i.e. 1000%) drives the period volatilities, its mean
+        drives the return-to-risk ratios, and the worst (low - high) / high
+        is the max drawdown.
+        
+        Returns:
+            Dictionary with 'median_range', 'mean_range' and 'max_drawdown'
+            (median_range and max_drawdown are None when no token qualifies)
+        """
+        if self.data is None:
+            raise ValueError("No data loaded. Call load_bitquery_data() first.")
+        
+        if len(self.data) == 0:
+            return {'median_range': None, 'mean_range': 0.0, 'max_drawdown': None}
+        
+        return dict(self._memoized('range_metrics', self._calculate_range_metrics))
+    
+    def _calculate_range_metrics(self) -> Dict:
+        """Compute the range statistics cached by calculate_range_metrics."""
+        high = self.data['high'].to_numpy(dtype=np.float64)
+        low = self.data['low'].to_numpy(dtype=np.float64)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_range = (high - low) / low
+            drawdown = (low - high) / high
+        
+        ranges = price_range[(low > 0) & np.isfinite(price_range)]
+        # Cap extreme values to prevent unrealistic volatility
+        capped_ranges = np.minimum(ranges, 10.0)
+        capped_ranges = capped_ranges[capped_ranges >= 0]
+        drawdowns = drawdown[(high > 0) & np.isfinite(drawdown)]
+        
+        return {
+            'median_range': float(np.median(capped_ranges)) if len(capped_ranges) > 0 else None,
+            'mean_range': float(ranges.mean()) if len(ranges) > 0 else 0.0,
+            'max_drawdown': float(drawdowns.min()) if len(drawdowns) > 0 else None
         }
+    
+    def calculate_range_metrics_decimal(self) -> Dict:
+        """
+        Reference implementation of calculate_range_metrics using row-wise
+        decimal arithmetic. Slow; used to check the vectorized float64 path.
+        
+        Returns:
+            Dictionary with the same keys as calculate_range_metrics
+        """
+        if self.data is None:
+            raise ValueError("No data loaded. Call load_bitquery_data() first.")
+        
+        capped_ranges = []
+        ranges = []
+        drawdowns = []
+        for _, row in self.data.iterrows():
+            if row['low'] > 0:
+                high = Decimal(str(row['high']))
+                low = Decimal(str(row['low']))
+                ratio = float((high - low) / low)
+                if np.isfinite(ratio):
+                    ranges.append(ratio)
+                    capped = min(ratio, 10.0)
+                    if capped >= 0:
+                        capped_ranges.append(capped)
+            if row['high'] > 0:
+                high = Decimal(str(row['high']))
+                low = Decimal(str(row['low']))
+                drawdown = float((low - high) / high)
+                if np.isfinite(drawdown):
+                    drawdowns.append(drawdown)
+        
+        return {
+            'median_range': float(np.median(capped_ranges)) if capped_ranges else None,
+            'mean_range': float(np.mean(ranges)) if ranges else 0.0,
+            'max_drawdown': min(drawdowns) if drawdowns else None
+        }
+    
+    def check_range_metrics_accuracy(self, rel_tol: float = 1e-9) -> Dict:
+        """
+        Compare the vectorized float64 range metrics against the decimal reference.
         
-        return construction_info
+        Args:
+            rel_tol: Maximum accepted relative difference
+            
+        Returns:
+            Dictionary with the relative difference per metric and an 'agree' flag
+        """
+        vectorized = self.calculate_range_metrics()
+        reference = self.calculate_range_metrics_decimal()
+        
+        differences = {}
+        agree = True
+        for key, expected in reference.items():
+            actual = vectorized[key]
+            if expected is None or actual is None:
+                differences[key] = 0.0 if expected is actual else float('inf')
+            else:
+                differences[key] = abs(actual - expected) / max(abs(expected), 1e-300)
+            agree = agree and differences[key] <= rel_tol
+        
+        return {'relative_differences': differences, 'agree': agree}
+    
+    def _candle_window(self, store, mint_addresses: List[str], end=None):
+        """
+        Align close prices over the longest profile horizon; shorter horizons
+        are its trailing columns. Returns None when nothing is stored.
+        """
+        if end is None:
+            last_times = [store.last_time(mint_address) for mint_address in mint_addresses]
+            last_times = [t for t in last_times if t is not None]
+            if not last_times:
+                return None
+            end = max(last_times)
+        end = to_epoch(end)
+        longest = max(CANDLE_HORIZON_DAYS.values()) * 86400
+        return store.matrix(mint_addresses, end - longest + store.interval_seconds, end)
     
-    def generate_risk_return_profile(self, index_name: str = "Memecoin 50 Volume", price_data: Dict = None) -> Dict:
+    def calculate_candle_metrics(self, store, end=None) -> Tuple[Dict, Dict, float, str]:
+        """
+        Calculate true multi-horizon metrics from stored candle series.
+        
+        For each horizon the close prices of the loaded tokens are aligned in a
+        tokens x time matrix and fed to the batched realized-volatility and
+        return-to-risk kernels. The index value per horizon is the median over
+        tokens with a non-zero volatility; the max drawdown is the worst token
+        drawdown over the longest horizon.
+        
+        Args:
+            store: candle_store.CandleStore holding the tokens' candles
+            end: Last candle time of the window (defaults to the newest stored candle)
+        
+        Returns:
+            Tuple of (volatilities by period, return-to-risk ratios by period,
+            max drawdown percentage, max drawdown date)
+        """
+        if self.data is None:
+            raise ValueError("No data loaded. Call load_bitquery_data() first.")
+        
+        mint_addresses = self.data['mint_address'].drop_duplicates().tolist()
+        window = self._candle_window(store, mint_addresses, end)
+        if window is None:
+            return ({period: 0.0 for period in CANDLE_HORIZON_DAYS},
+                    {period: 0.0 for period in CANDLE_HORIZON_DAYS}, 0.0, "")
+        grid, closes = window
+        
+        volatilities = {}
+        return_risk_ratios = {}
+        for period, days in CANDLE_HORIZON_DAYS.items():
+            window = closes[:, -max(1, days * 86400 // store.interval_seconds):]
+            token_vols = self.calculate_realized_volatility_batch(window, store.interval)
+            token_ratios = self.calculate_return_to_risk_ratio_batch(window, store.interval)
+            usable = token_vols > 0
+            volatilities[period] = float(np.median(token_vols[usable])) if usable.any() else 0.0
+            return_risk_ratios[period] = float(np.median(token_ratios[usable])) if usable.any() else 0.0
+        
+        tracker = DrawdownBatchTracker(mint_addresses)
+        tracker.extend(closes, [format_epoch(t, store.interval) for t in grid])
+        if len(tracker) == 0 or not (tracker.count > 0).any():
+            return volatilities, return_risk_ratios, 0.0, ""
+        worst = int(np.argmin(np.where(tracker.count > 0, tracker.max_drawdown, np.inf)))
+        return volatilities, return_risk_ratios, float(tracker.max_drawdown[worst]), tracker.max_drawdown_date[worst]
+    
+    def calculate_nav_metrics(self, store, end=None, schedule="monthly", cost_bps: float = 0.0,
+                              delisting_haircut: float = 0.0,
+                              min_delisting_gap: int = DEFAULT_MIN_DELISTING_GAP) -> Tuple[Dict, Dict, float, str]:
+        """
+        Calculate multi-horizon metrics from the index level itself.
+        
+        The loaded tokens are held at their volume weights and rebalanced on
+        the given schedule (index_nav.compute_nav); each horizon's volatility
+        and return-to-risk ratio, and the max drawdown, are measured on the
+        resulting NAV path instead of on individual tokens.
+        
+        Args:
+            store: candle_store.CandleStore holding the tokens' candles
+            end: Last candle time of the window (defaults to the newest stored candle)
+            schedule: Rebalance schedule ("none", "daily", "weekly" or "monthly")
+            cost_bps: Transaction cost in basis points of traded value
+            delisting_haircut: Fraction of value lost when a token stops trading
+            min_delisting_gap: Longest run of missing newest candles still
+                treated as late data rather than a delisting
+        
+        Returns:
+            Tuple of (volatilities by period, return-to-risk ratios by period,
+            max drawdown percentage, max drawdown date)
+        """
+        if self.data is None:
+            raise ValueError("No data loaded. Call load_bitquery_data() first.")
+        
+        mint_addresses = self.data['mint_address'].drop_duplicates().tolist()
+        window = self._candle_window(store, mint_addresses, end)
+        if window is None:
+            return ({period: 0.0 for period in CANDLE_HORIZON_DAYS},
+                    {period: 0.0 for period in CANDLE_HORIZON_DAYS}, 0.0, "")
+        grid, closes = window
+        
+        weights = aggregate_weights(self.data['mint_address'], self.volume_weights(), mint_addresses)
+        nav = compute_nav(closes, weights, grid, schedule, cost_bps, delisting_haircut,
+                          min_delisting_gap=min_delisting_gap)['nav']
+        # The index starts on the first column any constituent trades
+        traded = np.isfinite(closes).any(axis=0)
+        nav = np.where(np.maximum.accumulate(traded), nav, np.nan)[None, :]
+        
+        volatilities = {}
+        return_risk_ratios = {}
+        for period, days in CANDLE_HORIZON_DAYS.items():
+            horizon = nav[:, -max(1, days * 86400 // store.interval_seconds):]
+            volatilities[period] = float(self.calculate_realized_volatility_batch(horizon, store.interval)[0])
+            return_risk_ratios[period] = float(self.calculate_return_to_risk_ratio_batch(horizon, store.interval)[0])
+        
+        tracker = DrawdownTracker()
+        started = np.isfinite(nav[0])
+        tracker.extend(nav[0][started], [format_epoch(t, store.interval) for t in grid[started]])
+        return volatilities, return_risk_ratios, float(tracker.max_drawdown), tracker.max_drawdown_date
+    
+    def generate_risk_return_profile(self, index_name: str = "Memecoin 50 Volume", price_data: Dict = None,
+                                     roi_data: pd.DataFrame = None, candles=None, nav_options: Dict = None) -> Dict:
         """
         Generate complete risk and return profile for the data.
         
         Args:
             index_name: Name of the index (e.g., "Memecoin 50 Volume", "Memecoin 50 Volatility")
+            price_data: Optional oldest/latest price data for accurate ROI calculation
+            roi_data: Optional precomputed calculate_roi_from_price_data(price_data)
+                output for the loaded rows, which skips the price join (price
+                data ROI is then used even if price_data is omitted)
+            candles: Optional candle_store.CandleStore; when given, volatilities,
+                return-to-risk ratios and max drawdown come from the stored
+                series (calculate_candle_metrics) instead of the aggregated
+                high/low ranges
+            nav_options: Optional keyword arguments of calculate_nav_metrics
+                (e.g. {'schedule': "weekly", 'cost_bps': 30}); with candles,
+                the metrics are then measured on the index NAV path
             
         Returns:
             Dictionary containing all risk and return metrics
@@ -746,146 +1329,38 @@ class MemeCoinRiskAnalyzer:
         # Use the volatility data from Bitquery as base, then calculate for different periods
         base_volatility = self.data['volatility'].mean() if len(self.data) > 0 else 0
         
-        
-        # Calculate volatilities for different periods
-        volatilities = {}
-        for period in ["2w", "1m", "6m", "1y"]:
-            # For memecoins, calculate volatility from high/low price ranges
-            # This is more reliable than using Bitquery's volatility field
-            period_multiplier = {"2w": 0.8, "1m": 1.0, "6m": 1.2, "1y": 1.5}
-            
-            if len(self.data) > 0:
-                # Calculate price range volatility using decimal arithmetic: (high - low) / low
-                # This gives us a measure of price volatility for each token
-                price_volatility = []
-                for _, row in self.data.iterrows():
-                    if row['low'] > 0:
-                        high = Decimal(str(row['high']))
-                        low = Decimal(str(row['low']))
-                        vol = float((high - low) / low)
-                        # Cap extreme values to prevent unrealistic volatility
-                        vol = min(vol, 10.0)  # Cap at 1000% volatility
-                        if np.isfinite(vol) and vol >= 0:
-                            price_volatility.append(vol)
-                
-                if len(price_volatility) > 0:
-                    # Use median price volatility to avoid extreme outliers
-                    median_price_vol = np.median(price_volatility)
-                    
-                    # Convert to percentage and apply period multiplier
-                    base_vol = median_price_vol * 100  # Convert to percentage
-                    # Cap the final volatility to reasonable levels
-                    final_vol = min(base_vol * period_multiplier.get(period, 1.0), 500.0)
-                    volatilities[period] = final_vol
-                    
-                else:
-                    # Fallback: use a reasonable memecoin volatility estimate
-                    volatilities[period] = 50.0 * period_multiplier.get(period, 1.0)  # 50% base volatility
-            else:
-                volatilities[period] = 0.0
-            
-        
-        # Calculate return-to-risk ratios
-        return_risk_ratios = {}
-        for period in ["2w", "1m", "6m", "1y"]:
-            # For memecoins, calculate return-to-risk using high/low price ranges
-            if len(self.data) > 0:
-                # Calculate average return using high/low range as proxy with decimal arithmetic
-                price_ratios = []
-                for _, row in self.data.iterrows():
-                    if row['low'] > 0:
-                        high = Decimal(str(row['high']))
-                        low = Decimal(str(row['low']))
-                        ratio = float((high - low) / low)
-                        if np.isfinite(ratio):
-                            price_ratios.append(ratio)
-                
-                valid_ratios = np.array(price_ratios)
-                
-                if len(valid_ratios) > 0:
-                    avg_return = valid_ratios.mean()
-                else:
-                    avg_return = 0.0
-                
-                # Use the calculated volatility for this period
-                vol = volatilities[period] / 100  # Convert to decimal
-                
-                # Add bounds to prevent extreme values
-                if vol > 0.001:  # Minimum volatility threshold (0.1%)
-                    ratio = avg_return / vol
-                    # Cap the ratio to prevent extreme values
-                    return_risk_ratios[period] = min(max(ratio, -1000), 1000)
-                else:
-                    return_risk_ratios[period] = 0.0
-            else:
-                return_risk_ratios[period] = 0.0
-        
-        # Calculate max drawdown using high/low price ranges with decimal arithmetic
-        if len(self.data) > 0:
-            # Calculate max drawdown as the worst case scenario from high to low
-            drawdowns = []
-            for _, row in self.data.iterrows():
-                if row['high'] > 0:
-                    high = Decimal(str(row['high']))
-                    low = Decimal(str(row['low']))
-                    drawdown = float((low - high) / high)
-                    if np.isfinite(drawdown):
-                        drawdowns.append(drawdown)
-            
-            if drawdowns:
-                max_drawdown_pct = min(drawdowns) * 100
-            else:
-                max_drawdown_pct = 0.0
-            max_drawdown_date = ""  # We don't have date information in this aggregated data
+        if candles is not None and nav_options is not None:
+            volatilities, return_risk_ratios, max_drawdown_pct, max_drawdown_date = self.calculate_nav_metrics(
+                candles, **nav_options)
+        elif candles is not None:
+            volatilities, return_risk_ratios, max_drawdown_pct, max_drawdown_date = self.calculate_candle_metrics(candles)
         else:
-            max_drawdown_pct = 0.0
-            max_drawdown_date = ""
+            # All period metrics derive from one pass over the high/low ranges
+            range_metrics = self.calculate_range_metrics()
+            volatilities, return_risk_ratios, max_drawdown_pct = period_risk_metrics(range_metrics, len(self.data))
+            max_drawdown_date = ""  # We don't have date information in this aggregated data
         
         # Get top tokens and index construction info
         top_tokens = self.get_top_tokens_by_volume(10)
         index_info = self.explain_index_construction()
         
         # Calculate ROI statistics - use external price data if available
-        if price_data:
-            print("Using external price data for accurate ROI calculation...")
-            roi_data = self.calculate_roi_from_price_data(price_data)
+        if price_data or roi_data is not None:
+            logger.info("Using external price data for accurate ROI calculation...")
+            if roi_data is None:
+                roi_data = self.calculate_roi_from_price_data(price_data)
             roi_stats = self.calculate_roi_statistics_from_data(roi_data)
             top_roi_tokens = self.get_top_roi_tokens_from_data(roi_data, 10)
             worst_roi_tokens = self.get_worst_roi_tokens_from_data(roi_data, 10)
         else:
-            print("Using fallback ROI calculation with open/close prices...")
+            logger.info("Using fallback ROI calculation with open/close prices...")
             roi_stats = self.calculate_roi_statistics()
             top_roi_tokens = self.get_top_roi_tokens(10)
             worst_roi_tokens = self.get_worst_roi_tokens(10)
         
-        profile = {
-            "index": index_name,
-            "constituent_stability": round(constituent_stability, 2),
-            "weight_concentration": round(weight_concentration, 2),
-            "volatilities": {
-                "2w": round(volatilities["2w"], 2),
-                "1m": round(volatilities["1m"], 2),
-                "6m": round(volatilities["6m"], 2),
-                "1y": round(volatilities["1y"], 2)
-            },
-            "return_risk_ratios": {
-                "2w": round(return_risk_ratios["2w"], 2),
-                "1m": round(return_risk_ratios["1m"], 2),
-                "6m": round(return_risk_ratios["6m"], 2),
-                "1y": round(return_risk_ratios["1y"], 2)
-            },
-            "max_drawdown": {
-                "percentage": round(max_drawdown_pct, 2),
-                "date": max_drawdown_date
-            },
-            "roi_statistics": roi_stats,
-            "top_roi_tokens": top_roi_tokens.to_dict('records'),
-            "worst_roi_tokens": worst_roi_tokens.to_dict('records'),
-            "top_tokens": top_tokens.to_dict('records'),
-            "index_construction": index_info
-        }
-        
-        return profile
+        return build_risk_return_profile(index_name, constituent_stability, weight_concentration,
+                                         volatilities, return_risk_ratios, max_drawdown_pct, max_drawdown_date,
+                                         roi_stats, top_roi_tokens, worst_roi_tokens, top_tokens, index_info)
     
     def print_risk_return_table(self, profiles: List[Dict]) -> None:
         """
@@ -0,0 +1,257 @@
+"""
+Local columnar store for per-token OHLCV candles.
+Each token's candles are kept in append-only binary column files that are
+memory-mapped on read, so any time window is a zero-copy slice.
+
+Layout: <root>/<interval>/<mint_address>/{time,open,high,low,close,volume}.bin
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_STORE_DIR = ".candle_store"
+
+# Candle interval label -> seconds per candle
+INTERVAL_SECONDS = {"1h": 3600, "1d": 86400}
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+COLUMN_DTYPES = {"time": np.dtype("<i8"), **{field: np.dtype("<f8") for field in PRICE_FIELDS}}
+
+
+def to_epoch(value) -> int:
+    """
+    Convert a date to epoch seconds (UTC).
+
+    Args:
+        value: Epoch seconds, a datetime, or an ISO date/time string
+            ("2025-03-01" or "2025-03-01T00:00:00Z")
+
+    Returns:
+        Epoch seconds
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def format_epoch(epoch: int, interval: str = "1d") -> str:
+    """
+    Format epoch seconds as a date (daily candles) or date and hour.
+
+    Args:
+        epoch: Epoch seconds
+        interval: Candle interval label
+
+    Returns:
+        "YYYY-MM-DD" or "YYYY-MM-DDTHH:00Z"
+    """
+    moment = datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    return moment.strftime("%Y-%m-%d" if interval == "1d" else "%Y-%m-%dT%H:00Z")
+
+
+class CandleStore:
+    """
+    Append-only, memory-mapped OHLCV store indexed by mint and time.
+
+    Candles of one mint are stored in time order; appends only accept candles
+    at or after the last stored one, so closed history is never rewritten or
+    refetched while the newest (possibly still open) candle can be updated.
+    Every memory map holds an open file descriptor, so only the maps of the
+    max_open_mints most recently read mints are kept.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, interval: str = "1d", max_open_mints: int = 64):
+        """
+        Args:
+            root: Store directory
+            interval: Candle interval label ("1d" or "1h")
+            max_open_mints: Number of mints whose column maps are cached
+        """
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"Unknown candle interval {interval!r}; expected one of {list(INTERVAL_SECONDS)}")
+        self.root = root
+        self.interval = interval
+        self.interval_seconds = INTERVAL_SECONDS[interval]
+        self.directory = os.path.join(root, interval)
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_open_mints = max_open_mints
+        self._maps = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _column_path(self, mint_address: str, column: str) -> str:
+        return os.path.join(self.directory, mint_address, column + ".bin")
+
+    def _lengths(self, mint_address: str) -> Dict[str, int]:
+        """Number of complete values in each column file of a mint (0 when missing)."""
+        lengths = {}
+        for column, dtype in COLUMN_DTYPES.items():
+            try:
+                lengths[column] = os.path.getsize(self._column_path(mint_address, column)) // dtype.itemsize
+            except FileNotFoundError:
+                lengths[column] = 0
+        return lengths
+
+    def _columns(self, mint_address: str) -> Optional[Dict[str, np.ndarray]]:
+        """Memory-map all columns of a mint (cached until its next append or eviction)."""
+        with self._lock:
+            cached = self._maps.get(mint_address)
+            if cached is not None:
+                self._maps.move_to_end(mint_address)
+                return cached
+
+            # A write interrupted mid-append leaves columns of unequal length;
+            # only rows present in every column are exposed
+            length = min(self._lengths(mint_address).values())
+            if length == 0:
+                return None
+            columns = {column: np.memmap(self._column_path(mint_address, column), dtype=dtype, mode="r", shape=(length,))
+                       for column, dtype in COLUMN_DTYPES.items()}
+            self._maps[mint_address] = columns
+            while len(self._maps) > self.max_open_mints:
+                # Views handed out earlier keep their own reference to the map
+                self._maps.popitem(last=False)
+            return columns
+
+    def mints(self) -> List[str]:
+        """
+        Get the mint addresses with stored candles.
+
+        Returns:
+            Sorted list of mint addresses
+        """
+        return sorted(name for name in os.listdir(self.directory)
+                      if os.path.isdir(os.path.join(self.directory, name)))
+
+    def __contains__(self, mint_address: str) -> bool:
+        return self._columns(mint_address) is not None
+
+    def last_time(self, mint_address: str) -> Optional[int]:
+        """
+        Get the open time of the newest stored candle of a mint.
+
+        Args:
+            mint_address: Token mint address
+
+        Returns:
+            Epoch seconds, or None when nothing is stored
+        """
+        columns = self._columns(mint_address)
+        return int(columns["time"][-1]) if columns is not None else None
+
+    def append(self, mint_address: str, times, opens, highs, lows, closes, volumes) -> int:
+        """
+        Append candles of one mint.
+
+        Candles before the last stored time are skipped, so overlapping
+        fetches can be appended safely. A candle at the last stored time
+        replaces the stored one, so a candle fetched while its interval was
+        still open is completed by the next refresh.
+
+        Args:
+            mint_address: Token mint address
+            times: Candle open times (epoch seconds, datetimes or ISO strings)
+            opens, highs, lows, closes, volumes: Candle values aligned with times
+
+        Returns:
+            Number of candles appended or replaced
+        """
+        times = np.asarray([to_epoch(t) for t in times], dtype=np.int64)
+        values = {field: np.asarray(column, dtype=np.float64)
+                  for field, column in zip(PRICE_FIELDS, (opens, highs, lows, closes, volumes))}
+
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        # Keep the last candle of any duplicated time
+        keep = np.append(times[1:] != times[:-1], True) if len(times) else np.zeros(0, dtype=bool)
+        with self._lock:
+            last = self.last_time(mint_address)
+            if last is not None:
+                keep &= times >= last
+            if not keep.any():
+                return 0
+
+            rows = order[keep]
+            new_columns = {"time": times[keep], **{field: column[rows] for field, column in values.items()}}
+            os.makedirs(os.path.join(self.directory, mint_address), exist_ok=True)
+            self._maps.pop(mint_address, None)
+            # Drop rows left over from an interrupted append so every column
+            # continues from the same row, and overwrite the last row when it
+            # is being replaced
+            length = min(self._lengths(mint_address).values())
+            start = length - 1 if last is not None and new_columns["time"][0] == last else length
+            for column, dtype in COLUMN_DTYPES.items():
+                with open(self._column_path(mint_address, column), "ab") as f:
+                    f.truncate(start * dtype.itemsize)
+                    f.write(new_columns[column].astype(dtype, copy=False).tobytes())
+        return int(keep.sum())
+
+    def append_many(self, candles: Dict[str, Dict]) -> int:
+        """
+        Append candles of many mints.
+
+        Args:
+            candles: {mint_address: {'time': [...], 'open': [...], 'high': [...],
+                'low': [...], 'close': [...], 'volume': [...]}}
+
+        Returns:
+            Total number of candles appended
+        """
+        return sum(self.append(mint_address, columns["time"], *(columns[field] for field in PRICE_FIELDS))
+                   for mint_address, columns in candles.items())
+
+    def series(self, mint_address: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """
+        Get the candles of one mint in a time window as zero-copy views.
+
+        Args:
+            mint_address: Token mint address
+            start: Optional first candle time (inclusive)
+            end: Optional last candle time (inclusive)
+
+        Returns:
+            Dictionary of column name -> read-only array view ('time' in epoch
+            seconds); empty arrays when nothing is stored in the window
+        """
+        columns = self._columns(mint_address)
+        if columns is None:
+            return {column: np.empty(0, dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+        times = columns["time"]
+        lo = int(np.searchsorted(times, to_epoch(start), side="left")) if start is not None else 0
+        hi = int(np.searchsorted(times, to_epoch(end), side="right")) if end is not None else len(times)
+        return {column: values[lo:hi] for column, values in columns.items()}
+
+    def matrix(self, mint_addresses: Iterable[str], start, end, field: str = "close") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Align one field of many mints on a shared time grid.
+
+        Args:
+            mint_addresses: Token mint addresses (matrix rows)
+            start: First grid time (inclusive)
+            end: Last grid time (inclusive)
+            field: Candle field to align ("open", "high", "low", "close" or "volume")
+
+        Returns:
+            Tuple of (grid times in epoch seconds, tokens x times matrix with
+            NaN where a token has no candle)
+        """
+        step = self.interval_seconds
+        first = to_epoch(start) // step * step
+        grid = np.arange(first, to_epoch(end) + 1, step, dtype=np.int64)
+        mint_addresses = list(mint_addresses)
+        matrix = np.full((len(mint_addresses), len(grid)), np.nan)
+        if len(grid) == 0:
+            return grid, matrix
+        for row, mint_address in enumerate(mint_addresses):
+            window = self.series(mint_address, first, grid[-1])
+            positions = (window["time"] - first) // step
+            matrix[row, positions] = window[field]
+        return grid, matrix
@@ -0,0 +1,318 @@
+"""
+Incremental max drawdown tracking for live index monitoring.
+Keeps the running peak and worst drawdown so new prices never rescan history.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from fileio import atomic_write_json
+
+
+class DrawdownTracker:
+    """
+    Running max drawdown of a single price series, updated in O(1) per price.
+
+    Drawdowns are reported as percentages below the running peak (negative
+    numbers), like MemeCoinRiskAnalyzer.calculate_max_drawdown. Missing (NaN),
+    zero and negative prices are ignored.
+    """
+
+    def __init__(self):
+        self.peak = 0.0
+        self.current_drawdown = 0.0
+        self.max_drawdown = 0.0
+        self.max_drawdown_date = ""
+        self.count = 0
+
+    def update(self, price: float, timestamp: str = "") -> float:
+        """
+        Add one price.
+
+        Args:
+            price: New price
+            timestamp: Timestamp or date label of the price
+
+        Returns:
+            Current drawdown as percentage
+        """
+        if not price > 0 or price == float("inf"):
+            return self.current_drawdown
+        if price > self.peak:
+            self.peak = price
+        self.current_drawdown = (price / self.peak - 1) * 100
+        # The first worst point wins ties, matching np.argmin in calculate_max_drawdown
+        if self.count == 0 or self.current_drawdown < self.max_drawdown:
+            self.max_drawdown = self.current_drawdown
+            self.max_drawdown_date = timestamp
+        self.count += 1
+        return self.current_drawdown
+
+    def extend(self, prices, timestamps: Optional[List[str]] = None) -> float:
+        """
+        Add many prices at once, e.g. to backfill history, in one vectorized pass.
+
+        Args:
+            prices: Array-like of prices in time order
+            timestamps: Optional timestamps aligned with prices
+
+        Returns:
+            Current drawdown as percentage
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        valid = np.isfinite(prices) & (prices > 0)
+        positions = np.flatnonzero(valid)
+        if len(positions) == 0:
+            return self.current_drawdown
+
+        prices = prices[positions]
+        running_peak = np.maximum(np.maximum.accumulate(prices), self.peak)
+        drawdowns = (prices / running_peak - 1) * 100
+
+        worst = int(np.argmin(drawdowns))
+        if self.count == 0 or drawdowns[worst] < self.max_drawdown:
+            self.max_drawdown = float(drawdowns[worst])
+            self.max_drawdown_date = timestamps[positions[worst]] if timestamps is not None else ""
+        self.peak = float(running_peak[-1])
+        self.current_drawdown = float(drawdowns[-1])
+        self.count += len(prices)
+        return self.current_drawdown
+
+    def to_dict(self) -> Dict:
+        """
+        Get the tracker state as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary accepted by from_dict
+        """
+        return {
+            "peak": self.peak,
+            "current_drawdown": self.current_drawdown,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_date": self.max_drawdown_date,
+            "count": self.count
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "DrawdownTracker":
+        """
+        Restore a tracker from to_dict output.
+
+        Args:
+            state: Dictionary produced by to_dict
+
+        Returns:
+            The restored DrawdownTracker
+        """
+        tracker = cls()
+        tracker.peak = float(state["peak"])
+        tracker.current_drawdown = float(state["current_drawdown"])
+        tracker.max_drawdown = float(state["max_drawdown"])
+        tracker.max_drawdown_date = state["max_drawdown_date"]
+        tracker.count = int(state["count"])
+        return tracker
+
+    def save(self, path: str) -> None:
+        """
+        Atomically write the tracker state to a JSON file.
+
+        Args:
+            path: Destination file
+        """
+        atomic_write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> "DrawdownTracker":
+        """
+        Restore a tracker saved with save.
+
+        Args:
+            path: State file
+
+        Returns:
+            The restored DrawdownTracker
+        """
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+class DrawdownBatchTracker:
+    """
+    Running max drawdowns of every index constituent at once.
+
+    State is kept in NumPy arrays aligned with a list of keys (mint addresses),
+    so each tick costs one vectorized update over all constituents.
+    """
+
+    def __init__(self, keys: List[str]):
+        """
+        Args:
+            keys: Identifiers of the tracked series, e.g. token mint addresses
+        """
+        self.keys = list(keys)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        size = len(self.keys)
+        self.peak = np.zeros(size)
+        self.current_drawdown = np.zeros(size)
+        self.max_drawdown = np.zeros(size)
+        self.max_drawdown_date = np.full(size, "", dtype=object)
+        self.count = np.zeros(size, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _align(self, prices) -> np.ndarray:
+        """Turn a {key: price} mapping or aligned array-like into a price vector."""
+        if isinstance(prices, dict):
+            aligned = np.full(len(self.keys), np.nan)
+            for key, price in prices.items():
+                position = self.positions.get(key)
+                if position is not None:
+                    aligned[position] = price
+            return aligned
+        return np.asarray(prices, dtype=np.float64)
+
+    def update(self, prices, timestamp: str = "") -> np.ndarray:
+        """
+        Add one tick of prices for all constituents.
+
+        Args:
+            prices: {key: price} mapping or array aligned with keys; missing
+                constituents (absent keys or NaN) are left unchanged
+            timestamp: Timestamp or date label of the tick
+
+        Returns:
+            Array of current drawdowns as percentages
+        """
+        prices = self._align(prices)
+        valid = np.isfinite(prices) & (prices > 0)
+        self.peak = np.where(valid, np.maximum(self.peak, np.where(valid, prices, 0.0)), self.peak)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = (prices / self.peak - 1) * 100
+        self.current_drawdown = np.where(valid, drawdowns, self.current_drawdown)
+
+        worse = valid & ((self.count == 0) | (drawdowns < self.max_drawdown))
+        self.max_drawdown = np.where(worse, drawdowns, self.max_drawdown)
+        self.max_drawdown_date[worse] = timestamp
+        self.count += valid
+        return self.current_drawdown
+
+    def extend(self, price_matrix, timestamps: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Add many ticks for all constituents in one vectorized pass.
+
+        Args:
+            price_matrix: 2D array-like of prices (constituents x timestamps),
+                NaN for missing prices
+            timestamps: Optional timestamps aligned with the matrix columns
+
+        Returns:
+            Array of current drawdowns as percentages
+        """
+        prices = np.asarray(price_matrix, dtype=np.float64)
+        if prices.ndim != 2 or prices.shape[0] != len(self.keys):
+            raise ValueError("price_matrix must have one row per tracked key")
+        if prices.shape[1] == 0:
+            return self.current_drawdown
+
+        valid = np.isfinite(prices) & (prices > 0)
+        running_peak = np.maximum(np.maximum.accumulate(np.where(valid, prices, 0.0), axis=1),
+                                  self.peak[:, None])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(valid, (prices / running_peak - 1) * 100, np.inf)
+
+        rows = np.arange(len(self.keys))
+        has_valid = valid.any(axis=1)
+        worst = np.argmin(drawdowns, axis=1)
+        worst_drawdown = drawdowns[rows, worst]
+        worse = has_valid & ((self.count == 0) | (worst_drawdown < self.max_drawdown))
+        self.max_drawdown = np.where(worse, worst_drawdown, self.max_drawdown)
+        if timestamps is not None:
+            self.max_drawdown_date[worse] = np.asarray(timestamps, dtype=object)[worst[worse]]
+        else:
+            self.max_drawdown_date[worse] = ""
+
+        last = prices.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        self.current_drawdown = np.where(has_valid, drawdowns[rows, last], self.current_drawdown)
+        self.peak = running_peak[:, -1]
+        self.count += valid.sum(axis=1)
+        return self.current_drawdown
+
+    def tracker(self, key: str) -> DrawdownTracker:
+        """
+        Get a standalone DrawdownTracker copy of one constituent's state.
+
+        Args:
+            key: Identifier of the series
+
+        Returns:
+            DrawdownTracker with the constituent's current state
+        """
+        i = self.positions[key]
+        return DrawdownTracker.from_dict({
+            "peak": self.peak[i],
+            "current_drawdown": self.current_drawdown[i],
+            "max_drawdown": self.max_drawdown[i],
+            "max_drawdown_date": self.max_drawdown_date[i],
+            "count": self.count[i]
+        })
+
+    def to_dict(self) -> Dict:
+        """
+        Get the tracker state as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary accepted by from_dict
+        """
+        return {
+            "keys": self.keys,
+            "peak": self.peak.tolist(),
+            "current_drawdown": self.current_drawdown.tolist(),
+            "max_drawdown": self.max_drawdown.tolist(),
+            "max_drawdown_date": self.max_drawdown_date.tolist(),
+            "count": self.count.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "DrawdownBatchTracker":
+        """
+        Restore a tracker from to_dict output.
+
+        Args:
+            state: Dictionary produced by to_dict
+
+        Returns:
+            The restored DrawdownBatchTracker
+        """
+        tracker = cls(state["keys"])
+        tracker.peak = np.asarray(state["peak"], dtype=np.float64)
+        tracker.current_drawdown = np.asarray(state["current_drawdown"], dtype=np.float64)
+        tracker.max_drawdown = np.asarray(state["max_drawdown"], dtype=np.float64)
+        tracker.max_drawdown_date = np.asarray(state["max_drawdown_date"], dtype=object)
+        tracker.count = np.asarray(state["count"], dtype=np.int64)
+        return tracker
+
+    def save(self, path: str) -> None:
+        """
+        Atomically write the tracker state to a JSON file.
+
+        Args:
+            path: Destination file
+        """
+        atomic_write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> "DrawdownBatchTracker":
+        """
+        Restore a tracker saved with save.
+
+        Args:
+            path: State file
+
+        Returns:
+            The restored DrawdownBatchTracker
+        """
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
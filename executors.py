@@ -0,0 +1,79 @@
+"""
+Executor selection for independent computations.
+Threads suit I/O-bound steps, processes suit CPU-bound pandas/NumPy work, and
+the serial executor runs tasks inline for debugging and profiling.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Union
+
+EXECUTOR_KINDS = ("serial", "thread", "process")
+
+
+class SerialExecutor(Executor):
+    """
+    Executor that runs each task in the calling thread when it is submitted.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def create_executor(kind: str = "thread", max_workers: int = None) -> Executor:
+    """
+    Create an executor of the given kind.
+
+    Process pools spawn fresh interpreters instead of forking, because the
+    pipeline calls them after threaded fetches, and forking a process that
+    has threads can deadlock the child.
+
+    Args:
+        kind: "serial", "thread" or "process"
+        max_workers: Maximum number of workers (defaults to the executor's own default)
+
+    Returns:
+        A new Executor; the caller is responsible for shutting it down
+    """
+    if kind == "serial":
+        return SerialExecutor()
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    raise ValueError(f"Unknown executor kind {kind!r}; expected one of {EXECUTOR_KINDS}")
+
+
+def map_ordered(fn: Callable, items: Iterable, executor: Union[str, Executor] = "thread",
+                max_workers: int = None) -> List:
+    """
+    Apply fn to every item concurrently and return the results in input order.
+
+    Args:
+        fn: Function of one argument (module-level, so it can be pickled for processes)
+        items: Arguments to apply fn to
+        executor: An existing Executor (left running) or a kind accepted by
+            create_executor (created and shut down here)
+        max_workers: Maximum number of workers when an executor is created
+            (defaults to one per item, capped at the CPU count for processes)
+
+    Returns:
+        List of results, aligned with items
+    """
+    items = list(items)
+    if isinstance(executor, Executor):
+        return [future.result() for future in [executor.submit(fn, item) for item in items]]
+
+    if len(items) <= 1:
+        executor = "serial"
+    if max_workers is None:
+        # One worker per item, but never more processes than cores
+        max_workers = min(len(items), os.cpu_count() or 1) if executor == "process" else len(items)
+    with create_executor(executor, max_workers) as pool:
+        return [future.result() for future in [pool.submit(fn, item) for item in items]]
@@ -0,0 +1,36 @@
+"""
+Atomic file writes shared by the caches, recordings and state files.
+A file is written next to its destination and renamed into place, so readers
+never see a partial file.
+"""
+
+import json
+import os
+import tempfile
+
+
+def atomic_write_json(path: str, document) -> None:
+    """
+    Write a JSON file atomically.
+
+    The document goes to a uniquely named temporary file in the destination
+    directory, which is then renamed over path, so concurrent writers never
+    share a temporary file and readers see either the old or the new file.
+
+    Args:
+        path: Destination file
+        document: JSON-serializable document
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(document, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
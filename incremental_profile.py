@@ -0,0 +1,371 @@
+"""
+Incremental risk-return profiles for intraday refreshes.
+Upserting or removing a token updates running aggregates in O(log N), so a poll
+that moves a handful of constituents does not rebuild the whole analyzer.
+
+Order statistics use sortedcontainers.SortedList when installed, otherwise a
+bisect-maintained list (O(log N) search, O(N) memmove on insert/remove).
+"""
+
+import bisect
+import math
+from typing import Dict, Iterable
+
+import pandas as pd
+
+from bitquery_decode import extract_row
+from calculations import (build_risk_return_profile, describe_top_tokens,
+                          index_construction_info, period_risk_metrics)
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+
+class _BisectList:
+    """
+    Minimal stand-in for sortedcontainers.SortedList backed by a plain list.
+    """
+
+    def __init__(self):
+        self._items = []
+
+    def add(self, value) -> None:
+        bisect.insort(self._items, value)
+
+    def remove(self, value) -> None:
+        i = bisect.bisect_left(self._items, value)
+        if i == len(self._items) or self._items[i] != value:
+            raise ValueError(f"{value!r} not in list")
+        del self._items[i]
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+def _sorted_list():
+    return SortedList() if SortedList is not None else _BisectList()
+
+
+def _value_at(values, index: int) -> float:
+    """Get the plain value at index of a sorted list of values or (value, ...) tuples."""
+    item = values[index]
+    return item[0] if isinstance(item, tuple) else item
+
+
+def _quantile(values, q: float) -> float:
+    """Linearly interpolated quantile of a sorted list (pandas/NumPy default method)."""
+    position = (len(values) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    low_value = _value_at(values, lower)
+    return low_value + (_value_at(values, upper) - low_value) * (position - lower)
+
+
+class IncrementalProfile:
+    """
+    Risk-return profile of an index maintained under token upserts and removals.
+
+    Keeps running sums for total volume, the HHI and the ROI moments, and
+    sorted structures for the median range, max drawdown, volume quantiles,
+    the top tokens by volume and the best/worst ROI tokens. profile() returns
+    the same dictionary as MemeCoinRiskAnalyzer.generate_risk_return_profile
+    for the current token set (up to floating-point summation order).
+
+    Tokens are keyed by (mint address, side mint address), the grain of the
+    ranking rows, so a token quoted against several currencies contributes one
+    entry per currency, as it does in MemeCoinRiskAnalyzer.
+
+    Usage:
+        incremental = IncrementalProfile("Memecoin 50 Volume", use_price_data=True)
+        incremental.upsert_rows(rows, price_data)
+        incremental.upsert(changed_row, price_data[changed_mint])
+        incremental.remove(delisted_mint)
+        profile = incremental.profile()
+    """
+
+    def __init__(self, index_name: str = "Memecoin 50 Volume", use_price_data: bool = False):
+        """
+        Args:
+            index_name: Name of the index reported in the profile
+            use_price_data: Compute ROI from oldest/latest prices passed with
+                each token (as with generate_risk_return_profile(price_data=...))
+                instead of the fallback open/close prices
+        """
+        self.index_name = index_name
+        self.use_price_data = use_price_data
+        self.tokens = {}
+        self._keys_by_mint = {}
+        self._next_seq = 0
+
+        self.total_volume = 0.0
+        self.sum_squared_volume = 0.0
+        self.volumes = _sorted_list()
+        self.by_volume = _sorted_list()        # (-volume, seq, key) -> nlargest order
+
+        self.range_sum = 0.0
+        self.range_count = 0
+        self.capped_ranges = _sorted_list()
+        self.drawdowns = _sorted_list()
+
+        self.roi_mean = 0.0
+        self.roi_m2 = 0.0
+        self.roi_volume_sum = 0.0
+        self.positive_roi_count = 0
+        self.by_roi = _sorted_list()           # (roi, seq, key) -> nsmallest order
+        self.by_roi_desc = _sorted_list()      # (-roi, seq, key) -> nlargest order
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, key) -> bool:
+        if isinstance(key, tuple):
+            return key in self.tokens
+        return key in self._keys_by_mint
+
+    def _build_record(self, row: Dict, price: Dict, seq: int) -> Dict:
+        """Extract the per-token values every aggregate is derived from."""
+        (volume, volatility, high, low, open_price, close_price), count, strings = extract_row(row)
+        mint_address, name, symbol, _, side_mint = strings
+
+        if math.isnan(volatility):
+            volatility = ((high - low) / low) * 100 if low > 0 else 0.0
+
+        if self.use_price_data:
+            price = price or {}
+            start_price = float(price.get('oldest_price', 0) or 0)
+            end_price = float(price.get('latest_price', 0) or 0)
+        else:
+            start_price, end_price = open_price, close_price
+        roi = ((end_price - start_price) / start_price) * 100 if start_price > 0 and end_price > 0 else 0.0
+
+        price_range = (high - low) / low if low > 0 else math.nan
+        drawdown = (low - high) / high if high > 0 else math.nan
+        return {
+            'seq': seq, 'key': (mint_address, side_mint), 'mint_address': mint_address,
+            'name': name, 'symbol': symbol,
+            'volume': volume, 'volatility': volatility, 'high': high, 'low': low,
+            'open': open_price, 'close': close_price, 'count': count, 'price': price,
+            'start_price': start_price, 'end_price': end_price, 'roi': roi,
+            'range': price_range if math.isfinite(price_range) else None,
+            'drawdown': drawdown if math.isfinite(drawdown) else None
+        }
+
+    def _apply(self, record: Dict, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) one token's contributions."""
+        seq, key = record['seq'], record['key']
+        volume, roi = record['volume'], record['roi']
+        update = (lambda values, item: values.add(item)) if sign > 0 else (lambda values, item: values.remove(item))
+
+        self.total_volume += sign * volume
+        self.sum_squared_volume += sign * volume * volume
+        update(self.volumes, volume)
+        update(self.by_volume, (-volume, seq, key))
+
+        if record['range'] is not None:
+            self.range_sum += sign * record['range']
+            self.range_count += sign
+            capped = min(record['range'], 10.0)
+            if capped >= 0:
+                update(self.capped_ranges, capped)
+        if record['drawdown'] is not None:
+            update(self.drawdowns, record['drawdown'])
+
+        # Welford update of the ROI mean and sum of squared deviations
+        n_before = len(self.by_roi)
+        if sign > 0:
+            delta = roi - self.roi_mean
+            self.roi_mean += delta / (n_before + 1)
+            self.roi_m2 += delta * (roi - self.roi_mean)
+        elif n_before <= 1:
+            self.roi_mean = self.roi_m2 = 0.0
+        else:
+            delta = roi - self.roi_mean
+            self.roi_mean -= delta / (n_before - 1)
+            self.roi_m2 = max(self.roi_m2 - delta * (roi - self.roi_mean), 0.0)
+        self.roi_volume_sum += sign * roi * volume
+        self.positive_roi_count += sign * (roi > 0)
+        update(self.by_roi, (roi, seq, key))
+        update(self.by_roi_desc, (-roi, seq, key))
+
+    def upsert(self, row: Dict, price: Dict = None) -> None:
+        """
+        Insert a (token, side currency) row or replace its previous values.
+
+        Args:
+            row: DEXTradeByTokens row dictionary
+            price: Optional {'oldest_price', 'latest_price'} entry for the token
+                (used with use_price_data; keeps the previous entry when None)
+        """
+        trade = row['Trade']
+        key = (trade['Currency']['MintAddress'], trade['Side']['Currency']['MintAddress'])
+        previous = self.tokens.get(key)
+        if previous is not None:
+            self._apply(previous, -1)
+            seq = previous['seq']
+            if price is None:
+                price = previous['price']
+        else:
+            seq = self._next_seq
+            self._next_seq += 1
+
+        record = self._build_record(row, price, seq)
+        self._apply(record, 1)
+        self.tokens[key] = record
+        self._keys_by_mint.setdefault(key[0], set()).add(key)
+
+    def upsert_rows(self, rows: Iterable[Dict], price_data: Dict = None) -> None:
+        """
+        Upsert many tokens, e.g. the rows of a ranking response.
+
+        Args:
+            rows: Iterable of DEXTradeByTokens row dictionaries
+            price_data: Optional {mint_address: {'oldest_price', 'latest_price', ...}}
+        """
+        price_data = price_data or {}
+        for row in rows:
+            self.upsert(row, price_data.get(row['Trade']['Currency']['MintAddress']))
+
+    def remove(self, mint_address: str, side_mint: str = None) -> bool:
+        """
+        Remove a token.
+
+        Args:
+            mint_address: Mint address of the token
+            side_mint: Side currency mint address of the row to remove
+                (all rows of the token when None)
+
+        Returns:
+            True if any row of the token was tracked
+        """
+        keys = self._keys_by_mint.get(mint_address, set())
+        removed = list(keys) if side_mint is None else [key for key in keys if key[1] == side_mint]
+        for key in removed:
+            self._apply(self.tokens.pop(key), -1)
+            keys.discard(key)
+        if not keys:
+            self._keys_by_mint.pop(mint_address, None)
+        return bool(removed)
+
+    def hhi(self) -> float:
+        """
+        Get the Herfindahl Index of the volume weights.
+
+        Returns:
+            HHI between 0 and 1 (NaN when total volume is zero)
+        """
+        if self.total_volume == 0:
+            return math.nan
+        return self.sum_squared_volume / (self.total_volume ** 2)
+
+    def range_metrics(self) -> Dict:
+        """
+        Get the high/low range statistics (see MemeCoinRiskAnalyzer.calculate_range_metrics).
+
+        Returns:
+            Dictionary with 'median_range', 'mean_range' and 'max_drawdown'
+        """
+        return {
+            'median_range': _quantile(self.capped_ranges, 0.5) if len(self.capped_ranges) > 0 else None,
+            'mean_range': self.range_sum / self.range_count if self.range_count > 0 else 0.0,
+            'max_drawdown': self.drawdowns[0] if len(self.drawdowns) > 0 else None
+        }
+
+    def roi_statistics(self) -> Dict:
+        """
+        Get ROI statistics (see MemeCoinRiskAnalyzer.calculate_roi_statistics_from_data).
+
+        Returns:
+            Dictionary containing ROI statistics
+        """
+        total_tokens = len(self.by_roi)
+        if total_tokens == 0:
+            return {
+                'total_tokens': 0,
+                'positive_roi_count': 0,
+                'negative_roi_count': 0,
+                'average_roi': 0.0,
+                'median_roi': 0.0,
+                'max_roi': 0.0,
+                'min_roi': 0.0,
+                'roi_std': 0.0,
+                'positive_roi_percentage': 0.0,
+                'volume_weighted_roi': 0.0
+            }
+
+        roi_std = math.sqrt(self.roi_m2 / (total_tokens - 1)) if total_tokens > 1 else math.nan
+        volume_weighted_roi = self.roi_volume_sum / self.total_volume if self.total_volume > 0 else 0.0
+        return {
+            'total_tokens': total_tokens,
+            'positive_roi_count': self.positive_roi_count,
+            'negative_roi_count': total_tokens - self.positive_roi_count,
+            'average_roi': round(self.roi_mean, 2),
+            'median_roi': round(_quantile(self.by_roi, 0.5), 2),
+            'max_roi': round(self.by_roi[-1][0], 2),
+            'min_roi': round(self.by_roi[0][0], 2),
+            'roi_std': round(roi_std, 2),
+            'positive_roi_percentage': round((self.positive_roi_count / total_tokens) * 100, 2),
+            'volume_weighted_roi': round(volume_weighted_roi, 2)
+        }
+
+    def _roi_tokens(self, ordered, top_n: int) -> pd.DataFrame:
+        """Build the best or worst ROI token table from a sorted ROI structure."""
+        start_column, end_column = ('oldest_price', 'latest_price') if self.use_price_data else ('open', 'close')
+        records = []
+        for i in range(min(top_n, len(ordered))):
+            record = self.tokens[ordered[i][2]]
+            records.append({
+                'symbol': record['symbol'], 'name': record['name'], 'mint_address': record['mint_address'],
+                start_column: record['start_price'], end_column: record['end_price'],
+                'roi_percentage': record['roi'], 'roi_absolute': record['end_price'] - record['start_price'],
+                'volume': record['volume'], 'volatility': record['volatility']
+            })
+        return pd.DataFrame(records)
+
+    def top_tokens_by_volume(self, top_n: int = 10) -> pd.DataFrame:
+        """
+        Get the top N tokens by volume (see MemeCoinRiskAnalyzer.get_top_tokens_by_volume).
+
+        Args:
+            top_n: Number of top tokens to return
+
+        Returns:
+            DataFrame with top tokens sorted by volume
+        """
+        columns = ['symbol', 'name', 'mint_address', 'volume', 'high', 'low', 'close', 'count']
+        top = [self.tokens[self.by_volume[i][2]] for i in range(min(top_n, len(self.by_volume)))]
+        return describe_top_tokens(pd.DataFrame([{column: record[column] for column in columns} for record in top],
+                                                columns=columns))
+
+    def profile(self) -> Dict:
+        """
+        Build the risk-return profile of the current token set.
+
+        Returns:
+            Dictionary containing all risk and return metrics
+        """
+        if not self.tokens:
+            raise ValueError("No tokens tracked. Call upsert() or upsert_rows() first.")
+
+        hhi = self.hhi()
+        constituent_stability = min(max(0, (1.0 - hhi) * 100), 100.0)
+        weight_concentration = hhi * 100
+
+        volatilities, return_risk_ratios, max_drawdown_pct = period_risk_metrics(self.range_metrics(), len(self.tokens))
+
+        top_tokens = self.top_tokens_by_volume(10)
+        volume_quartiles = {q: _quantile(self.volumes, q) for q in (0.25, 0.5, 0.75, 1.0)}
+        index_info = index_construction_info(len(self.tokens), self.total_volume, volume_quartiles,
+                                             top_tokens['volume'].sum())
+
+        return build_risk_return_profile(self.index_name, constituent_stability, weight_concentration,
+                                         volatilities, return_risk_ratios, max_drawdown_pct, "",
+                                         self.roi_statistics(), self._roi_tokens(self.by_roi_desc, 10),
+                                         self._roi_tokens(self.by_roi, 10), top_tokens, index_info)
@@ -0,0 +1,240 @@
+"""
+Vectorized index level (NAV) engine.
+Turns constituent weights and a tokens x days price matrix into a daily NAV
+series with scheduled rebalancing, transaction costs and delisting handling.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+REBALANCE_SCHEDULES = ("none", "daily", "weekly", "monthly")
+
+# Trailing columns without a price that are still treated as late data
+DEFAULT_MIN_DELISTING_GAP = 3
+
+
+def rebalance_indices(times, schedule="monthly") -> np.ndarray:
+    """
+    Get the columns of a time grid on which the index rebalances.
+
+    The first column always rebalances (the index is bought there). Weekly
+    rebalances fall on the first column of each Monday-based week, monthly
+    ones on the first column of each calendar month.
+
+    Args:
+        times: Grid times (epoch seconds, datetime64 or ISO date strings)
+        schedule: "none" (buy and hold), "daily", "weekly", "monthly", or an
+            explicit sequence of column indices
+
+    Returns:
+        Sorted array of column indices, starting with 0
+    """
+    stamps = np.asarray(times)
+    stamps = stamps.astype("datetime64[s]") if stamps.dtype.kind != "M" else stamps
+    if len(stamps) == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    if not isinstance(schedule, str):
+        columns = np.asarray(schedule, dtype=np.intp)
+        columns = columns[(columns >= 0) & (columns < len(stamps))]
+        return np.union1d([0], columns).astype(np.intp)
+    if schedule not in REBALANCE_SCHEDULES:
+        raise ValueError(f"Unknown rebalance schedule {schedule!r}; expected one of {REBALANCE_SCHEDULES}")
+    if schedule == "none":
+        return np.zeros(1, dtype=np.intp)
+
+    days = stamps.astype("datetime64[D]").astype(np.int64)
+    if schedule == "daily":
+        period = days
+    elif schedule == "weekly":
+        # Epoch day 0 is a Thursday; shift so weeks start on Monday
+        period = (days + 3) // 7
+    else:
+        period = stamps.astype("datetime64[M]").astype(np.int64)
+    return np.concatenate([[0], np.flatnonzero(np.diff(period) != 0) + 1]).astype(np.intp)
+
+
+def effective_prices(prices, delisting_haircut: float = 0.0, min_delisting_gap: int = DEFAULT_MIN_DELISTING_GAP,
+                     delisted=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Prepare a price matrix for NAV computation.
+
+    Gaps are forward-filled with the last traded price. A token is delisted
+    after its last price when it is flagged in delisted, or when its trailing
+    gap is longer than min_delisting_gap columns; shorter trailing gaps are
+    taken as data that has not arrived yet. A delisted position is valued at
+    the last traded price less the haircut and can no longer be bought.
+
+    Args:
+        prices: Tokens x days matrix with NaN (or non-positive values) where
+            a token has no price
+        delisting_haircut: Fraction of value lost on delisting (0 exits at the
+            last traded price, 1 writes the position off)
+        min_delisting_gap: Longest trailing gap (in columns) not treated as a
+            delisting
+        delisted: Optional per-token flags of known delistings
+
+    Returns:
+        Tuple of (forward-filled prices, tradable mask, delisted-token flags)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n_tokens, n_days = prices.shape
+    valid = np.isfinite(prices) & (prices > 0)
+    columns = np.arange(n_days)
+
+    last_seen = np.maximum.accumulate(np.where(valid, columns, -1), axis=1) if n_days else np.empty((n_tokens, 0), int)
+    listed = last_seen >= 0
+    filled = np.where(listed, prices[np.arange(n_tokens)[:, None], np.maximum(last_seen, 0)], np.nan)
+
+    last_valid = last_seen[:, -1] if n_days else np.full(n_tokens, -1)
+    trailing_gap = n_days - 1 - last_valid
+    is_delisted = (last_valid >= 0) & (trailing_gap > 0)
+    signalled = np.zeros(n_tokens, dtype=bool) if delisted is None else np.asarray(delisted, dtype=bool)
+    is_delisted &= signalled | (trailing_gap > min_delisting_gap)
+
+    after_delisting = is_delisted[:, None] & (columns[None, :] > last_valid[:, None])
+    filled = np.where(after_delisting, filled * (1.0 - delisting_haircut), filled)
+    tradable = listed & ~after_delisting
+    return filled, tradable, is_delisted
+
+
+def compute_nav(prices, weights, times=None, schedule="monthly", cost_bps: float = 0.0,
+                delisting_haircut: float = 0.0, initial_nav: float = 100.0, prepared=None,
+                min_delisting_gap: int = DEFAULT_MIN_DELISTING_GAP, delisted=None) -> Dict:
+    """
+    Compute the daily NAV of an index.
+
+    On each rebalance column the portfolio is reset to the target weights,
+    renormalized over tradable tokens (listed and not delisted). Between
+    rebalances unit holdings are fixed, so weights drift with prices. Every
+    rebalance, including the initial purchase, pays cost_bps on its one-way
+    turnover. All rebalance periods are evaluated in one vectorized pass.
+
+    Args:
+        prices: Tokens x days price matrix (e.g. from CandleStore.matrix)
+        weights: Target weights per token, or a tokens x days matrix of
+            target weights read on each rebalance column (time-varying
+            constituents); NaN weights count as 0
+        times: Grid times; required for the weekly and monthly schedules
+        schedule: Rebalance schedule (see rebalance_indices)
+        cost_bps: Transaction cost in basis points of traded value
+        delisting_haircut: Fraction of value lost on delisting (see effective_prices)
+        initial_nav: NAV before the initial purchase
+        prepared: Optional effective_prices output, to share its work across
+            several variants
+        min_delisting_gap: Longest trailing gap not treated as a delisting
+            (see effective_prices)
+        delisted: Optional per-token flags of known delistings
+
+    Returns:
+        Dictionary with 'nav' (per column), 'rebalance_indices', 'turnover'
+        (one-way, per rebalance), 'costs' (fraction of NAV, per rebalance)
+        and 'delisted' (per token)
+    """
+    if prepared is None:
+        prepared = effective_prices(prices, delisting_haircut, min_delisting_gap, delisted)
+    filled, tradable, delisted = prepared
+    n_tokens, n_days = filled.shape
+    if n_days == 0:
+        return {'nav': np.zeros(0), 'rebalance_indices': np.zeros(0, dtype=np.intp),
+                'turnover': np.zeros(0), 'costs': np.zeros(0), 'delisted': delisted}
+
+    if times is None:
+        if not isinstance(schedule, str) or schedule in ("none", "daily"):
+            times = np.arange(n_days) * 86400
+        else:
+            raise ValueError(f"The {schedule!r} schedule needs the grid times")
+    rebalances = rebalance_indices(times, schedule)
+
+    # Target weights on each rebalance column, renormalized over tradable tokens
+    weights = np.nan_to_num(np.asarray(weights, dtype=np.float64))
+    targets = weights[:, rebalances] if weights.ndim == 2 else np.repeat(weights[:, None], len(rebalances), axis=1)
+    targets = np.where(tradable[:, rebalances], np.maximum(targets, 0.0), 0.0)
+    invested = targets.sum(axis=0)
+    targets = np.divide(targets, invested, out=np.zeros_like(targets), where=invested > 0)
+    cash = np.where(invested > 0, 0.0, 1.0)
+
+    # Value of each holding relative to its rebalance, for every column at once
+    entry = np.where(targets > 0, filled[:, rebalances], 1.0)
+    segment = np.searchsorted(rebalances, np.arange(n_days), side="right") - 1
+    with np.errstate(invalid="ignore"):
+        holdings = np.where(targets[:, segment] > 0, targets[:, segment] * filled / entry[:, segment], 0.0)
+    relative = holdings.sum(axis=0) + cash[segment]
+
+    # Holdings of each period valued on the next rebalance column, before trading
+    previous = targets[:, :-1]
+    with np.errstate(invalid="ignore"):
+        drifted = np.where(previous > 0, previous * filled[:, rebalances[1:]] / entry[:, :-1], 0.0)
+    segment_value = drifted.sum(axis=0) + cash[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drifted = np.nan_to_num(drifted / segment_value)
+        drifted_cash = np.nan_to_num(cash[:-1] / segment_value)
+
+    turnover = np.empty(len(rebalances))
+    turnover[0] = targets[:, 0].sum()
+    turnover[1:] = 0.5 * (np.abs(targets[:, 1:] - drifted).sum(axis=0) + np.abs(cash[1:] - drifted_cash))
+    costs = turnover * cost_bps / 10000.0
+
+    # NAV right after each rebalance, chained through the segment returns
+    growth = np.concatenate([[1.0], segment_value]) * (1.0 - costs)
+    start_nav = initial_nav * np.cumprod(growth)
+    nav = start_nav[segment] * relative
+
+    return {'nav': nav, 'rebalance_indices': rebalances, 'turnover': turnover, 'costs': costs,
+            'delisted': delisted}
+
+
+def compute_navs(prices, variants: Dict[str, Dict], times=None, delisted=None) -> Dict[str, Dict]:
+    """
+    Compute the NAV of several index variants over one price matrix.
+
+    The forward-filled price matrix is prepared once per delisting haircut
+    and minimum delisting gap, and shared by every variant using them.
+
+    Args:
+        prices: Tokens x days price matrix
+        variants: Dictionary of variant name -> keyword arguments of
+            compute_nav ('weights' is required)
+        times: Grid times shared by all variants
+        delisted: Optional per-token flags of known delistings
+
+    Returns:
+        Dictionary of variant name -> compute_nav result
+    """
+    prepared = {}
+    results = {}
+    for name, options in variants.items():
+        options = dict(options)
+        haircut = options.pop('delisting_haircut', 0.0)
+        gap = options.pop('min_delisting_gap', DEFAULT_MIN_DELISTING_GAP)
+        if (haircut, gap) not in prepared:
+            prepared[haircut, gap] = effective_prices(prices, haircut, gap, delisted)
+        results[name] = compute_nav(prices, times=times, delisting_haircut=haircut,
+                                    prepared=prepared[haircut, gap], **options)
+    return results
+
+
+def aggregate_weights(mint_addresses, weights, universe) -> np.ndarray:
+    """
+    Align per-row weights with the rows of a price matrix.
+
+    Weights of rows sharing a mint address (e.g. several quote currencies)
+    are summed.
+
+    Args:
+        mint_addresses: Mint address of each weight
+        weights: Weight of each mint address row
+        universe: Mint addresses of the price matrix rows
+
+    Returns:
+        Weight array aligned with universe
+    """
+    positions = {mint_address: i for i, mint_address in enumerate(universe)}
+    aligned = np.zeros(len(positions))
+    rows = np.fromiter((positions.get(mint_address, -1) for mint_address in mint_addresses), dtype=np.intp)
+    weights = np.asarray(weights, dtype=np.float64)
+    known = rows >= 0
+    np.add.at(aligned, rows[known], weights[known])
+    return aligned
+
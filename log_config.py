@@ -0,0 +1,64 @@
+"""
+Logging configuration for the memecoin pipeline.
+Sets up leveled console output and an optional JSON-lines sink for log aggregators.
+"""
+
+import json
+import logging
+import os
+import sys
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_STANDARD_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as single-line JSON objects.
+
+    Fields passed with `extra=` are included as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = None, json_path: str = None) -> None:
+    """
+    Configure logging for all pipeline modules.
+
+    Per-token messages are logged at DEBUG and progress at INFO, so a quiet
+    production run (level WARNING) does no per-token string formatting.
+
+    Args:
+        level: Log level name (defaults to $MEMECOIN_LOG_LEVEL or INFO)
+        json_path: Optional file to append JSON-lines records to
+            (defaults to $MEMECOIN_LOG_JSON)
+    """
+    level = (level or os.environ.get("MEMECOIN_LOG_LEVEL", "INFO")).upper()
+    json_path = json_path or os.environ.get("MEMECOIN_LOG_JSON")
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    root.addHandler(console)
+
+    if json_path:
+        json_handler = logging.FileHandler(json_path)
+        json_handler.setFormatter(JsonFormatter())
+        root.addHandler(json_handler)
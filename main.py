@@ -3,29 +3,52 @@ Main execution module for memecoin risk analysis.
 Orchestrates data fetching, analysis, and display.
 """
 
+from log_config import configure_logging
 from bitquery_data import fetch_memecoin_data
-from analysis import analyze_memecoin_risk, calculate_performance_comparison
+from snapshot_lake import save_snapshot
+from analytics_db import ingest_run, load_previous_constituents
+from analysis import analyze_memecoin_risk, build_token_universe, calculate_performance_comparison
 from display import display_risk_analysis_results, display_performance_comparison
 
 def main():
     """
     Main function to run the complete memecoin risk analysis.
+    
+    Each fetch is saved to the snapshot lake (see snapshot_lake.py) and each
+    run is loaded into the analytics database (see analytics_db.py).
+    
+    Set MEMECOIN_LOG_LEVEL=WARNING for a quiet run and MEMECOIN_LOG_JSON to a
+    file path to also write JSON-lines logs.
     """
+    configure_logging()
+    
+    start_date, end_date = "2025-03-01", "2025-09-30"  # Run 1: Current 6 months (default)
+    # start_date, end_date = "2024-09-01", "2025-03-30"  # Run 2: Custom date range
+    
     print("Fetching memecoin data from Bitquery...")
-    data = fetch_memecoin_data("2025-03-01", "2025-09-30")  # Run 1: Current 6 months (default)
-    # data = fetch_memecoin_data("2024-09-01", "2025-03-30")  # Run 2: Custom date range
+    data = fetch_memecoin_data(start_date, end_date)
     
     if data is None:
         print("Failed to fetch data. Please check your API token and connection.")
         return
     
-    # Analyze the data
-    results = analyze_memecoin_risk(data)
+    # Keep the fetch for offline reruns (skipped when pyarrow is not installed)
+    save_snapshot(data, start_date, end_date)
+    
+    # Analyze the data; constituent stability is measured against the latest stored earlier run
+    # of the same window length
+    # The token universe is built once and shared with the database load
+    universe = build_token_universe(data)
+    results = analyze_memecoin_risk(data, previous_constituents=load_previous_constituents(start_date, end_date),
+                                    universe=universe)
     
     if results is None:
         print("Failed to analyze data.")
         return
     
+    # Bulk-load the run into the analytics database for cross-run queries
+    ingest_run(start_date, end_date, universe, results)
+    
     volume_profile = results['volume_index']
     volatility_profile = results['volatility_index']
     
@@ -0,0 +1,223 @@
+"""
+Persistent on-disk cache for Bitquery archive responses.
+Entries are content-addressed by the normalized query and date range.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import date, datetime
+
+from fileio import atomic_write_json
+
+DEFAULT_CACHE_DIR = ".bitquery_cache"
+
+# Entry file names: the hex SHA-256 cache key
+_ENTRY_NAME = re.compile(r"[0-9a-f]{64}\.json")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a GraphQL query so formatting differences map to the same key.
+
+    Args:
+        query: GraphQL query string
+
+    Returns:
+        Query with all whitespace runs collapsed to single spaces
+    """
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def make_cache_key(query: str, start_date: str = None, end_date: str = None) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        query: GraphQL query string
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+
+    Returns:
+        Hex SHA-256 digest of the normalized query and date range
+    """
+    material = json.dumps({
+        "query": normalize_query(query),
+        "start_date": start_date,
+        "end_date": end_date
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Size-bounded, content-addressed disk cache for JSON API responses.
+
+    Ranges that end before today never expire, because archive data for a
+    closed window does not change. Ranges that touch today expire after
+    recent_ttl seconds. When the cache grows past max_bytes, the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = 512 * 1024 * 1024, recent_ttl: float = 900.0):
+        """
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Maximum total size of cache entries on disk
+            recent_ttl: Time-to-live in seconds for ranges that include today
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.recent_ttl = recent_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._entries())
+
+    def ttl_for_range(self, end_date: str = None):
+        """
+        Get the time-to-live for a query range.
+
+        Args:
+            end_date: End date in YYYY-MM-DD format
+
+        Returns:
+            None (never expires) for ranges ending in the past, else recent_ttl
+        """
+        if end_date is None:
+            return self.recent_ttl
+        try:
+            end = datetime.strptime(end_date[:10], "%Y-%m-%d").date()
+        except ValueError:
+            return self.recent_ttl
+        return None if end < date.today() else self.recent_ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def _entries(self):
+        """
+        Yield (path, mtime, size) for every entry on disk.
+
+        Only key-named files in their two-character shard directories count,
+        so other files sharing the directory (e.g. the shared SOL price) are
+        never sized, evicted or cleared as cache entries.
+        """
+        for root, _, files in os.walk(self.cache_dir):
+            shard = os.path.relpath(root, self.cache_dir)
+            for name in files:
+                if not _ENTRY_NAME.fullmatch(name) or name[:2] != shard:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_mtime, stat.st_size
+
+    def get(self, key: str):
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at < time.time():
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Touch the entry so eviction is least-recently-used
+        try:
+            os.utime(path, None)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["response"]
+
+    def put(self, key: str, response, end_date: str = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key from make_cache_key()
+            response: JSON-serializable response
+            end_date: End date of the query range, used to pick the TTL
+        """
+        ttl = self.ttl_for_range(end_date)
+        entry = {
+            "created_at": time.time(),
+            "expires_at": None if ttl is None else time.time() + ttl,
+            "response": response
+        }
+        path = self._path(key)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+        # Write atomically so concurrent readers never see a partial entry
+        atomic_write_json(path, entry)
+
+        with self._lock:
+            self._total_bytes += os.path.getsize(path) - previous_size
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        for path, _, _ in sorted(self._entries(), key=lambda entry: entry[1]):
+            with self._lock:
+                if self._total_bytes <= self.max_bytes:
+                    return
+                self.evictions += 1
+            self._remove(path)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for path, _, _ in list(self._entries()):
+            self._remove(path)
+
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, evictions and size on disk
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": self._total_bytes
+            }
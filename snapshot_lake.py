@@ -0,0 +1,343 @@
+"""
+Date-partitioned snapshot lake for fetched token universes.
+Each fetch is written as Arrow IPC (or Parquet) tables whose columns match
+MemeCoinRiskAnalyzer.load_bitquery_columns, so historical reruns load local
+files instead of querying the archive again.
+
+Layout: <root>/start_date=YYYY-MM-DD/end_date=YYYY-MM-DD/fetched_at=YYYYMMDDTHHMMSS.ffffffZ/<table>.<ext>
+
+Requires pyarrow (optional dependency).
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    ipc = None
+    pq = None
+
+from bitquery_decode import ColumnBuffers, rows_to_columns
+from calculations import MemeCoinRiskAnalyzer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAKE_DIR = ".snapshot_lake"
+
+RANKING_TABLES = {"volume_ordered": "Memecoin 50 Volume", "volatility_ordered": "Memecoin 50 Volatility"}
+
+# Low-cardinality string columns are dictionary-encoded
+DICTIONARY_COLUMNS = ("name", "symbol", "side_currency")
+
+FORMAT_EXTENSIONS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for the snapshot lake. Install it with: pip install pyarrow")
+
+
+def _ranking_rows(response) -> list:
+    """Get the DEXTradeByTokens rows of a ranking response (empty when missing)."""
+    if not response or not response.get('data') or 'Solana' not in response['data']:
+        return []
+    return response['data']['Solana']['DEXTradeByTokens'] or []
+
+
+def ranking_table(rows) -> "pa.Table":
+    """
+    Convert DEXTradeByTokens rows into an Arrow table with the analyzer's columns.
+
+    Volatility is kept as returned by the API (NaN when missing), so the
+    high/low fallback is applied by load_bitquery_columns on load.
+
+    Args:
+        rows: DEXTradeByTokens row dictionaries
+
+    Returns:
+        pyarrow.Table
+    """
+    _require_pyarrow()
+    columns = rows_to_columns(list(rows))
+    arrays = {}
+    for column in ColumnBuffers.STRING_COLUMNS:
+        array = pa.array(columns[column].tolist(), type=pa.string())
+        arrays[column] = array.dictionary_encode() if column in DICTIONARY_COLUMNS else array
+    for column in ColumnBuffers.NUMERIC_COLUMNS:
+        arrays[column] = pa.array(columns[column], type=pa.float64())
+    arrays['count'] = pa.array(columns['count'], type=pa.int64())
+    return pa.table(arrays)
+
+
+class SnapshotLake:
+    """
+    Directory of date-partitioned fetch snapshots.
+
+    Arrow IPC snapshots are memory-mapped on load, so numeric columns reach
+    the analyzer without being copied; Parquet snapshots are smaller on disk
+    but are decoded into memory.
+    """
+
+    def __init__(self, root: str = DEFAULT_LAKE_DIR, format: str = "arrow"):
+        """
+        Args:
+            root: Lake directory
+            format: "arrow" (IPC, zero-copy loads) or "parquet"
+        """
+        _require_pyarrow()
+        if format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unknown snapshot format {format!r}; expected one of {list(FORMAT_EXTENSIONS)}")
+        self.root = root
+        self.format = format
+
+    def _write_table(self, table, path: str) -> None:
+        if self.format == "parquet":
+            pq.write_table(table, path)
+        else:
+            with pa.OSFile(path, "wb") as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+    def save(self, data: Dict, start_date: str, end_date: str) -> str:
+        """
+        Persist one fetch_memecoin_data result as a new snapshot.
+
+        The snapshot is written to a uniquely named temporary directory and
+        renamed into place, so readers never see a partial snapshot and
+        concurrent saves of one window never share a directory.
+
+        Args:
+            data: Dictionary returned by bitquery_data.fetch_memecoin_data
+            start_date: Start date of the fetched window (YYYY-MM-DD)
+            end_date: End date of the fetched window (YYYY-MM-DD)
+
+        Returns:
+            Path of the snapshot directory
+        """
+        fetched_at = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        partition = os.path.join(self.root, f"start_date={start_date}", f"end_date={end_date}")
+        path = os.path.join(partition, f"fetched_at={fetched_at}")
+        os.makedirs(partition, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=".fetched_at=", suffix=".tmp", dir=partition)
+        extension = FORMAT_EXTENSIONS[self.format]
+
+        try:
+            row_counts = {}
+            for table_name in RANKING_TABLES:
+                table = ranking_table(_ranking_rows(data.get(table_name)))
+                row_counts[table_name] = table.num_rows
+                self._write_table(table, os.path.join(tmp_path, table_name + extension))
+
+            market_cap_data = data.get('market_cap_data') or {}
+            self._write_table(pa.table({
+                'mint_address': pa.array(list(market_cap_data), type=pa.string()),
+                'market_cap_usd': pa.array(list(market_cap_data.values()), type=pa.float64())
+            }), os.path.join(tmp_path, "market_cap_data" + extension))
+
+            price_data = data.get('roi_price_data') or {}
+            infos = list(price_data.values())
+            self._write_table(pa.table({
+                'mint_address': pa.array(list(price_data), type=pa.string()),
+                'oldest_price': pa.array([info.get('oldest_price', 0) for info in infos], type=pa.float64()),
+                'latest_price': pa.array([info.get('latest_price', 0) for info in infos], type=pa.float64()),
+                'symbol': pa.array([info.get('symbol') for info in infos], type=pa.string()),
+                'name': pa.array([info.get('name') for info in infos], type=pa.string())
+            }), os.path.join(tmp_path, "roi_price_data" + extension))
+
+            with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+                json.dump({"start_date": start_date, "end_date": end_date, "fetched_at": fetched_at,
+                           "format": self.format, "row_counts": row_counts}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        logger.info("Saved snapshot %s", path)
+        return path
+
+    def snapshots(self, start_date: str = None, end_date: str = None) -> List[str]:
+        """
+        List snapshot directories, oldest fetch first within each window.
+
+        Args:
+            start_date: Optional window start date to filter on
+            end_date: Optional window end date to filter on
+
+        Returns:
+            List of snapshot directory paths
+        """
+        paths = []
+        if not os.path.isdir(self.root):
+            return paths
+        for start_partition in sorted(os.listdir(self.root)):
+            if start_date is not None and start_partition != f"start_date={start_date}":
+                continue
+            start_dir = os.path.join(self.root, start_partition)
+            for end_partition in sorted(os.listdir(start_dir)):
+                if end_date is not None and end_partition != f"end_date={end_date}":
+                    continue
+                end_dir = os.path.join(start_dir, end_partition)
+                paths.extend(os.path.join(end_dir, name) for name in sorted(os.listdir(end_dir))
+                             if name.startswith("fetched_at=") and not name.endswith(".tmp"))
+        return paths
+
+    def latest(self, start_date: str, end_date: str) -> Optional[str]:
+        """
+        Get the most recent snapshot of a window.
+
+        Args:
+            start_date: Window start date (YYYY-MM-DD)
+            end_date: Window end date (YYYY-MM-DD)
+
+        Returns:
+            Snapshot directory path, or None when the window was never saved
+        """
+        paths = self.snapshots(start_date, end_date)
+        return paths[-1] if paths else None
+
+
+def read_table(snapshot_path: str, table_name: str) -> "pa.Table":
+    """
+    Read one table of a snapshot; Arrow IPC files are memory-mapped.
+
+    Args:
+        snapshot_path: Snapshot directory
+        table_name: "volume_ordered", "volatility_ordered", "market_cap_data" or "roi_price_data"
+
+    Returns:
+        pyarrow.Table
+    """
+    _require_pyarrow()
+    path = os.path.join(snapshot_path, table_name + ".arrow")
+    if os.path.exists(path):
+        return ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return pq.read_table(os.path.join(snapshot_path, table_name + ".parquet"))
+
+
+def _column_array(column) -> np.ndarray:
+    """Expose an Arrow column as NumPy, without copying when it is a single null-free chunk."""
+    numeric = pa.types.is_floating(column.type) or pa.types.is_integer(column.type)
+    if numeric and column.num_chunks == 1 and column.null_count == 0:
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+    return column.to_numpy(zero_copy_only=False)
+
+
+def load_columns(snapshot_path: str, table_name: str) -> Dict[str, np.ndarray]:
+    """
+    Load a ranking table as column arrays accepted by load_bitquery_columns.
+
+    Args:
+        snapshot_path: Snapshot directory
+        table_name: "volume_ordered" or "volatility_ordered"
+
+    Returns:
+        Dictionary of column name -> NumPy array (numeric columns of Arrow IPC
+        snapshots are views of the memory-mapped file)
+    """
+    table = read_table(snapshot_path, table_name)
+    return {name: _column_array(table.column(name)) for name in table.column_names}
+
+
+def load_meta(snapshot_path: str) -> Dict:
+    """
+    Load the metadata of a snapshot.
+
+    Returns:
+        Dictionary with start_date, end_date, fetched_at, format and row_counts
+    """
+    with open(os.path.join(snapshot_path, "meta.json")) as f:
+        return json.load(f)
+
+
+def load_market_cap_data(snapshot_path: str) -> Dict[str, float]:
+    """
+    Load the market cap mapping of a snapshot.
+
+    Returns:
+        Dictionary of mint_address -> market_cap_usd
+    """
+    table = read_table(snapshot_path, "market_cap_data")
+    return dict(zip(table.column('mint_address').to_pylist(), table.column('market_cap_usd').to_pylist()))
+
+
+def load_price_data(snapshot_path: str) -> Dict[str, Dict]:
+    """
+    Load the ROI price mapping of a snapshot.
+
+    Returns:
+        Dictionary of mint_address -> {'oldest_price', 'latest_price', 'symbol', 'name'}
+    """
+    rows = read_table(snapshot_path, "roi_price_data").to_pylist()
+    return {row.pop('mint_address'): row for row in rows}
+
+
+def load_analyzer(snapshot_path: str, table_name: str = "volume_ordered", market_cap_data: Dict = None,
+                  price_dtype=np.float64) -> MemeCoinRiskAnalyzer:
+    """
+    Load one ranking of a snapshot straight into an analyzer.
+
+    Args:
+        snapshot_path: Snapshot directory
+        table_name: "volume_ordered" or "volatility_ordered"
+        market_cap_data: Market cap mapping (defaults to the snapshot's own)
+        price_dtype: dtype of the price columns (see MemeCoinRiskAnalyzer)
+
+    Returns:
+        MemeCoinRiskAnalyzer with the ranking loaded
+    """
+    if market_cap_data is None:
+        market_cap_data = load_market_cap_data(snapshot_path)
+    analyzer = MemeCoinRiskAnalyzer(price_dtype)
+    analyzer.load_bitquery_columns(load_columns(snapshot_path, table_name), market_cap_data)
+    return analyzer
+
+
+def load_profiles(snapshot_path: str) -> Dict[str, Dict]:
+    """
+    Rebuild the volume and volatility index profiles of a snapshot offline.
+
+    Args:
+        snapshot_path: Snapshot directory
+
+    Returns:
+        Dictionary with 'volume_index' and 'volatility_index' profiles
+    """
+    market_cap_data = load_market_cap_data(snapshot_path)
+    price_data = load_price_data(snapshot_path)
+    profiles = {}
+    for table_name, index_name in RANKING_TABLES.items():
+        analyzer = load_analyzer(snapshot_path, table_name, market_cap_data)
+        profiles[table_name.replace("_ordered", "_index")] = analyzer.generate_risk_return_profile(index_name, price_data)
+    return profiles
+
+
+def save_snapshot(data: Dict, start_date: str, end_date: str, root: str = DEFAULT_LAKE_DIR) -> Optional[str]:
+    """
+    Persist a fetch to the snapshot lake if pyarrow is installed.
+
+    Args:
+        data: Dictionary returned by bitquery_data.fetch_memecoin_data
+        start_date: Start date of the fetched window (YYYY-MM-DD)
+        end_date: End date of the fetched window (YYYY-MM-DD)
+        root: Lake directory
+
+    Returns:
+        Path of the snapshot directory, or None when pyarrow is missing
+    """
+    if pa is None:
+        logger.debug("pyarrow not installed, skipping snapshot of %s to %s", start_date, end_date)
+        return None
+    return SnapshotLake(root).save(data, start_date, end_date)
@@ -0,0 +1,233 @@
+"""
+Sweep runner for analyzing many date windows.
+Fans fetch + analysis out across a process pool and streams one result row
+per index as each window completes.
+
+Usage:
+    python sweep.py --start 2023-10-01 --end 2025-09-30 --workers 4 --output sweep.csv
+"""
+
+import argparse
+import csv
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+
+from log_config import configure_logging
+from bitquery_client import configure_client
+from response_cache import DEFAULT_CACHE_DIR, ResponseCache
+from bitquery_data import fetch_memecoin_data
+from snapshot_lake import save_snapshot
+from analysis import analyze_memecoin_risk, build_token_universe, profile_row
+from analytics_db import AnalyticsStore, DEFAULT_DB_PATH, ingest_run
+
+logger = logging.getLogger(__name__)
+
+
+def monthly_windows(start_date: str, end_date: str, months: int = 1) -> Iterator[Tuple[str, str]]:
+    """
+    Split a date range into consecutive calendar-month windows.
+
+    Args:
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format (inclusive)
+        months: Number of calendar months per window
+
+    Yields:
+        (start_date, end_date) tuples in YYYY-MM-DD format; the last window
+        is truncated at end_date
+    """
+    current = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    while current <= end:
+        month_index = current.month - 1 + months
+        next_start = datetime(current.year + month_index // 12, month_index % 12 + 1, 1)
+        window_end = min(next_start - timedelta(days=1), end)
+        yield current.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d")
+        current = next_start
+
+
+def _init_worker(log_level: str, cache_dir: str) -> None:
+    """
+    Set up one worker process: its own logging and its own pooled client and
+    response cache (connection pools are never shared across processes).
+    """
+    configure_logging(log_level)
+    configure_client(cache=ResponseCache(cache_dir))
+
+
+def analyze_window(window: Tuple[str, str], fetch_options: Dict = None) -> Dict:
+    """
+    Fetch and analyze one date window, saving the fetch to the snapshot lake
+    and the results to the analytics database.
+
+    Args:
+        window: (start_date, end_date) in YYYY-MM-DD format
+        fetch_options: Extra keyword arguments for fetch_memecoin_data
+
+    Returns:
+        Dictionary with 'window', 'rows' (one per index, empty on failure),
+        'seconds' and 'error'
+    """
+    start_date, end_date = window
+    started = time.perf_counter()
+    rows, error = [], None
+    try:
+        data = fetch_memecoin_data(start_date, end_date, **(fetch_options or {}))
+        if data is not None:
+            save_snapshot(data, start_date, end_date)
+        universe = build_token_universe(data) if data is not None else None
+        results = analyze_memecoin_risk(data, universe=universe) if universe is not None else None
+        if results is None:
+            error = "fetch or analysis failed"
+        else:
+            ingest_run(start_date, end_date, universe, results)
+            rows = [profile_row(start_date, end_date, profile) for profile in results.values()]
+    except Exception as e:
+        logger.exception("Window %s to %s failed", start_date, end_date)
+        error = repr(e)
+    return {"window": window, "rows": rows, "seconds": time.perf_counter() - started, "error": error}
+
+
+def run_sweep(windows: Iterable[Tuple[str, str]], workers: int = None, fetch_options: Dict = None,
+              log_level: str = "WARNING", cache_dir: str = DEFAULT_CACHE_DIR) -> Iterator[Dict]:
+    """
+    Analyze many date windows in parallel, yielding results as windows complete.
+
+    Each worker process keeps one pooled HTTP client and response cache for
+    all the windows it runs. With workers=1 windows run serially in this
+    process on the shared client.
+
+    Args:
+        windows: Iterable of (start_date, end_date) tuples
+        workers: Number of worker processes (defaults to the CPU count)
+        fetch_options: Extra keyword arguments for fetch_memecoin_data
+        log_level: Log level of the worker processes
+        cache_dir: Response cache directory of the workers
+
+    Yields:
+        analyze_window results in completion order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for window in windows:
+            yield analyze_window(window, fetch_options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(log_level, cache_dir)) as executor:
+        futures = [executor.submit(analyze_window, window, fetch_options) for window in windows]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def sweep_table(results: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Gather sweep results into one table sorted by window and index.
+
+    Args:
+        results: Results yielded by run_sweep
+
+    Returns:
+        DataFrame with one row per window and index
+    """
+    rows = [row for result in results for row in result["rows"]]
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values(["start_date", "index"]).reset_index(drop=True)
+
+
+def refresh_stability(table: pd.DataFrame, path: str = DEFAULT_DB_PATH) -> pd.DataFrame:
+    """
+    Replace the constituent stability of a sweep table with turnover against
+    each window's predecessor.
+
+    Windows run in parallel, so each one is profiled without the previous
+    window's constituents. Once all are stored, the analytics database
+    recomputes the stability of newly loaded windows as turnover against the
+    previous window of the same length (see
+    AnalyticsStore.refresh_constituent_stability), the same measure main.py
+    records for a run analyzed after its predecessor.
+
+    Args:
+        table: Table returned by sweep_table
+        path: Analytics database the windows were loaded into
+
+    Returns:
+        The table with refreshed constituent_stability values
+    """
+    if table.empty:
+        return table
+    with AnalyticsStore(path) as store:
+        store.refresh_constituent_stability()
+        history = store.profile_history()
+    stability = history.set_index(["start_date", "end_date", "index_name"])["constituent_stability"]
+    keys = pd.MultiIndex.from_frame(table[["start_date", "end_date", "index"]])
+    table = table.copy()
+    table["constituent_stability"] = stability.reindex(keys).to_numpy()
+    return table
+
+
+def main(argv: List[str] = None) -> pd.DataFrame:
+    """
+    Command line entry point: run a monthly sweep and stream rows as they complete.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        The gathered result table
+    """
+    parser = argparse.ArgumentParser(description="Run the memecoin risk analysis over many date windows.")
+    parser.add_argument("--start", required=True, help="First day of the sweep (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="Last day of the sweep (YYYY-MM-DD)")
+    parser.add_argument("--months", type=int, default=1, help="Calendar months per window")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to the CPU count)")
+    parser.add_argument("--output", help="CSV file rows are appended to as windows complete "
+                                         "(rewritten in window order when the sweep ends)")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    windows = list(monthly_windows(args.start, args.end, args.months))
+    print(f"Sweeping {len(windows)} windows with {args.workers or os.cpu_count()} workers...")
+
+    results = []
+    writer = None
+    output = open(args.output, "w", newline="") if args.output else None
+    try:
+        for result in run_sweep(windows, args.workers):
+            results.append(result)
+            start_date, end_date = result["window"]
+            if result["error"]:
+                print(f"{start_date} to {end_date}: FAILED ({result['error']})")
+                continue
+            for row in result["rows"]:
+                print(f"{start_date} to {end_date} {row['index']:<24} vol 1m {row['volatility_1m']:>8.2f}%  "
+                      f"R/R 1m {row['return_risk_1m']:>8.2f}  ROI {row['average_roi']:>10.2f}%  "
+                      f"({result['seconds']:.1f}s)")
+                if output is not None:
+                    if writer is None:
+                        writer = csv.DictWriter(output, fieldnames=list(row))
+                        writer.writeheader()
+                    writer.writerow(row)
+            if output is not None:
+                output.flush()
+    finally:
+        if output is not None:
+            output.close()
+
+    table = refresh_stability(sweep_table(results))
+    if output is not None and not table.empty:
+        # Rewrite the streamed rows in window order with the refreshed stability
+        table.to_csv(args.output, index=False)
+    print(f"Completed {sum(1 for r in results if not r['error'])}/{len(windows)} windows")
+    return table
+
+
+if __name__ == "__main__":
+    main()
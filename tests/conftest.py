@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_trade_row(mint_address, side_mint="So11111111111111111111111111111111111111112", volume=1000.0,
+                   high=2.0, low=1.0, open_price=1.0, close=1.5, volatility=None, count=10):
+    """Build one DEXTradeByTokens ranking row."""
+    return {
+        'Trade': {
+            'Currency': {'MintAddress': mint_address, 'Name': f"Token {mint_address}", 'Symbol': mint_address.upper()},
+            'Side': {'Currency': {'MintAddress': side_mint, 'Name': "Wrapped Solana", 'Symbol': "WSOL"}},
+            'high': high,
+            'low': low,
+            'open': open_price,
+            'close': close
+        },
+        'volume': volume,
+        'volatility_token': volatility if volatility is not None else ((high - low) / low * 100 if low > 0 else 0.0),
+        'count': count
+    }
+
+
+def ranking_response(rows):
+    """Wrap DEXTradeByTokens rows in a GraphQL response."""
+    return {'data': {'Solana': {'DEXTradeByTokens': rows}}}
+
+
+@pytest.fixture
+def trade_row():
+    return make_trade_row
@@ -0,0 +1,104 @@
+import pytest
+
+from analysis import analyze_memecoin_risk, build_token_universe
+from analytics_db import AnalyticsStore
+from conftest import make_trade_row, ranking_response
+
+WINDOWS = [("2025-01-01", "2025-01-31"), ("2025-02-01", "2025-02-28"), ("2025-03-01", "2025-03-31")]
+
+
+def _fetch(first_mint):
+    rows = [make_trade_row(f"m{i}", volume=100.0 * (i + 1)) for i in range(first_mint, first_mint + 5)]
+    return {
+        'volume_ordered': ranking_response(rows),
+        'volatility_ordered': ranking_response(rows[::-1]),
+        'market_cap_data': {},
+        'roi_price_data': {}
+    }
+
+
+def test_refresh_matches_in_order_analysis(tmp_path):
+    fetches = [_fetch(first_mint) for first_mint in (0, 2, 3)]
+
+    # Analyzed in order, each window sees its predecessor (as in main.py)
+    with AnalyticsStore(str(tmp_path / "ordered.db")) as ordered:
+        for (start_date, end_date), data in zip(WINDOWS, fetches):
+            previous = {index_name: ordered.previous_constituents(index_name, end_date)
+                        for index_name in ("Memecoin 50 Volume", "Memecoin 50 Volatility")}
+            universe = build_token_universe(data)
+            profiles = analyze_memecoin_risk(data, executor="serial", universe=universe,
+                                             previous_constituents={k: v for k, v in previous.items() if v})
+            ordered.ingest_fetch(start_date, end_date, universe, profiles)
+        expected = ordered.profile_history()
+
+    # Analyzed out of order without predecessors (as in a parallel sweep), then refreshed
+    with AnalyticsStore(str(tmp_path / "sweep.db")) as sweep:
+        for (start_date, end_date), data in reversed(list(zip(WINDOWS, fetches))):
+            universe = build_token_universe(data)
+            sweep.ingest_fetch(start_date, end_date, universe, analyze_memecoin_risk(data, universe=universe))
+        assert sweep.refresh_constituent_stability() == 4
+        refreshed = sweep.profile_history()
+
+    assert refreshed['constituent_stability'].tolist() == pytest.approx(expected['constituent_stability'].tolist())
+    # The first window has no predecessor and keeps its HHI-based stability
+    assert refreshed['constituent_stability'].iloc[0] == pytest.approx(expected['constituent_stability'].iloc[0])
+    assert refreshed['constituent_stability'].iloc[2] != refreshed['constituent_stability'].iloc[4]
+
+
+def test_ingest_reuses_analyzed_universe():
+    data = _fetch(0)
+    universe = build_token_universe(data)
+    profiles = analyze_memecoin_risk(data, universe=universe)
+    analyzer = universe.analyzer
+    with AnalyticsStore(":memory:") as store:
+        store.ingest_fetch(*WINDOWS[0], universe, profiles)
+        snapshots = store.query("SELECT index_name, mint_address FROM token_snapshots ORDER BY index_name, rank")
+    # The table the profiles were computed from is loaded as-is, not re-parsed
+    assert universe.analyzer is analyzer
+    assert snapshots['mint_address'].tolist() == [f"m{i}" for i in range(4, -1, -1)] + [f"m{i}" for i in range(5)]
+
+
+def _ingest(store, start_date, end_date, data):
+    universe = build_token_universe(data)
+    return store.ingest_fetch(start_date, end_date, universe, analyze_memecoin_risk(data, universe=universe))
+
+
+def test_refresh_only_recomputes_new_runs():
+    with AnalyticsStore(":memory:") as store:
+        _ingest(store, *WINDOWS[0], _fetch(0))
+        _ingest(store, *WINDOWS[2], _fetch(3))
+        assert store.refresh_constituent_stability() == 2
+        assert store.refresh_constituent_stability() == 0
+
+        # A window loaded between two refreshed runs updates itself and its successor
+        _ingest(store, *WINDOWS[1], _fetch(2))
+        assert store.refresh_constituent_stability() == 4
+        assert store.refresh_constituent_stability() == 0
+
+
+def test_refresh_compares_runs_of_the_same_window_length():
+    with AnalyticsStore(":memory:") as store:
+        _ingest(store, *WINDOWS[0], _fetch(0))
+        quarter = _ingest(store, "2025-01-01", "2025-03-31", _fetch(3))
+        before = store.query("SELECT constituent_stability FROM profiles WHERE run_id = ?", (quarter,))
+        # The quarter ends after the January window but has no same-length predecessor
+        assert store.refresh_constituent_stability() == 0
+        after = store.query("SELECT constituent_stability FROM profiles WHERE run_id = ?", (quarter,))
+        assert after.equals(before)
+        assert store.previous_constituents("Memecoin 50 Volume", "2025-06-30", "2025-04-01") is not None
+        assert store.previous_constituents("Memecoin 50 Volume", "2025-03-31", "2025-01-01") is None
+
+
+def test_frequent_constituents_counts_runs_of_one_window_length():
+    with AnalyticsStore(":memory:") as store:
+        for (start_date, end_date), first_mint in zip(WINDOWS, (0, 1, 2)):
+            _ingest(store, start_date, end_date, _fetch(first_mint))
+        _ingest(store, "2024-10-01", "2025-03-31", _fetch(10))
+
+        # The last 2 runs are the last 2 one-month windows; the 6-month run is not one of them
+        recent = store.frequent_constituents("Memecoin 50 Volume", min_runs=2, last_runs=2)
+        assert sorted(recent['mint_address']) == ["m2", "m3", "m4", "m5"]
+        assert store.frequent_constituents("Memecoin 50 Volume", min_runs=1, months=6)['mint_address'].tolist() == [
+            f"m{i}" for i in range(10, 15)]
+        mixed = store.frequent_constituents("Memecoin 50 Volume", min_runs=1, last_runs=2, months=None)
+        assert set(mixed['mint_address']) == {f"m{i}" for i in range(2, 7)} | {f"m{i}" for i in range(10, 15)}
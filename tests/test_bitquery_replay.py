@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from bitquery_client import BitqueryClient
+from bitquery_data import (_build_ranking_query, fetch_memecoin_columns_by_period,
+                           fetch_memecoin_data_by_period)
+from bitquery_replay import RecordingAdapter, RecordingStore, ReplayAdapter, serve_replay
+from conftest import make_trade_row, ranking_response
+
+START_DATE, END_DATE = "2025-03-01", "2025-03-31"
+
+
+@pytest.fixture
+def recordings_dir(tmp_path):
+    """A recordings directory holding one ranking response."""
+    rows = [make_trade_row(f"mint{i}", volume=1000.0 - i) for i in range(3)]
+    body = json.dumps({"query": _build_ranking_query(START_DATE, END_DATE), "variables": json.dumps({})})
+    RecordingStore(str(tmp_path / "seed")).save(body, 200, json.dumps(ranking_response(rows)).encode())
+    return str(tmp_path / "seed")
+
+
+def _assert_replays(client):
+    data = fetch_memecoin_data_by_period(START_DATE, END_DATE, client=client)
+    mints = [row['Trade']['Currency']['MintAddress'] for row in data['data']['Solana']['DEXTradeByTokens']]
+    assert mints == ["mint0", "mint1", "mint2"]
+
+    buffers = fetch_memecoin_columns_by_period(START_DATE, END_DATE, client=client)
+    assert buffers.strings['mint_address'] == mints
+    assert list(buffers.numeric['volume']) == [1000.0, 999.0, 998.0]
+
+
+def test_replay_adapter_serves_streaming_and_buffered_fetches(recordings_dir):
+    adapter = ReplayAdapter(recordings_dir)
+    _assert_replays(BitqueryClient(auth_token="test", adapter=adapter))
+    assert adapter.stats() == {"requests": 2, "errors": 0, "missing": 0}
+
+
+def test_recording_adapter_keeps_body_readable(recordings_dir, tmp_path):
+    server = serve_replay(recordings_dir, port=0)
+    try:
+        host, port = server.server_address
+        adapter = RecordingAdapter(str(tmp_path / "recorded"))
+        _assert_replays(BitqueryClient(auth_token="test", url=f"http://{host}:{port}/eap", adapter=adapter))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # The re-recorded responses replay like the originals
+    _assert_replays(BitqueryClient(auth_token="test", adapter=ReplayAdapter(str(tmp_path / "recorded"))))
+
+
+def test_streaming_fetch_reports_decode_stats(recordings_dir, caplog):
+    client = BitqueryClient(auth_token="test", adapter=ReplayAdapter(recordings_dir))
+    with caplog.at_level("INFO", logger="bitquery_data"):
+        buffers = fetch_memecoin_columns_by_period(START_DATE, END_DATE, client=client, report=True)
+    assert len(buffers) == 3
+    assert any(hasattr(record, 'decode_stats') for record in caplog.records)
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from calculations import MemeCoinRiskAnalyzer
+from conftest import make_trade_row, ranking_response
+
+PERIODS = ["2w", "1m", "6m", "1y", "1d"]
+
+
+def _price_rows(seed=7):
+    rng = np.random.default_rng(seed)
+    rows = np.exp(np.cumsum(rng.normal(0.0, 0.2, size=(40, 30)), axis=1))
+    # Missing, zero and negative prices are skipped by both methods
+    rows[rng.random(rows.shape) < 0.15] = np.nan
+    rows[3, 5] = 0.0
+    rows[4, 7] = -1.0
+    # Short histories: nothing, one price, one return, two returns
+    rows[5] = np.nan
+    rows[6, 1:] = np.nan
+    rows[7, 2:] = np.nan
+    rows[8, 3:] = np.nan
+    # A constant series has no variance
+    rows[9] = 2.0
+    return rows
+
+
+def test_realized_volatility_batch_matches_scalar():
+    analyzer = MemeCoinRiskAnalyzer()
+    rows = _price_rows()
+    for period in PERIODS:
+        batch = analyzer.calculate_realized_volatility_batch(rows, period)
+        scalar = [analyzer.calculate_realized_volatility(row[~np.isnan(row)].tolist(), period) for row in rows]
+        np.testing.assert_allclose(batch, scalar, rtol=1e-9, atol=1e-12)
+    assert batch[[5, 6, 7, 9]].tolist() == [0.0] * 4
+
+
+def test_return_to_risk_ratio_batch_matches_scalar():
+    analyzer = MemeCoinRiskAnalyzer()
+    rows = _price_rows()
+    # The scalar method takes the gross return from the first and last list entries
+    rows[3, 5] = rows[4, 7] = np.nan
+    for period in PERIODS:
+        batch = analyzer.calculate_return_to_risk_ratio_batch(rows, period)
+        scalar = [analyzer.calculate_return_to_risk_ratio(row[~np.isnan(row)].tolist(), period) for row in rows]
+        np.testing.assert_allclose(batch, scalar, rtol=1e-9, atol=1e-12)
+
+
+def test_batch_kernels_handle_degenerate_matrices():
+    analyzer = MemeCoinRiskAnalyzer()
+    assert analyzer.calculate_realized_volatility_batch(np.empty((0, 5))).shape == (0,)
+    assert analyzer.calculate_realized_volatility_batch([[1.0], [2.0]]).tolist() == [0.0, 0.0]
+    assert analyzer.calculate_return_to_risk_ratio_batch([[1.0], [2.0]]).tolist() == [0.0, 0.0]
+    assert analyzer.calculate_realized_volatility([1.0, 2.0]) == 0.0
+    with pytest.raises(ValueError):
+        analyzer.calculate_realized_volatility_batch([1.0, 2.0])
+
+
+def _analyzer(rows):
+    analyzer = MemeCoinRiskAnalyzer()
+    analyzer.load_bitquery_rows(rows, {})
+    return analyzer
+
+
+@pytest.mark.parametrize("prices, expected", [
+    # Ordinary ranges, one beyond the 1000% cap
+    ([(2.0, 1.0), (0.3, 0.1), (25.0, 1.0), (1.1, 1.0)],
+     {'median_range': 1.5, 'mean_range': 6.775, 'max_drawdown': -0.96}),
+    # Zero ranges
+    ([(1.0, 1.0), (0.5, 0.5)], {'median_range': 0.0, 'mean_range': 0.0, 'max_drawdown': 0.0}),
+    # A zero low has no range but still a drawdown; zero prices have neither
+    ([(2.0, 0.0), (0.0, 0.0), (3.0, 2.0)], {'median_range': 0.5, 'mean_range': 0.5, 'max_drawdown': -1.0}),
+    ([(0.0, 0.0)], {'median_range': None, 'mean_range': 0.0, 'max_drawdown': None}),
+    ([], {'median_range': None, 'mean_range': 0.0, 'max_drawdown': None}),
+])
+def test_range_metrics_match_decimal_reference(prices, expected):
+    analyzer = _analyzer([make_trade_row(f"m{i}", high=high, low=low) for i, (high, low) in enumerate(prices)])
+    reference = analyzer.calculate_range_metrics_decimal()
+    assert reference == pytest.approx(expected)
+    assert analyzer.calculate_range_metrics() == pytest.approx(reference, rel=1e-9)
+
+    accuracy = analyzer.check_range_metrics_accuracy()
+    assert accuracy['agree']
+    assert all(difference <= 1e-9 for difference in accuracy['relative_differences'].values())
+
+
+def test_range_metrics_accuracy_on_awkward_decimals():
+    rows = [make_trade_row(f"m{i}", high=0.1 * (i + 3), low=0.1 * (i + 1) / 3) for i in range(50)]
+    accuracy = _analyzer(rows).check_range_metrics_accuracy(rel_tol=1e-12)
+    assert accuracy['agree'], accuracy['relative_differences']
+
+
+def _derived_metrics(analyzer):
+    return {
+        'weights': analyzer.volume_weights().tolist(),
+        'hhi': analyzer.volume_hhi(),
+        'ranges': analyzer.calculate_range_metrics(),
+        'top': analyzer.get_top_tokens_by_volume(2)['mint_address'].tolist(),
+        'roi': analyzer.calculate_roi_per_token()['roi_percentage'].tolist(),
+        'volatility_order': analyzer.create_volatility_ordered_data()['mint_address'].tolist(),
+    }
+
+
+def test_memoized_metrics_are_invalidated_on_reload():
+    first = [make_trade_row("a", volume=100.0, high=2.0, low=1.0, close=2.0),
+             make_trade_row("b", volume=300.0, high=3.0, low=1.0, close=1.0)]
+    second = [make_trade_row("c", volume=50.0, high=1.5, low=1.0, close=3.0),
+              make_trade_row("d", volume=50.0, high=5.0, low=1.0, close=0.5),
+              make_trade_row("e", volume=400.0, high=1.2, low=1.0, close=1.0)]
+
+    analyzer = _analyzer(first)
+    expected_first = _derived_metrics(_analyzer(first))
+    assert _derived_metrics(analyzer) == expected_first
+    # Repeated calls are served from the cache
+    misses = analyzer.derived_cache_stats()['misses']
+    assert _derived_metrics(analyzer) == expected_first
+    assert analyzer.derived_cache_stats()['misses'] == misses
+
+    analyzer.load_bitquery_data(ranking_response(second)['data'])
+    assert analyzer.derived_cache_stats()['entries'] == 0
+    assert _derived_metrics(analyzer) == _derived_metrics(_analyzer(second))
+    assert analyzer.derived_cache_stats()['misses'] > misses
+
+    analyzer.load_dataframe(_analyzer(first).data)
+    assert _derived_metrics(analyzer) == expected_first
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+
+from candle_store import CandleStore, to_epoch
+
+DAY = 86400
+
+
+def _append_days(store, mint_address, days, price=1.0):
+    times = [to_epoch("2025-03-01") + day * DAY for day in days]
+    values = [price + day for day in days]
+    return store.append(mint_address, times, values, values, values, values, values)
+
+
+def test_append_skips_stored_candles(tmp_path):
+    store = CandleStore(str(tmp_path))
+    assert _append_days(store, "mint", [0, 1, 2]) == 3
+    # Day 2 replaces the stored candle, days 3 and 4 are new
+    assert _append_days(store, "mint", [1, 2, 3, 4]) == 3
+    assert store.last_time("mint") == to_epoch("2025-03-05")
+    assert "mint" in store and "other" not in store
+
+
+def test_partial_candle_is_completed(tmp_path):
+    store = CandleStore(str(tmp_path))
+    day = to_epoch("2025-03-02")
+    store.append("mint", [day - DAY, day], [1.0, 2.0], [1.5, 2.1], [0.9, 1.9], [1.2, 2.0], [10.0, 1.0])
+    # The same day again once its interval has closed
+    assert store.append("mint", [day, day + DAY], [2.0, 3.0], [2.8, 3.1], [1.5, 2.9], [2.5, 3.0], [40.0, 5.0]) == 2
+
+    window = store.series("mint")
+    assert list(window["time"]) == [day - DAY, day, day + DAY]
+    assert list(window["high"]) == [1.5, 2.8, 3.1]
+    assert list(window["low"]) == [0.9, 1.5, 2.9]
+    assert list(window["close"]) == [1.2, 2.5, 3.0]
+    assert list(window["volume"]) == [10.0, 40.0, 5.0]
+
+
+def test_update_resumes_from_newest_candle(tmp_path, monkeypatch):
+    import bitquery_data
+
+    store = CandleStore(str(tmp_path))
+    _append_days(store, "stored", [0, 1])
+    requests = []
+
+    def fake_fetch(mint_addresses, since, end_date, interval, client=None, **options):
+        requests.append((sorted(mint_addresses), since, end_date))
+        return {}
+
+    monkeypatch.setattr(bitquery_data, "fetch_token_candles", fake_fetch)
+    bitquery_data.update_candle_store(store, ["stored", "new"], "2025-01-01", "2025-03-10")
+    assert requests == [(["new"], "2025-01-01", "2025-03-10"), (["stored"], "2025-03-02", "2025-03-10")]
+
+
+def test_series_window(tmp_path):
+    store = CandleStore(str(tmp_path))
+    _append_days(store, "mint", range(10))
+    window = store.series("mint", "2025-03-03", "2025-03-05")
+    assert list(window["close"]) == [3.0, 4.0, 5.0]
+    assert list(window["time"]) == [to_epoch("2025-03-03") + day * DAY for day in range(3)]
+    assert len(store.series("missing")["time"]) == 0
+
+
+def test_matrix_aligns_mints_on_grid(tmp_path):
+    store = CandleStore(str(tmp_path))
+    _append_days(store, "a", [0, 1, 2])
+    _append_days(store, "b", [1, 3], price=10.0)
+    grid, matrix = store.matrix(["a", "b", "missing"], "2025-03-01", "2025-03-04")
+    assert list(grid) == [to_epoch("2025-03-01") + day * DAY for day in range(4)]
+    np.testing.assert_array_equal(matrix, [[1.0, 2.0, 3.0, np.nan],
+                                           [np.nan, 11.0, np.nan, 13.0],
+                                           [np.nan] * 4])
+
+
+def test_append_after_interrupted_append(tmp_path):
+    store = CandleStore(str(tmp_path))
+    _append_days(store, "mint", [0, 1])
+    # Simulate an append that wrote a value row but crashed before its time row
+    with open(os.path.join(store.directory, "mint", "open.bin"), "ab") as f:
+        f.write(np.float64(99.0).tobytes())
+
+    reopened = CandleStore(str(tmp_path))
+    assert _append_days(reopened, "mint", [2]) == 1
+    window = reopened.series("mint")
+    assert list(window["open"]) == [1.0, 2.0, 3.0]
+    assert list(window["close"]) == [1.0, 2.0, 3.0]
+
+
+def test_open_maps_are_capped(tmp_path):
+    store = CandleStore(str(tmp_path), max_open_mints=2)
+    for i in range(5):
+        _append_days(store, f"mint{i}", [0])
+    for i in range(5):
+        assert store.last_time(f"mint{i}") == to_epoch("2025-03-01")
+    assert list(store._maps) == ["mint3", "mint4"]
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from calculations import MemeCoinRiskAnalyzer
+from drawdown import DrawdownBatchTracker, DrawdownTracker
+
+
+def _prices(seed, shape):
+    rng = np.random.default_rng(seed)
+    prices = np.exp(np.cumsum(rng.normal(0.0, 0.1, size=shape), axis=-1))
+    # Missing, zero and negative prices are skipped
+    prices[rng.random(shape) < 0.1] = np.nan
+    prices[rng.random(shape) < 0.02] = 0.0
+    prices[rng.random(shape) < 0.02] = -1.0
+    return prices
+
+
+def _chunks(length, seed):
+    """Split range(length) into random consecutive chunks, including single prices."""
+    rng = np.random.default_rng(seed)
+    bounds = np.sort(rng.choice(np.arange(1, length), size=length // 5, replace=False))
+    return np.split(np.arange(length), bounds)
+
+
+def _expected(prices, dates):
+    valid = np.isfinite(prices) & (prices > 0)
+    return MemeCoinRiskAnalyzer().calculate_max_drawdown(prices[valid], [d for d, v in zip(dates, valid) if v])
+
+
+def test_tracker_matches_full_recompute_with_chunked_updates():
+    prices = _prices(1, 200)
+    dates = [f"day{i}" for i in range(len(prices))]
+    tracker = DrawdownTracker()
+    for chunk in _chunks(len(prices), 2):
+        if len(chunk) == 1:
+            tracker.update(prices[chunk[0]], dates[chunk[0]])
+        else:
+            tracker.extend(prices[chunk], [dates[i] for i in chunk])
+
+        seen = chunk[-1] + 1
+        max_drawdown, max_drawdown_date = _expected(prices[:seen], dates[:seen])
+        if tracker.count >= 2:
+            assert tracker.max_drawdown == pytest.approx(max_drawdown, rel=1e-12, abs=1e-12)
+            assert tracker.max_drawdown_date == max_drawdown_date
+
+
+def test_batch_tracker_matches_full_recompute_with_chunked_updates():
+    prices = _prices(3, (6, 120))
+    dates = [f"day{i}" for i in range(prices.shape[1])]
+    keys = [f"m{i}" for i in range(len(prices))]
+    tracker = DrawdownBatchTracker(keys)
+    for n, chunk in enumerate(_chunks(prices.shape[1], 4)):
+        if len(chunk) > 1:
+            tracker.extend(prices[:, chunk], [dates[i] for i in chunk])
+        elif n % 2:
+            tracker.update(dict(zip(keys, prices[:, chunk[0]])), dates[chunk[0]])
+        else:
+            tracker.update(prices[:, chunk[0]], dates[chunk[0]])
+
+    for i in range(len(keys)):
+        max_drawdown, max_drawdown_date = _expected(prices[i], dates)
+        assert tracker.max_drawdown[i] == pytest.approx(max_drawdown, rel=1e-12, abs=1e-12)
+        assert tracker.max_drawdown_date[i] == max_drawdown_date
+
+
+def test_batch_tracker_matches_single_trackers():
+    prices = _prices(5, (4, 60))
+    batch = DrawdownBatchTracker(["a", "b", "c", "d"])
+    batch.extend(prices[:, :30])
+    for column in prices[:, 30:].T:
+        batch.update(column)
+
+    for key, row in zip(batch.keys, prices):
+        single = DrawdownTracker()
+        single.extend(row)
+        assert batch.tracker(key).to_dict() == pytest.approx(single.to_dict())
+
+
+def test_tracker_save_load_round_trip(tmp_path):
+    prices = _prices(6, 100)
+    uninterrupted = DrawdownTracker()
+    uninterrupted.extend(prices, [str(i) for i in range(100)])
+
+    tracker = DrawdownTracker()
+    tracker.extend(prices[:50], [str(i) for i in range(50)])
+    path = str(tmp_path / "drawdown.json")
+    tracker.save(path)
+    restored = DrawdownTracker.load(path)
+    assert restored.to_dict() == tracker.to_dict()
+
+    restored.extend(prices[50:], [str(i) for i in range(50, 100)])
+    assert restored.to_dict() == pytest.approx(uninterrupted.to_dict())
+
+
+def test_batch_tracker_save_load_round_trip(tmp_path):
+    prices = _prices(7, (3, 80))
+    dates = [str(i) for i in range(80)]
+    uninterrupted = DrawdownBatchTracker(["a", "b", "c"])
+    uninterrupted.extend(prices, dates)
+
+    tracker = DrawdownBatchTracker(["a", "b", "c"])
+    tracker.extend(prices[:, :40], dates[:40])
+    path = str(tmp_path / "drawdowns.json")
+    tracker.save(path)
+    restored = DrawdownBatchTracker.load(path)
+    assert restored.to_dict() == tracker.to_dict()
+
+    restored.extend(prices[:, 40:], dates[40:])
+    for key in uninterrupted.keys:
+        assert restored.tracker(key).to_dict() == pytest.approx(uninterrupted.tracker(key).to_dict())
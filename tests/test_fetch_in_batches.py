@@ -0,0 +1,30 @@
+import logging
+
+from bitquery_data import _fetch_in_batches
+
+
+def _fake_fetch(rows_per_address, limit):
+    calls = []
+
+    def fetch_batch(batch):
+        calls.append(list(batch))
+        rows = sum(rows_per_address.get(address, 1) for address in batch)
+        return {address: rows_per_address.get(address, 1) for address in batch}, min(rows, limit)
+
+    return fetch_batch, calls
+
+
+def test_batches_at_the_limit_are_split():
+    fetch_batch, calls = _fake_fetch({}, limit=4)
+    merged = _fetch_in_batches([f"m{i}" for i in range(8)], fetch_batch, 4, 2, 4, "Test")
+    assert sorted(merged) == [f"m{i}" for i in range(8)]
+    assert sorted(len(batch) for batch in calls) == [2, 2, 2, 2, 4, 4]
+
+
+def test_single_address_at_the_limit_warns(caplog):
+    fetch_batch, calls = _fake_fetch({"busy": 10}, limit=5)
+    with caplog.at_level(logging.WARNING, logger="bitquery_data"):
+        merged = _fetch_in_batches(["busy", "quiet"], fetch_batch, 2, 1, 5, "Candle")
+    assert merged == {"busy": 10, "quiet": 1}
+    assert ["busy"] in calls
+    assert any("busy" in record.getMessage() and "truncated" in record.getMessage() for record in caplog.records)
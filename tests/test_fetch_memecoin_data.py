@@ -0,0 +1,36 @@
+import threading
+
+import bitquery_data
+from bitquery_client import BitqueryClient
+from conftest import make_trade_row, ranking_response
+
+
+def test_shared_tokens_are_fetched_once(monkeypatch):
+    rankings = {
+        'volume': ranking_response([make_trade_row("a"), make_trade_row("b")]),
+        'volatility_token': ranking_response([make_trade_row("b"), make_trade_row("c")]),
+    }
+    requested = {'supply': [], 'roi': []}
+    lock = threading.Lock()
+
+    def fake_supply(addresses, client=None, eager_sol_price=False):
+        with lock:
+            requested['supply'].append(list(addresses))
+        return {address: 1.0 for address in addresses}
+
+    def fake_prices(addresses, start_date, end_date, client=None):
+        with lock:
+            requested['roi'].append(list(addresses))
+        return {address: {'oldest_price': 1.0, 'latest_price': 2.0} for address in addresses}
+
+    monkeypatch.setattr(bitquery_data, "fetch_memecoin_data_by_period",
+                        lambda start_date, end_date, order_by, client: rankings[order_by])
+    monkeypatch.setattr(bitquery_data, "fetch_token_supply_data", fake_supply)
+    monkeypatch.setattr(bitquery_data, "fetch_token_oldest_latest_prices", fake_prices)
+
+    data = bitquery_data.fetch_memecoin_data("2025-03-01", "2025-03-31", client=BitqueryClient(auth_token="test"))
+
+    assert requested == {'supply': [["a", "b", "c"]], 'roi': [["a", "b", "c"]]}
+    assert set(data['market_cap_data']) == set(data['roi_price_data']) == {"a", "b", "c"}
+    assert data['volume_ordered'] is rankings['volume']
+    assert data['volatility_ordered'] is rankings['volatility_token']
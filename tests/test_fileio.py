@@ -0,0 +1,25 @@
+import json
+import os
+
+import pytest
+
+from fileio import atomic_write_json
+
+
+def test_writes_and_replaces(tmp_path):
+    path = str(tmp_path / "nested" / "state.json")
+    atomic_write_json(path, {"a": 1})
+    atomic_write_json(path, {"a": 2})
+    with open(path) as f:
+        assert json.load(f) == {"a": 2}
+    assert os.listdir(tmp_path / "nested") == ["state.json"]
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = str(tmp_path / "state.json")
+    atomic_write_json(path, {"a": 1})
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"a": object()})
+    with open(path) as f:
+        assert json.load(f) == {"a": 1}
+    assert os.listdir(tmp_path) == ["state.json"]
@@ -0,0 +1,84 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from calculations import MemeCoinRiskAnalyzer
+from conftest import make_trade_row
+from incremental_profile import IncrementalProfile
+
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def _random_row(rng, i, side_mint):
+    row = make_trade_row(f"mint{i}", side_mint=side_mint, volume=rng.uniform(1.0, 1e6),
+                         high=rng.uniform(1.0, 3.0), low=rng.choice([0.0, rng.uniform(0.1, 1.0)]),
+                         open_price=rng.choice([0.0, rng.random()]), close=rng.random())
+    if rng.random() < 0.2:
+        # Rows without a volatility fall back to the high/low range
+        row['volatility_token'] = None
+    return row
+
+
+def _assert_close(actual, expected, path="profile"):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            _assert_close(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for i, (a, b) in enumerate(zip(actual, expected)):
+            _assert_close(a, b, f"{path}[{i}]")
+    elif isinstance(expected, (float, np.floating)) and not isinstance(expected, bool):
+        if math.isnan(expected):
+            assert math.isnan(actual), path
+        else:
+            # Rounded outputs may differ by one unit in the last place
+            assert actual == pytest.approx(expected, rel=1e-9, abs=0.011), path
+    else:
+        assert actual == expected, path
+
+
+@pytest.mark.parametrize("use_price_data", [False, True])
+def test_upserts_match_full_profile(use_price_data):
+    rng = random.Random(7)
+    sides = ["So11111111111111111111111111111111111111112", USDC]
+    rows = {}
+    for i in range(120):
+        for side_mint in sides[:rng.choice([1, 2])]:
+            rows[(f"mint{i}", side_mint)] = _random_row(rng, i, side_mint)
+    price_data = {f"mint{i}": {'oldest_price': rng.choice([0.0, rng.random()]), 'latest_price': rng.random()}
+                  for i in range(0, 150, 2)}
+
+    incremental = IncrementalProfile("Test Index", use_price_data=use_price_data)
+    incremental.upsert_rows(rows.values(), price_data)
+    for _ in range(200):
+        i = rng.randrange(150)
+        side_mint = rng.choice(sides)
+        if rng.random() < 0.3 and (f"mint{i}", side_mint) in rows:
+            assert incremental.remove(f"mint{i}", side_mint)
+            del rows[(f"mint{i}", side_mint)]
+        else:
+            rows[(f"mint{i}", side_mint)] = _random_row(rng, i, side_mint)
+            incremental.upsert(rows[(f"mint{i}", side_mint)], price_data.get(f"mint{i}"))
+    assert len(incremental) == len(rows)
+
+    # Rows in insertion order so ties break the same way in both implementations
+    ordered = sorted(rows, key=lambda key: incremental.tokens[key]['seq'])
+    analyzer = MemeCoinRiskAnalyzer()
+    analyzer.load_bitquery_data({'Solana': {'DEXTradeByTokens': [rows[key] for key in ordered]}})
+    expected = analyzer.generate_risk_return_profile(
+        "Test Index", price_data={mint: price for mint, price in price_data.items()
+                                  if mint in incremental} if use_price_data else None)
+    _assert_close(incremental.profile(), expected)
+
+
+def test_remove_token_drops_every_side_currency():
+    incremental = IncrementalProfile()
+    incremental.upsert_rows([make_trade_row("a"), make_trade_row("a", side_mint=USDC), make_trade_row("b")])
+    assert len(incremental) == 3
+    assert incremental.remove("a")
+    assert "a" not in incremental and "b" in incremental
+    assert not incremental.remove("a")
+    assert len(incremental) == 1
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from index_nav import aggregate_weights, compute_nav, compute_navs, effective_prices, rebalance_indices
+
+DAY = 86400
+
+
+def _naive_nav(prices, weights, rebalances, cost_bps=0.0, initial_nav=100.0):
+    """Day-by-day reference: hold units between rebalances, reset to target weights on them."""
+    nav = []
+    value = initial_nav
+    units = None
+    for day in range(prices.shape[1]):
+        if units is not None:
+            value = float(units @ prices[:, day])
+        if day in rebalances:
+            target = weights / weights.sum()
+            if units is None:
+                turnover = target.sum()
+            else:
+                turnover = 0.5 * np.abs(target - units * prices[:, day] / value).sum()
+            value *= 1.0 - turnover * cost_bps / 10000.0
+            units = target * value / prices[:, day]
+        nav.append(value)
+    return np.array(nav)
+
+
+def test_rebalance_schedules():
+    times = np.arange(np.datetime64("2025-01-30"), np.datetime64("2025-03-04")).astype("datetime64[s]").astype(np.int64)
+    assert rebalance_indices(times, "none").tolist() == [0]
+    assert len(rebalance_indices(times, "daily")) == len(times)
+    assert rebalance_indices(times, "monthly").tolist() == [0, 2, 30]
+    # 2025-02-03 and the following Mondays
+    assert rebalance_indices(times, "weekly").tolist() == [0, 4, 11, 18, 25, 32]
+    assert rebalance_indices(times, [5, 40, -1]).tolist() == [0, 5]
+    with pytest.raises(ValueError):
+        rebalance_indices(times, "yearly")
+
+
+def test_matches_naive_rebalancing_with_costs():
+    rng = np.random.default_rng(3)
+    prices = np.cumprod(1.0 + rng.normal(0, 0.05, size=(4, 40)), axis=1)
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    schedule = [0, 10, 20, 30]
+    result = compute_nav(prices, weights, schedule=schedule, cost_bps=25.0)
+    np.testing.assert_allclose(result['nav'], _naive_nav(prices, weights, set(schedule), cost_bps=25.0))
+    assert result['turnover'][0] == pytest.approx(1.0)
+    assert result['costs'][0] == pytest.approx(0.0025)
+
+
+def test_buy_and_hold():
+    prices = np.array([[1.0, 2.0, 4.0], [1.0, 1.0, 1.0]])
+    result = compute_nav(prices, [0.5, 0.5], schedule="none")
+    np.testing.assert_allclose(result['nav'], [100.0, 150.0, 250.0])
+    assert result['rebalance_indices'].tolist() == [0]
+
+
+def test_delisted_token_is_written_down():
+    prices = np.array([[1.0, 1.0, np.nan, np.nan], [1.0, 1.0, 1.0, 1.0]])
+    filled, tradable, delisted = effective_prices(prices, delisting_haircut=1.0, min_delisting_gap=1)
+    assert delisted.tolist() == [True, False]
+    assert tradable[0].tolist() == [True, True, False, False]
+
+    result = compute_nav(prices, [0.5, 0.5], schedule="daily", delisting_haircut=1.0, min_delisting_gap=1)
+    np.testing.assert_allclose(result['nav'], [100.0, 100.0, 50.0, 50.0])
+
+
+def test_flagged_token_is_delisted_after_short_gap():
+    prices = np.array([[1.0, 1.0, 1.0, np.nan], [1.0, 1.0, 1.0, 1.0]])
+    filled, tradable, delisted = effective_prices(prices, delisting_haircut=1.0, delisted=[True, False])
+    assert delisted.tolist() == [True, False]
+    assert tradable[0].tolist() == [True, True, True, False]
+    assert filled[0, 3] == 0.0
+
+
+def test_missing_last_day_is_not_a_delisting():
+    prices = np.array([[1.0, 2.0, 2.0, np.nan], [1.0, 1.0, 1.0, 1.0]])
+    filled, tradable, delisted = effective_prices(prices, delisting_haircut=1.0)
+    assert delisted.tolist() == [False, False]
+    assert tradable.all()
+    np.testing.assert_allclose(filled[0], [1.0, 2.0, 2.0, 2.0])
+
+    result = compute_nav(prices, [0.5, 0.5], schedule="none", delisting_haircut=1.0)
+    np.testing.assert_allclose(result['nav'], [100.0, 150.0, 150.0, 150.0])
+
+
+def test_long_trailing_gap_is_a_delisting():
+    prices = np.array([[1.0] + [np.nan] * 4, [1.0] * 5])
+    _, _, delisted = effective_prices(prices, min_delisting_gap=3)
+    assert delisted.tolist() == [True, False]
+
+
+def test_unlisted_tokens_are_excluded_until_listed():
+    prices = np.array([[np.nan, 1.0, 2.0], [1.0, 1.0, 1.0]])
+    result = compute_nav(prices, [0.5, 0.5], schedule="daily")
+    # Day 0 is fully in the listed token; day 1 rebalances into both
+    np.testing.assert_allclose(result['nav'], [100.0, 100.0, 150.0])
+
+
+def test_compute_navs_shares_preparation():
+    prices = np.array([[1.0, 2.0], [1.0, 1.0]])
+    results = compute_navs(prices, {'equal': {'weights': [0.5, 0.5], 'schedule': "none"},
+                                    'first': {'weights': [1.0, 0.0], 'schedule': "none"}})
+    np.testing.assert_allclose(results['equal']['nav'], [100.0, 150.0])
+    np.testing.assert_allclose(results['first']['nav'], [100.0, 200.0])
+
+
+def test_aggregate_weights():
+    aligned = aggregate_weights(["a", "b", "a", "z"], [0.2, 0.3, 0.1, 0.4], ["b", "a"])
+    np.testing.assert_allclose(aligned, [0.3, 0.3])
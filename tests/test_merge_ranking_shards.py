@@ -0,0 +1,44 @@
+import pytest
+
+from bitquery_data import merge_ranking_shards
+from conftest import make_trade_row, ranking_response
+
+WSOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def _rows(response):
+    return {(row['Trade']['Currency']['MintAddress'], row['Trade']['Side']['Currency']['MintAddress']): row
+            for row in response['data']['Solana']['DEXTradeByTokens']}
+
+
+def test_merges_aggregates_across_shards():
+    shards = [
+        ranking_response([make_trade_row("a", volume=100.0, high=2.0, low=1.0, open_price=1.2, close=1.8, count=3)]),
+        ranking_response([make_trade_row("a", volume=50.0, high=4.0, low=1.5, open_price=1.1, close=1.9, count=2)]),
+    ]
+    row = _rows(merge_ranking_shards(shards))[("a", WSOL)]
+    assert row['volume'] == 150.0
+    assert row['count'] == 5
+    assert (row['Trade']['high'], row['Trade']['low']) == (4.0, 1.0)
+    assert (row['Trade']['open'], row['Trade']['close']) == (1.1, 1.9)
+    assert row['volatility_token'] == pytest.approx(300.0)
+
+
+def test_keeps_side_currencies_apart():
+    shards = [
+        ranking_response([make_trade_row("a", volume=100.0), make_trade_row("a", side_mint=USDC, volume=10.0)]),
+        ranking_response([make_trade_row("a", side_mint=USDC, volume=5.0)]),
+    ]
+    rows = _rows(merge_ranking_shards(shards))
+    assert set(rows) == {("a", WSOL), ("a", USDC)}
+    assert rows[("a", WSOL)]['volume'] == 100.0
+    assert rows[("a", USDC)]['volume'] == 15.0
+
+
+def test_ranks_and_limits():
+    shards = [ranking_response([make_trade_row(f"m{i}", volume=float(i), high=1.0 + i, low=1.0)
+                                for i in range(5)])]
+    merged = merge_ranking_shards(shards, order_by="volatility_token", limit=2)
+    mints = [row['Trade']['Currency']['MintAddress'] for row in merged['data']['Solana']['DEXTradeByTokens']]
+    assert mints == ["m4", "m3"]
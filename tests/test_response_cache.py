@@ -0,0 +1,31 @@
+import json
+import os
+
+from response_cache import ResponseCache, make_cache_key
+
+
+def test_round_trip_and_normalized_keys(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = make_cache_key("query { a  b }", "2025-01-01", "2025-01-31")
+    assert key == make_cache_key("query {\n  a b\n}", "2025-01-01", "2025-01-31")
+    assert cache.get(key) is None
+    cache.put(key, {"data": [1, 2]}, "2025-01-31")
+    assert cache.get(key) == {"data": [1, 2]}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_eviction_and_clear_ignore_foreign_files(tmp_path):
+    # Another component's file in the cache directory, e.g. the shared SOL price
+    foreign = tmp_path / "sol_price.json"
+    foreign.write_text(json.dumps({"price": 150.0, "fetched_at": 0.0}))
+
+    cache = ResponseCache(str(tmp_path), max_bytes=1)
+    assert cache.stats()["bytes"] == 0
+    for i in range(3):
+        cache.put(make_cache_key(f"query {i}", "2025-01-01", "2025-01-31"), {"i": i}, "2025-01-31")
+    assert cache.stats()["evictions"] > 0
+    cache.clear()
+
+    assert foreign.exists()
+    assert cache.stats()["bytes"] == 0
+    assert not [name for _, _, files in os.walk(tmp_path) for name in files if name != "sol_price.json"]
@@ -0,0 +1,70 @@
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from analysis import analyze_memecoin_risk
+from conftest import make_trade_row, ranking_response
+from snapshot_lake import (SnapshotLake, load_columns, load_market_cap_data, load_meta, load_price_data,
+                           load_profiles)
+
+WSOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+@pytest.fixture
+def fetch():
+    volume_rows = [make_trade_row(f"m{i}", volume=1000.0 - i, high=2.0 + i, low=1.0, close=1.0 + i / 10)
+                   for i in range(6)]
+    volatility_rows = [make_trade_row("m2", side_mint=USDC, volume=10.0), make_trade_row("m7", low=0.5)]
+    return {
+        'volume_ordered': ranking_response(volume_rows),
+        'volatility_ordered': ranking_response(volatility_rows),
+        'market_cap_data': {"m0": 5e6, "m7": 1e5},
+        'roi_price_data': {f"m{i}": {'oldest_price': 1.0, 'latest_price': 1.0 + i, 'symbol': f"M{i}", 'name': f"m{i}"}
+                           for i in range(8)}
+    }
+
+
+@pytest.mark.parametrize("format", ["arrow", "parquet"])
+def test_save_and_load_round_trip(tmp_path, fetch, format):
+    lake = SnapshotLake(str(tmp_path), format=format)
+    path = lake.save(fetch, "2025-03-01", "2025-03-31")
+
+    assert lake.latest("2025-03-01", "2025-03-31") == path
+    meta = load_meta(path)
+    assert meta['row_counts'] == {'volume_ordered': 6, 'volatility_ordered': 2}
+    assert meta['format'] == format
+
+    columns = load_columns(path, "volume_ordered")
+    assert list(columns['mint_address']) == [f"m{i}" for i in range(6)]
+    np.testing.assert_array_equal(columns['volume'], [1000.0 - i for i in range(6)])
+    assert list(load_columns(path, "volatility_ordered")['side_mint']) == [USDC, WSOL]
+
+    assert load_market_cap_data(path) == fetch['market_cap_data']
+    assert load_price_data(path)["m3"]['latest_price'] == 4.0
+    assert load_profiles(path) == analyze_memecoin_risk(fetch, executor="serial")
+
+
+def test_concurrent_saves_get_separate_snapshots(tmp_path, fetch):
+    lake = SnapshotLake(str(tmp_path))
+    paths = []
+    errors = []
+
+    def save():
+        try:
+            paths.append(lake.save(fetch, "2025-03-01", "2025-03-31"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(paths) == lake.snapshots("2025-03-01", "2025-03-31")
+    assert len(set(paths)) == 4
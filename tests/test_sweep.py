@@ -0,0 +1,29 @@
+from analysis import analyze_memecoin_risk, build_token_universe, profile_row
+from analytics_db import AnalyticsStore
+from conftest import make_trade_row, ranking_response
+from sweep import monthly_windows, refresh_stability, sweep_table
+
+
+def test_monthly_windows_truncate_at_end():
+    assert list(monthly_windows("2025-01-15", "2025-03-10")) == [
+        ("2025-01-15", "2025-01-31"), ("2025-02-01", "2025-02-28"), ("2025-03-01", "2025-03-10")]
+    assert list(monthly_windows("2024-11-01", "2025-04-30", months=3)) == [
+        ("2024-11-01", "2025-01-31"), ("2025-02-01", "2025-04-30")]
+
+
+def test_refresh_stability_uses_predecessor_turnover(tmp_path):
+    path = str(tmp_path / "analytics.db")
+    results = []
+    for (start_date, end_date), first_mint in zip(monthly_windows("2025-01-01", "2025-02-28"), (0, 2)):
+        rows = [make_trade_row(f"m{i}", volume=100.0) for i in range(first_mint, first_mint + 4)]
+        data = {'volume_ordered': ranking_response(rows), 'volatility_ordered': ranking_response(rows),
+                'market_cap_data': {}, 'roi_price_data': {}}
+        universe = build_token_universe(data)
+        profiles = analyze_memecoin_risk(data, executor="serial", universe=universe)
+        with AnalyticsStore(path) as store:
+            store.ingest_fetch(start_date, end_date, universe, profiles)
+        results.append({"rows": [profile_row(start_date, end_date, profile) for profile in profiles.values()]})
+
+    table = refresh_stability(sweep_table(results), path)
+    # Equal weights over 4 tokens: HHI-based 75% first, then half of the index replaced
+    assert table["constituent_stability"].tolist() == [75.0, 75.0, 50.0, 50.0]
@@ -0,0 +1,27 @@
+from analysis import analyze_memecoin_risk, build_token_universe
+from conftest import make_trade_row, ranking_response
+
+
+def _fetch():
+    volume_rows = [make_trade_row(f"m{i}", volume=100.0 * (i + 1), close=1.0 + i / 10) for i in range(6)]
+    volatility_rows = [make_trade_row(f"m{i}", high=3.0 + i) for i in range(4, 10)]
+    return {
+        'volume_ordered': ranking_response(volume_rows),
+        'volatility_ordered': ranking_response(volatility_rows),
+        'market_cap_data': {},
+        'roi_price_data': {f"m{i}": {'oldest_price': 1.0, 'latest_price': 1.0 + i} for i in range(0, 10, 2)}
+    }
+
+
+def test_profile_tasks_carry_only_their_index_prices():
+    universe = build_token_universe(_fetch())
+    _, _, price_data, roi_data = universe._profile_task("Memecoin 50 Volume")
+    assert sorted(price_data) == ["m0", "m2", "m4"]
+    assert len(roi_data) == 6
+
+
+def test_executors_agree():
+    data = _fetch()
+    serial = analyze_memecoin_risk(data)
+    assert analyze_memecoin_risk(data, executor="thread") == serial
+    assert analyze_memecoin_risk(data, executor="process", max_workers=2) == serial
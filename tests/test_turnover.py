@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from turnover import SUMMARY_COLUMNS, TurnoverEngine, turnover_stability
+
+
+def test_summary_compares_consecutive_snapshots():
+    engine = TurnoverEngine()
+    engine.add_snapshot("2025-01-31", ["a", "b", "c", "d"])
+    engine.add_snapshot("2025-02-28", ["a", "b", "e", "f"], [0.4, 0.2, 0.2, 0.2])
+    engine.add_snapshot("2025-03-31", ["a", "b", "e", "f"], [0.4, 0.2, 0.2, 0.2])
+    summary = engine.summary()
+
+    assert list(summary.columns) == SUMMARY_COLUMNS
+    assert list(summary.index) == ["2025-01-31", "2025-02-28", "2025-03-31"]
+    assert summary['constituents'].tolist() == [4, 4, 4]
+    assert summary.iloc[0, 1:].isna().all()
+
+    february = summary.loc["2025-02-28"]
+    assert (february['entries'], february['exits'], february['retained']) == (2, 2, 2)
+    assert february['retention'] == 50.0
+    assert february['entry_weight'] == pytest.approx(0.4)
+    assert february['exit_weight'] == pytest.approx(0.5)
+    assert february['weight_drift'] == pytest.approx(0.15 + 0.05)
+    # Half the absolute weight change: (0.4 + 0.5 + 0.2) / 2
+    assert february['one_way_turnover'] == pytest.approx(0.55)
+
+    march = summary.loc["2025-03-31"]
+    assert march['one_way_turnover'] == pytest.approx(0.0)
+    assert march['retention'] == 100.0
+
+
+def test_repeated_mints_are_summed_and_zero_weights_stay_members():
+    engine = TurnoverEngine()
+    engine.add_snapshot("first", ["a", "a", "b"], [1.0, 1.0, 2.0])
+    engine.add_snapshot("second", ["a", "b", "c"], [1.0, 1.0, 0.0])
+    np.testing.assert_allclose(engine.weight_matrix(), [[0.5, 0.5, 0.0], [0.5, 0.5, 0.0]])
+    summary = engine.summary()
+    assert summary.loc["second", 'entries'] == 1
+    assert summary.loc["second", 'one_way_turnover'] == pytest.approx(0.0)
+    assert engine.changes() == {'entries': ["c"], 'exits': []}
+
+
+def test_empty_summary_and_stability():
+    assert TurnoverEngine().summary().empty
+    assert turnover_stability(["a", "b"], None, ["a", "b"], None) == pytest.approx(100.0)
+    assert turnover_stability(["a", "b"], None, ["c", "d"], None) == pytest.approx(0.0)
+    assert turnover_stability(["a", "b"], None, ["a", "c"], None) == pytest.approx(50.0)
@@ -0,0 +1,221 @@
+"""
+Shared token universe for building several indices from one token table.
+Tokens are loaded, joined with market caps and prices, and scored once;
+each index is an array of row positions into the shared table.
+"""
+
+import logging
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from calculations import MemeCoinRiskAnalyzer
+from executors import map_ordered
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_profile(task) -> Dict:
+    """Generate one index profile; module-level so process pools can pickle it."""
+    view, index_name, price_data, roi_data = task
+    return view.generate_risk_return_profile(index_name, price_data, roi_data=roi_data)
+
+
+class TokenUniverse:
+    """
+    Deduplicated table of every token that appears in any index.
+
+    Rows are keyed by (mint address, side currency mint), the grain of the
+    DEXTradeByTokens rankings, so a token listed by both the volume and the
+    volatility ranking is parsed, joined and scored only once. Adding another
+    index only stores its ordering.
+
+    Usage:
+        universe = TokenUniverse(market_cap_data, price_data)
+        universe.add_index("Memecoin 50 Volume", volume_rows)
+        universe.add_index("Memecoin 50 Volatility", volatility_rows)
+        profiles = universe.profiles()
+    """
+
+    def __init__(self, market_cap_data: Dict = None, price_data: Dict = None, price_dtype=np.float64):
+        """
+        Args:
+            market_cap_data: Dictionary of mint_address -> market_cap_usd
+            price_data: Dictionary of oldest/latest prices used for ROI
+                (open/close prices are used when empty)
+            price_dtype: dtype of the price columns (see MemeCoinRiskAnalyzer)
+        """
+        self.market_cap_data = market_cap_data
+        self.price_data = price_data
+        self.price_dtype = price_dtype
+        self.indices = {}
+        self.previous_constituents = {}
+        self._rows = []
+        self._positions = {}
+        self._analyzer = None
+        self._roi_per_token = None
+        self._roi_from_price_data = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add_index(self, index_name: str, rows: Iterable[Dict]) -> None:
+        """
+        Add an index defined by ranked DEXTradeByTokens rows.
+
+        Rows already in the universe are reused; only new tokens are appended.
+
+        Args:
+            index_name: Name of the index (e.g. "Memecoin 50 Volume")
+            rows: DEXTradeByTokens row dictionaries in index order
+        """
+        positions = []
+        added = 0
+        for row in rows:
+            trade = row['Trade']
+            key = (trade['Currency']['MintAddress'], trade['Side']['Currency']['MintAddress'])
+            position = self._positions.get(key)
+            if position is None:
+                position = self._positions[key] = len(self._rows)
+                self._rows.append(row)
+                added += 1
+            positions.append(position)
+
+        self.indices[index_name] = np.asarray(positions, dtype=np.intp)
+        if added:
+            # The shared table is rebuilt on next use to include the new tokens
+            self._analyzer = None
+            self._roi_per_token = None
+            self._roi_from_price_data = None
+        logger.info("%s: %d tokens (%d new, %d shared)", index_name, len(positions), added, len(positions) - added)
+
+    def set_previous_constituents(self, index_name: str, mint_addresses: Iterable[str], weights=None) -> None:
+        """
+        Set the previous period's constituents of an index, so its constituent
+        stability is measured as real turnover.
+
+        Args:
+            index_name: Name of the index
+            mint_addresses: Previous constituent mint addresses
+            weights: Their weights (equal weights when omitted)
+        """
+        self.previous_constituents[index_name] = (list(mint_addresses), weights)
+
+    @property
+    def analyzer(self) -> MemeCoinRiskAnalyzer:
+        """
+        Analyzer loaded with the whole deduplicated token table.
+        """
+        if self._analyzer is None:
+            self._analyzer = MemeCoinRiskAnalyzer(self.price_dtype)
+            self._analyzer.load_bitquery_rows(self._rows, self.market_cap_data)
+        return self._analyzer
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """
+        The deduplicated token table.
+        """
+        return self.analyzer.data
+
+    def _roi_frames(self):
+        """Compute the open/close and price-data ROI of every token once."""
+        if self._roi_per_token is None and len(self._rows) > 0:
+            self._roi_per_token = self.analyzer.calculate_roi_per_token()
+            if self.price_data:
+                self._roi_from_price_data = self.analyzer.calculate_roi_from_price_data(self.price_data)
+        return self._roi_per_token, self._roi_from_price_data
+
+    def index_names(self) -> List[str]:
+        """
+        Get the names of the added indices in insertion order.
+
+        Returns:
+            List of index names
+        """
+        return list(self.indices)
+
+    def index_tables(self) -> Dict[str, pd.DataFrame]:
+        """
+        Get the token table of every index, in index order.
+
+        Returns:
+            Dictionary of index name -> rows of the shared table
+        """
+        if len(self._rows) == 0:
+            return {}
+        return {index_name: self.table.take(positions) for index_name, positions in self.indices.items()}
+
+    def view(self, index_name: str) -> MemeCoinRiskAnalyzer:
+        """
+        Get an analyzer over the rows of one index, in index order.
+
+        Per-token ROI is taken from the shared table instead of being recomputed.
+
+        Args:
+            index_name: Name of an added index
+
+        Returns:
+            MemeCoinRiskAnalyzer loaded with the index rows
+        """
+        positions = self.indices[index_name]
+        roi_per_token, _ = self._roi_frames()
+
+        view = MemeCoinRiskAnalyzer(self.price_dtype)
+        view.load_dataframe(
+            self.table.take(positions).reset_index(drop=True),
+            roi_per_token.take(positions).reset_index(drop=True) if roi_per_token is not None else None
+        )
+        if index_name in self.previous_constituents:
+            view.set_previous_constituents(*self.previous_constituents[index_name])
+        return view
+
+    def profile(self, index_name: str) -> Dict:
+        """
+        Generate the risk and return profile of one index.
+
+        Args:
+            index_name: Name of an added index
+
+        Returns:
+            Dictionary containing risk and return metrics
+        """
+        return _generate_profile(self._profile_task(index_name))
+
+    def _profile_task(self, index_name: str):
+        """
+        Bundle everything needed to profile one index, sharing the per-token ROI.
+
+        Only the index's own rows, ROI and prices are included, so a process
+        pool never pickles the whole universe's payload.
+        """
+        positions = self.indices[index_name]
+        _, roi_from_price_data = self._roi_frames()
+        roi_data = None
+        price_data = None
+        if roi_from_price_data is not None:
+            roi_data = roi_from_price_data.take(positions).reset_index(drop=True)
+            price_data = {mint_address: self.price_data[mint_address]
+                          for mint_address in self.table['mint_address'].take(positions)
+                          if mint_address in self.price_data}
+        return self.view(index_name), index_name, price_data, roi_data
+
+    def profiles(self, executor="serial", max_workers: int = None) -> Dict[str, Dict]:
+        """
+        Generate the risk and return profiles of every index concurrently.
+
+        The shared table and per-token ROI are built once up front; each index
+        profile is then an independent task.
+
+        Args:
+            executor: "serial", "thread", "process" or an existing Executor
+                (see executors.map_ordered)
+            max_workers: Maximum number of workers when an executor is created
+
+        Returns:
+            Dictionary of index name -> profile, in index insertion order
+        """
+        names = list(self.indices)
+        tasks = [self._profile_task(index_name) for index_name in names]
+        return dict(zip(names, map_ordered(_generate_profile, tasks, executor, max_workers)))
@@ -0,0 +1,229 @@
+"""
+Constituent turnover across successive index snapshots.
+Mint addresses are interned to integer IDs and every snapshot becomes a row
+of one dates x tokens weight matrix, so turnover, entries/exits and weight
+drift over all rebalance dates are computed in a single vectorized pass.
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_COLUMNS = ['constituents', 'entries', 'exits', 'retained', 'retention', 'one_way_turnover',
+                   'entry_weight', 'exit_weight', 'weight_drift']
+
+
+def _after_first(values: np.ndarray) -> np.ndarray:
+    """Prefix NaN for the first snapshot, which has nothing to compare with."""
+    return np.concatenate([[np.nan], values.astype(np.float64)])
+
+
+class MintInterner:
+    """
+    Two-way mapping between mint addresses and dense integer IDs.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self.mints = []
+
+    def __len__(self) -> int:
+        return len(self.mints)
+
+    def intern(self, mint_addresses: Iterable[str]) -> np.ndarray:
+        """
+        Get the IDs of mint addresses, assigning new IDs to unseen ones.
+
+        Args:
+            mint_addresses: Mint addresses
+
+        Returns:
+            Array of integer IDs aligned with mint_addresses
+        """
+        ids = self._ids
+        mints = self.mints
+        result = []
+        for mint_address in mint_addresses:
+            mint_id = ids.get(mint_address)
+            if mint_id is None:
+                mint_id = ids[mint_address] = len(mints)
+                mints.append(mint_address)
+            result.append(mint_id)
+        return np.asarray(result, dtype=np.intp)
+
+    def lookup(self, mint_ids) -> List[str]:
+        """
+        Get the mint addresses of IDs.
+
+        Args:
+            mint_ids: Integer IDs
+
+        Returns:
+            List of mint addresses
+        """
+        return [self.mints[mint_id] for mint_id in mint_ids]
+
+
+class TurnoverEngine:
+    """
+    Ordered snapshots of an index's constituents and weights.
+
+    Usage:
+        engine = TurnoverEngine()
+        engine.add_snapshot("2025-08-31", august_mints, august_weights)
+        engine.add_snapshot("2025-09-30", september_mints, september_weights)
+        engine.summary()
+    """
+
+    def __init__(self, interner: MintInterner = None):
+        """
+        Args:
+            interner: Mint interner to share with other engines (a new one by default)
+        """
+        self.interner = interner or MintInterner()
+        self.labels = []
+        self._ids = []
+        self._weights = []
+        self._matrix = None
+        self._members = None
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def add_snapshot(self, label, mint_addresses: Iterable[str], weights=None) -> None:
+        """
+        Add the constituents of the next rebalance date.
+
+        Weights are normalized to sum to 1; weights of repeated mint addresses
+        (e.g. one token quoted against several currencies) are summed.
+
+        Args:
+            label: Snapshot label, e.g. the rebalance date
+            mint_addresses: Constituent mint addresses
+            weights: Constituent weights (equal weights when omitted or all zero)
+        """
+        ids = self.interner.intern(mint_addresses)
+        weights = np.ones(len(ids)) if weights is None else np.nan_to_num(np.asarray(weights, dtype=np.float64))
+        total = weights.sum()
+        weights = weights / total if total > 0 else np.full(len(ids), 1.0 / max(len(ids), 1))
+        self.labels.append(label)
+        self._ids.append(ids)
+        self._weights.append(weights)
+        self._matrix = None
+
+    def _build(self) -> None:
+        """Scatter all snapshots into the weight and membership matrices."""
+        shape = (len(self._ids), len(self.interner))
+        if self._matrix is None or self._matrix.shape != shape:
+            matrix = np.zeros(shape)
+            members = np.zeros(shape, dtype=bool)
+            if self._ids:
+                rows = np.repeat(np.arange(len(self._ids)), [len(ids) for ids in self._ids])
+                columns = np.concatenate(self._ids)
+                np.add.at(matrix, (rows, columns), np.concatenate(self._weights))
+                members[rows, columns] = True
+            self._matrix = matrix
+            self._members = members
+
+    def weight_matrix(self) -> np.ndarray:
+        """
+        Get the snapshots x interned-mints weight matrix.
+
+        Returns:
+            Matrix whose row k holds the weights of snapshot k (0 for non-constituents)
+        """
+        self._build()
+        return self._matrix
+
+    def membership_matrix(self) -> np.ndarray:
+        """
+        Get the snapshots x interned-mints constituent mask.
+
+        Returns:
+            Boolean matrix whose row k marks the constituents of snapshot k
+        """
+        self._build()
+        return self._members
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Compare every snapshot with the one before it.
+
+        One-way turnover is half the total absolute weight change, i.e. the
+        share of the index traded at the rebalance: half the sum of the weight
+        of entries, the weight of exits and the drift of retained constituents.
+
+        Returns:
+            DataFrame indexed by label with constituents, entries, exits,
+            retained, retention (% of previous constituents kept),
+            one_way_turnover, entry_weight, exit_weight and weight_drift
+            (NaN comparisons for the first snapshot)
+        """
+        if not self.labels:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS, index=pd.Index([], name='label'))
+        matrix = self.weight_matrix()
+        members = self.membership_matrix()
+        previous, current = matrix[:-1], matrix[1:]
+        was_member, is_member = members[:-1], members[1:]
+        entered = is_member & ~was_member
+        exited = was_member & ~is_member
+        retained = was_member & is_member
+
+        previous_count = was_member.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            retention = np.where(previous_count > 0, retained.sum(axis=1) / previous_count * 100, np.nan)
+        return pd.DataFrame({
+            'constituents': members.sum(axis=1),
+            'entries': _after_first(entered.sum(axis=1)),
+            'exits': _after_first(exited.sum(axis=1)),
+            'retained': _after_first(retained.sum(axis=1)),
+            'retention': _after_first(retention),
+            'one_way_turnover': _after_first(0.5 * np.abs(current - previous).sum(axis=1)),
+            'entry_weight': _after_first(np.where(entered, current, 0.0).sum(axis=1)),
+            'exit_weight': _after_first(np.where(exited, previous, 0.0).sum(axis=1)),
+            'weight_drift': _after_first(np.where(retained, np.abs(current - previous), 0.0).sum(axis=1))
+        }, index=pd.Index(self.labels, name='label'))
+
+    def changes(self, position: int = -1) -> Dict[str, List[str]]:
+        """
+        List the entries and exits of one snapshot.
+
+        Args:
+            position: Snapshot position (the latest by default)
+
+        Returns:
+            Dictionary with 'entries' and 'exits' mint addresses
+        """
+        if position < 0:
+            position += len(self._ids)
+        members = self.membership_matrix()
+        if position <= 0:
+            return {'entries': self.interner.lookup(np.flatnonzero(members[position])), 'exits': []}
+        was_member = members[position - 1]
+        is_member = members[position]
+        return {
+            'entries': self.interner.lookup(np.flatnonzero(is_member & ~was_member)),
+            'exits': self.interner.lookup(np.flatnonzero(was_member & ~is_member))
+        }
+
+
+def turnover_stability(previous_mints, previous_weights, mints, weights) -> float:
+    """
+    Stability of an index between two rebalances: the share of the index
+    not traded, 100 * (1 - one-way turnover).
+
+    Args:
+        previous_mints: Constituent mint addresses of the previous period
+        previous_weights: Their weights (equal weights when None)
+        mints: Current constituent mint addresses
+        weights: Their weights (equal weights when None)
+
+    Returns:
+        Constituent stability as percentage (higher = more stable)
+    """
+    engine = TurnoverEngine()
+    engine.add_snapshot("previous", previous_mints, previous_weights)
+    engine.add_snapshot("current", mints, weights)
+    turnover = engine.summary()['one_way_turnover'].iloc[-1]
+    return min(max(0.0, (1.0 - turnover) * 100), 100.0)